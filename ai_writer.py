@@ -6,14 +6,20 @@ AI工具公众号自动化内容生成器 - 精简版
 
 import os
 import json
-import schedule
 import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
-import google.generativeai as genai
-import requests
-import feedparser
-from media_generator import MediaGenerator
+from feed_fetcher import FeedFetcher
+from keyword_matcher import AI_TOOL_MATCHER
+from seen_index import SeenIndex
+from stream_writer import stream_generate
+from response_cache import ResponseCache, CachedModel
+from rate_limiter import RateLimitedModel
+from llm_backend import create_backend
+from chart_specs import spec_for_article, TOOLS_NEEDED
+from run_logger import RunLogger
 
 # 设置代理（如果需要访问Google API）
 os.environ['https_proxy'] = 'http://127.0.0.1:7890'
@@ -23,20 +29,39 @@ os.environ['all_proxy'] = 'socks5://127.0.0.1:7890'
 # 加载环境变量
 load_dotenv()
 
+# 运行日志：控制台输出与原来一致，同时写入 logs/ai_writer_<日期>.jsonl（带运行ID、阶段和耗时）
+logger = RunLogger('ai_writer')
+
 class AIContentWriter:
     """AI内容生成器"""
     
     def __init__(self):
+        # 大模型后端：gemini（默认）或 stub（本地确定性模拟，无需网络和API密钥）
+        self.backend_name = os.getenv('LLM_BACKEND', 'gemini').lower()
         self.api_key = os.getenv('GEMINI_API_KEY')
-        if not self.api_key or self.api_key == 'your-gemini-api-key-here':
+        if self.backend_name == 'gemini' and (not self.api_key or self.api_key == 'your-gemini-api-key-here'):
             raise ValueError("请在 .env 文件中设置正确的 GEMINI_API_KEY")
 
-        # 初始化Gemini
-        genai.configure(api_key=self.api_key)
-        self.model = genai.GenerativeModel('gemini-1.5-flash')
+        self.backend = create_backend(self.backend_name, self.api_key)
+        # 限速、重试和熔断（GEMINI_RPM / GEMINI_TPM），缓存命中时不占用配额
+        self.rate_limited_model = RateLimitedModel(self.backend, log=logger.warning)
+        # 提示词完全相同时直接复用缓存的响应（LLM_CACHE_BYPASS=true 强制重新生成）
+        self.model = CachedModel(self.rate_limited_model, ResponseCache())
+
+        # RSS并发抓取器
+        self.feed_fetcher = FeedFetcher()
+
+        # 跨运行去重索引，避免重复介绍已发布过的工具
+        self.seen_index = SeenIndex()
 
-        # 注意：移除了媒体生成器，专注于AI绘画提示词生成
-        # self.media_generator = MediaGenerator()
+        # 注意：默认不生成图片，专注于AI绘画提示词生成
+        # GENERATE_IMAGES=true 时按文章类型用采集到的工具数据生成配图，媒体生成器在首次使用时才创建
+        self.generate_images = os.getenv('GENERATE_IMAGES', 'false').lower() == 'true'
+        self.media_generator = None
+        self.collected_tools = []
+
+        # 流式生成模式：边生成边写入文件，中断时保留已生成的部分
+        self.stream_output = os.getenv('STREAM_OUTPUT', 'false').lower() == 'true'
 
         # 内容类型配置
         self.content_schedule = {
@@ -49,15 +74,15 @@ class AIContentWriter:
             6: "resource_list"   # 周日：资源合集
         }
 
-        print("🤖 AI内容生成器初始化成功！")
+        logger.info("🤖 AI内容生成器初始化成功！")
     
     def get_today_content_type(self):
         """获取今天应该生成的内容类型"""
         today = datetime.now().weekday()
         return self.content_schedule.get(today, "new_tool")
     
-    def collect_ai_tools(self):
-        """收集最新的AI工具信息"""
+    def collect_ai_tools(self, min_count=1):
+        """收集最新的AI工具信息，不足 min_count 个时用精选工具库补足"""
         tools = []
 
         # 更新的RSS源 - 专注于AI工具和产品资讯
@@ -68,32 +93,34 @@ class AIContentWriter:
             'https://feeds.feedburner.com/oreilly/radar',  # O'Reilly Radar (备用)
         ]
 
-        print("🔍 正在收集最新AI工具资讯...")
+        logger.info("🔍 正在收集最新AI工具资讯...")
+
+        # 并发抓取所有RSS源，单个源超时不会拖慢其他源
+        feeds = self.feed_fetcher.fetch_all(rss_feeds)
+        skipped_seen = 0
 
-        for feed_url in rss_feeds:
+        for feed_url, feed in feeds.items():
             try:
-                print(f"📡 检查数据源: {feed_url.split('/')[2]}")
-                feed = feedparser.parse(feed_url)
+                logger.info(f"📡 检查数据源: {feed.host} ({feed.elapsed:.1f}s)")
 
-                if not hasattr(feed, 'entries') or len(feed.entries) == 0:
-                    print(f"⚠️ 数据源无响应，跳过")
+                if not feed.ok:
+                    reason = f" ({feed.error})" if feed.error else ""
+                    logger.warning(f"⚠️ 数据源无响应{reason}，跳过")
                     continue
 
                 found_tools = 0
                 for entry in feed.entries[:5]:  # 每个源取5篇最新的
-                    title = entry.title.lower()
-                    summary = getattr(entry, 'summary', '').lower()
-                    content = f"{title} {summary}"
-
-                    # 更精确的AI工具关键词匹配
-                    ai_keywords = [
-                        'ai tool', 'ai app', 'chatgpt', 'gpt-4', 'claude', 'gemini',
-                        'midjourney', 'dall-e', 'stable diffusion', 'ai assistant',
-                        'artificial intelligence', 'machine learning tool', 'ai platform',
-                        'ai startup', 'new ai', 'ai launch', 'ai release'
-                    ]
-
-                    if any(keyword in content for keyword in ai_keywords):
+                    # 已发布过的内容直接跳过，不再浪费生成调用
+                    if self.seen_index.is_seen(getattr(entry, 'link', ''), entry.title):
+                        skipped_seen += 1
+                        continue
+
+                    content = f"{entry.title} {getattr(entry, 'summary', '')}"
+
+                    # 更精确的AI工具关键词匹配（预编译的匹配器，每篇只扫描一次）
+                    match = AI_TOOL_MATCHER.match(content)
+
+                    if match:
                         # 提取工具名称（简化版）
                         tool_name = entry.title
                         if ':' in tool_name:
@@ -105,29 +132,36 @@ class AIContentWriter:
                             'url': getattr(entry, 'link', ''),
                             'source': 'rss',
                             'published': getattr(entry, 'published', ''),
-                            'feed_source': feed_url.split('/')[2]
+                            'feed_source': feed_url.split('/')[2],
+                            'matched_keywords': sorted(match.keywords),
+                            'relevance': match.score
                         })
                         found_tools += 1
 
                         if found_tools >= 2:  # 每个源最多取2个
                             break
 
-                print(f"✅ 找到 {found_tools} 个相关工具")
+                logger.info(f"✅ 找到 {found_tools} 个相关工具")
 
             except Exception as e:
-                print(f"❌ RSS采集错误 ({feed_url.split('/')[2]}): {e}")
+                logger.error(f"❌ RSS采集错误 ({feed_url.split('/')[2]}): {e}")
 
-        # 如果没有收集到工具，使用精选的热门工具库
-        if not tools:
-            print("📚 使用精选工具库...")
-            tools = self._get_curated_ai_tools()
-        else:
-            print(f"🎯 共收集到 {len(tools)} 个最新AI工具")
+        logger.info(f"📦 {self.feed_fetcher.stats_summary()}")
+        if skipped_seen:
+            logger.info(f"♻️ 跳过 {skipped_seen} 篇已发布过的资讯")
+
+        if tools:
+            logger.info(f"🎯 共收集到 {len(tools)} 个最新AI工具")
+        # 收集到的工具不够时（如工具对比需要两个），用精选的热门工具库补足
+        if len(tools) < min_count:
+            logger.info("📚 使用精选工具库...")
+            tools += self._get_curated_ai_tools(min_count - len(tools))
 
+        self.collected_tools = tools
         return tools
 
-    def _get_curated_ai_tools(self):
-        """精选的AI工具库 - 2025年7月更新"""
+    def _get_curated_ai_tools(self, count=1):
+        """精选的AI工具库 - 2025年7月更新，随机返回 count 个"""
         curated_tools = [
             {
                 'name': 'ChatGPT',
@@ -203,9 +237,12 @@ class AIContentWriter:
             }
         ]
 
-        # 随机选择一个工具，避免总是同一个
+        # 优先从未发布过的工具中随机选择，未发布的不够时再从全部工具中轮换
         import random
-        selected_tool = random.choice(curated_tools)
+        unseen_tools = [tool for tool in curated_tools
+                        if not self.seen_index.is_seen(tool['url'], tool['name'])]
+        candidates = unseen_tools if len(unseen_tools) >= count else curated_tools
+        selected_tools = random.sample(candidates, min(count, len(candidates)))
 
         # 添加一些随机的"最新动态"让内容更新鲜
         updates = [
@@ -217,9 +254,43 @@ class AIContentWriter:
             "被知名博主强烈推荐"
         ]
 
-        selected_tool['recent_update'] = random.choice(updates)
-        return [selected_tool]
+        for tool in selected_tools:
+            tool['recent_update'] = random.choice(updates)
+        return selected_tools
     
+    def _generate_text(self, prompt, title, generation_config=None):
+        """调用Gemini生成正文，返回 (正文, 流式输出文件路径)
+
+        流式模式下边生成边写入 data/ 下的文章文件并实时打印，
+        非流式模式下等待完整响应，文件路径为None
+        """
+        if not self.stream_output:
+            response = self.model.generate_content(prompt, generation_config=generation_config)
+            return response.text, None
+
+        filepath = self._new_article_path('.md')
+        logger.info(f"⚡ 流式生成中，实时写入: {filepath}")
+        logger.info("-" * 60)
+        content, stats = stream_generate(
+            self.model, prompt, filepath,
+            header=f"# {title}\n\n",
+            on_chunk=lambda text, _: print(text, end='', flush=True),
+            generation_config=generation_config
+        )
+        logger.info("\n" + "-" * 60)
+        logger.info(f"📈 {stats.summary()}")
+        return content, filepath
+
+    def _new_article_path(self, ext):
+        """生成 data/ 目录下带时间戳的文章文件路径（同一秒内保存多篇时自动加序号）"""
+        os.makedirs('data', exist_ok=True)
+        base = os.path.join('data', f"article_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+        candidate, index = base, 1
+        while os.path.exists(candidate + '.txt') or os.path.exists(candidate + '.md'):
+            index += 1
+            candidate = f"{base}_{index}"
+        return candidate + ext
+
     def generate_article(self, content_type, data=None):
         """根据内容类型生成文章"""
         
@@ -275,23 +346,26 @@ class AIContentWriter:
         """
         
         try:
-            response = self.model.generate_content(
+            title = f"🔥今日AI新发现：{tool_data['name']}"
+            content, stream_path = self._generate_text(
                 prompt,
-                generation_config=genai.types.GenerationConfig(
-                    temperature=0.8,  # 提高创造性，让文章更有人情味
-                    max_output_tokens=2000,
-                )
+                title,
+                generation_config={
+                    'temperature': 0.8,  # 提高创造性，让文章更有人情味
+                    'max_output_tokens': 2000,
+                }
             )
 
             return {
-                'title': f"🔥今日AI新发现：{tool_data['name']}",
-                'content': response.text,
+                'title': title,
+                'content': content,
                 'type': 'new_tool',
                 'generated_at': datetime.now().isoformat(),
-                'tool_name': tool_data['name']  # 保存工具名称用于生成提示词
+                'tool_name': tool_data['name'],  # 保存工具名称用于生成提示词
+                'stream_path': stream_path
             }
         except Exception as e:
-            print(f"❌ 文章生成失败: {e}")
+            logger.error(f"❌ 文章生成失败: {e}")
             return None
     
     def generate_tutorial_article(self, tool_data):
@@ -331,17 +405,19 @@ class AIContentWriter:
         """
         
         try:
-            response = self.model.generate_content(prompt)
+            title = f"📖保姆级教程：{tool_data['name']}使用指南"
+            content, stream_path = self._generate_text(prompt, title)
 
             return {
-                'title': f"📖保姆级教程：{tool_data['name']}使用指南",
-                'content': response.text,
+                'title': title,
+                'content': content,
                 'type': 'tutorial',
                 'generated_at': datetime.now().isoformat(),
-                'tool_name': tool_data['name']  # 保存工具名称用于生成提示词
+                'tool_name': tool_data['name'],  # 保存工具名称用于生成提示词
+                'stream_path': stream_path
             }
         except Exception as e:
-            print(f"❌ 教程生成失败: {e}")
+            logger.error(f"❌ 教程生成失败: {e}")
             return None
     
     def generate_weekly_summary(self):
@@ -380,16 +456,18 @@ class AIContentWriter:
         """
 
         try:
-            response = self.model.generate_content(prompt)
+            title = "📊本周AI圈大事件汇总"
+            content, stream_path = self._generate_text(prompt, title)
 
             return {
-                'title': "📊本周AI圈大事件汇总",
-                'content': response.text,
+                'title': title,
+                'content': content,
                 'type': 'weekly_summary',
-                'generated_at': datetime.now().isoformat()
+                'generated_at': datetime.now().isoformat(),
+                'stream_path': stream_path
             }
         except Exception as e:
-            print(f"❌ 周报生成失败: {e}")
+            logger.error(f"❌ 周报生成失败: {e}")
             return None
     
     def generate_general_article(self, content_type):
@@ -479,8 +557,6 @@ class AIContentWriter:
         """
 
         try:
-            response = self.model.generate_content(prompt)
-
             # 获取文章配置
             config = article_configs.get(content_type, {
                 'title': f"AI工具分享 - {datetime.now().strftime('%Y-%m-%d')}",
@@ -488,70 +564,191 @@ class AIContentWriter:
                 'cover_style': 'tech'
             })
 
+            content, stream_path = self._generate_text(prompt, config['title'])
+
             return {
                 'title': config['title'],
-                'content': response.text,
+                'content': content,
                 'type': content_type,
-                'generated_at': datetime.now().isoformat()
+                'generated_at': datetime.now().isoformat(),
+                'stream_path': stream_path
             }
         except Exception as e:
-            print(f"❌ 文章生成失败: {e}")
+            logger.error(f"❌ 文章生成失败: {e}")
             return None
     
     def daily_content_generation(self):
         """每日内容生成"""
-        print(f"\n🚀 开始每日内容生成 - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        logger.info(f"\n🚀 开始每日内容生成 - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         
         # 确定今日内容类型
         content_type = self.get_today_content_type()
-        print(f"📝 今日内容类型：{content_type}")
+        logger.info(f"📝 今日内容类型：{content_type}")
         
-        # 收集数据
-        if content_type in ['new_tool', 'tutorial']:
-            tools = self.collect_ai_tools()
-            if tools:
+        # 收集数据：工具类文章需要工具信息，周报和工具对比的配图也用采集到的工具数据
+        tool_data = None
+        tools = []
+        if content_type in ['new_tool', 'tutorial'] or (self.generate_images and content_type in TOOLS_NEEDED):
+            with logger.stage('collect'):
+                tools = self.collect_ai_tools(TOOLS_NEEDED[content_type])
+
+        with logger.stage('generate'):
+            if content_type not in ['new_tool', 'tutorial']:
+                article = self.generate_article(content_type)
+            elif tools:
                 tool_data = tools[0]  # 使用第一个工具
                 article = self.generate_article(content_type, tool_data)
             else:
-                print("⚠️ 未收集到工具数据，生成通用文章")
+                logger.warning("⚠️ 未收集到工具数据，生成通用文章")
                 article = self.generate_general_article(content_type)
-        else:
-            article = self.generate_article(content_type)
         
         if article:
-            self.preview_article(article)
-            self.save_article(article)
-            print("✅ 每日内容生成完成！")
+            with logger.stage('publish'):
+                self._publish(article, tool_data)
+            logger.info("✅ 每日内容生成完成！")
         else:
-            print("❌ 内容生成失败")
+            logger.error("❌ 内容生成失败")
+
+        logger.info(f"🗄️ {self.model.cache.stats_summary()}")
+        logger.info(f"🚦 {self.rate_limited_model.stats_summary()}")
+        # 常驻模式下进程不退出，每次任务结束时把日志写入文件
+        logger.flush()
+
+    def _publish(self, article, tool_data=None):
+        """预览并保存文章，记录已发布的工具"""
+        self.preview_article(article)
+        if self.generate_images:
+            self._render_article_images(article, tool_data)
+        self.save_article(article)
+        if tool_data:
+            # 记录已发布的工具，之后的运行不再重复选题
+            self.seen_index.mark_seen(tool_data.get('url'), tool_data['name'])
+
+    def _create_media_generator(self):
+        """
+        设置了 RENDER_SERVER_URL 且服务可用时交给常驻渲染服务（render_server.py），
+        否则在本进程内创建 MediaGenerator
+        """
+        if os.getenv('RENDER_SERVER_URL'):
+            from render_server import RenderClient, RenderError
+            client = RenderClient()
+            try:
+                client.health()
+                logger.info(f"🎨 使用渲染服务: {client.url}")
+                return client
+            except RenderError as e:
+                logger.warning(f"⚠️ {e}，改为本地生成配图")
+        from media_generator import MediaGenerator  # 按需导入，会加载PIL和matplotlib
+        return MediaGenerator()
+
+    def _render_article_images(self, article, tool_data=None):
+        """按文章类型生成配图（数据来自本次采集的工具），路径记录在 article['images']"""
+        spec = spec_for_article(article['type'], tool_data, self.collected_tools)
+        if spec is None:
+            return
+        try:
+            if self.media_generator is None:
+                self.media_generator = self._create_media_generator()
+            name = f"{article['type']}/{article.get('title', '')}"
+            image = self.media_generator.generate_content_image(spec.kind, spec, name=name)
+            # 正文配图限制为1080像素宽并压缩到上传预算内
+            article['images'] = [self.media_generator.encode_for(image, 'content')]
+        except Exception as e:
+            logger.warning(f"⚠️ 配图生成失败: {e}")
+
+    def batch_generate(self, jobs, max_workers=None):
+        """批量生成文章
+
+        jobs 为 (content_type, tool_data) 列表，tool_data 可为None。
+        最多 max_workers 个生成请求同时进行，请求速率由模型外层的限速器控制；
+        返回与 jobs 顺序一致的文章列表（失败的为None）
+        """
+        max_workers = max_workers or int(os.getenv('BATCH_WORKERS', '4'))
+
+        # 并发生成时关闭流式输出，避免多篇文章的输出交错
+        stream_output, self.stream_output = self.stream_output, False
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                return list(executor.map(lambda job: self._generate_job(*job), jobs))
+        finally:
+            self.stream_output = stream_output
+
+    def _generate_job(self, content_type, tool_data=None):
+        """生成单篇文章，工具类文章缺少工具数据时退回通用文章"""
+        if content_type in ['new_tool', 'tutorial'] and not tool_data:
+            return self.generate_general_article(content_type)
+        return self.generate_article(content_type, tool_data)
+
+    def batch_content_generation(self, jobs, max_workers=None):
+        """批量生成并按顺序保存文章"""
+        logger.info(f"\n🚀 开始批量生成 {len(jobs)} 篇文章 - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        start = time.perf_counter()
+        with logger.stage('generate'):
+            articles = self.batch_generate(jobs, max_workers)
+        elapsed = time.perf_counter() - start
+
+        succeeded = 0
+        with logger.stage('publish'):
+            for (content_type, tool_data), article in zip(jobs, articles):
+                if article:
+                    self._publish(article, tool_data)
+                    succeeded += 1
+                else:
+                    logger.error(f"❌ {content_type} 文章生成失败")
+
+        logger.info(f"✅ 批量生成完成：成功 {succeeded}/{len(jobs)} 篇，生成耗时 {elapsed:.1f}s")
+        logger.info(f"🗄️ {self.model.cache.stats_summary()}")
+        logger.info(f"🚦 {self.rate_limited_model.stats_summary()}")
+        return articles
+
+    def week_jobs(self):
+        """一周七种内容类型的生成任务，工具类文章依次分配收集到的不同工具"""
+        # 收集到的工具同时用于周报和工具对比的配图，按所需最多的类型补足数量
+        tools = self.collect_ai_tools(max(TOOLS_NEEDED.get(content_type, 1)
+                                          for content_type in self.content_schedule.values()))
+        jobs = []
+        tool_index = 0
+        for weekday in sorted(self.content_schedule):
+            content_type = self.content_schedule[weekday]
+            tool_data = None
+            if content_type in ['new_tool', 'tutorial'] and tools:
+                tool_data = tools[tool_index % len(tools)]
+                tool_index += 1
+            jobs.append((content_type, tool_data))
+        return jobs
+
+    def tool_jobs(self, count, content_type="new_tool"):
+        """为收集到的前 count 个工具各生成一篇文章，收集到的不足 count 个时用精选工具库补足"""
+        return [(content_type, tool) for tool in self.collect_ai_tools(min_count=count)[:count]]
     
     def preview_article(self, article):
         """预览文章"""
-        print("\n" + "="*60)
-        print("📖 文章预览")
-        print("="*60)
-        print(f"标题: {article['title']}")
-        print(f"类型: {article['type']}")
-        print(f"生成时间: {article['generated_at']}")
+        logger.info("\n" + "="*60)
+        logger.info("📖 文章预览")
+        logger.info("="*60)
+        logger.info(f"标题: {article['title']}")
+        logger.info(f"类型: {article['type']}")
+        logger.info(f"生成时间: {article['generated_at']}")
 
         if 'tool_name' in article:
-            print(f"工具名称: {article['tool_name']}")
+            logger.info(f"工具名称: {article['tool_name']}")
 
-        print("-"*60)
-        print("正文预览:")
+        logger.info("-"*60)
+        logger.info("正文预览:")
         content = article['content']
         preview = content[:300] + "..." if len(content) > 300 else content
-        print(preview)
-        print("-"*60)
-        print("💡 将自动生成专业的AI绘画提示词用于封面图制作")
-        print("="*60)
+        logger.info(preview)
+        logger.info("-"*60)
+        logger.info("💡 将自动生成专业的AI绘画提示词用于封面图制作")
+        logger.info("="*60)
     
     def save_article(self, article):
         """保存文章到文件"""
-        filename = f"article_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
-        filepath = os.path.join('data', filename)
-
-        os.makedirs('data', exist_ok=True)
+        if article.get('stream_path'):
+            # 流式生成时沿用同一文件名，最终版本覆盖流式写入的草稿
+            filepath = article['stream_path'][:-len('.md')] + '.txt'
+        else:
+            filepath = self._new_article_path('.txt')
 
         with open(filepath, 'w', encoding='utf-8') as f:
             f.write(f"标题: {article['title']}\n")
@@ -561,10 +758,13 @@ class AIContentWriter:
             if 'tool_name' in article:
                 f.write(f"工具名称: {article['tool_name']}\n")
 
+            for image in article.get('images', []):
+                f.write(f"配图: {image}\n")
+
             f.write("-" * 50 + "\n")
             f.write(article['content'])
 
-        print(f"💾 文章已保存到: {filepath}")
+        logger.info(f"💾 文章已保存到: {filepath}")
 
         # 只生成wx.md格式版本
         self._save_wxmd_version(article, filepath)
@@ -651,17 +851,17 @@ class AIContentWriter:
         with open(wxmd_filepath, 'w', encoding='utf-8') as f:
             f.write(markdown_content)
 
-        print(f"📝 wx.md格式已保存到: {wxmd_filepath}")
-        print(f"🎨 专业AI绘画提示词已包含在文件中")
-        print("\n🌐 完整使用流程：")
-        print("  1. 📄 内容编辑：打开 https://wx.md")
-        print("  2. 📋 复制内容：将Markdown内容粘贴到左侧编辑器")
-        print("  3. 🎨 制作封面：使用文件中的AI绘画提示词生成封面图")
-        print("     - 推荐工具：Midjourney、DALL-E 3、文心一格")
-        print("     - 尺寸：2.35:1 横版比例，推荐1200×511px")
-        print("  4. 📱 发布文章：点击'复制'按钮，粘贴到微信编辑器")
-        print("  5. 🖼️ 添加封面：上传生成的封面图")
-        print("\n💡 提示：AI绘画提示词经过专业优化，可直接使用或根据需要微调")
+        logger.info(f"📝 wx.md格式已保存到: {wxmd_filepath}")
+        logger.info(f"🎨 专业AI绘画提示词已包含在文件中")
+        logger.info("\n🌐 完整使用流程：")
+        logger.info("  1. 📄 内容编辑：打开 https://wx.md")
+        logger.info("  2. 📋 复制内容：将Markdown内容粘贴到左侧编辑器")
+        logger.info("  3. 🎨 制作封面：使用文件中的AI绘画提示词生成封面图")
+        logger.info("     - 推荐工具：Midjourney、DALL-E 3、文心一格")
+        logger.info("     - 尺寸：2.35:1 横版比例，推荐1200×511px")
+        logger.info("  4. 📱 发布文章：点击'复制'按钮，粘贴到微信编辑器")
+        logger.info("  5. 🖼️ 添加封面：上传生成的封面图")
+        logger.info("\n💡 提示：AI绘画提示词经过专业优化，可直接使用或根据需要微调")
 
     def _generate_cover_prompt(self, article):
         """生成高质量的AI绘画提示词"""
@@ -766,41 +966,63 @@ Additional: minimalist, clean, professional, eye-catching, social media ready
     
     def setup_schedule(self):
         """设置定时任务"""
+        import schedule  # 只有常驻模式用到，按需导入
+
         schedule.every().day.at("08:00").do(self.daily_content_generation)
-        print("⏰ 定时任务设置完成：每天08:00自动生成内容")
+        logger.info("⏰ 定时任务设置完成：每天08:00自动生成内容")
     
     def run(self):
         """运行主程序"""
-        print("🎯 AI内容生成器开始运行...")
+        logger.info("🎯 AI内容生成器开始运行...")
         
         # 设置定时任务
         self.setup_schedule()
         
         # 立即执行一次（测试）
-        print("🧪 立即执行一次内容生成（测试模式）")
+        logger.info("🧪 立即执行一次内容生成（测试模式）")
         self.daily_content_generation()
         
         # 开始定时任务循环
-        print("\n⏰ 等待定时任务执行...")
-        print("💡 提示：按 Ctrl+C 可以停止程序")
+        logger.info("\n⏰ 等待定时任务执行...")
+        logger.info("💡 提示：按 Ctrl+C 可以停止程序")
         
+        import schedule
+
         try:
             while True:
                 schedule.run_pending()
                 time.sleep(60)  # 每分钟检查一次
         except KeyboardInterrupt:
-            print("\n👋 程序已停止")
+            logger.info("\n👋 程序已停止")
 
 def main():
     """主函数"""
+    parser = argparse.ArgumentParser(description="AI工具公众号自动化内容生成器")
+    parser.add_argument('--week', action='store_true', help="批量生成一周七种类型的文章后退出")
+    parser.add_argument('--tools', type=int, metavar='N', help="为收集到的前N个工具各生成一篇新工具文章后退出")
+    parser.add_argument('--workers', type=int, help="批量模式下同时进行的生成请求数")
+    args = parser.parse_args()
+
     try:
         writer = AIContentWriter()
-        writer.run()
+        if args.week:
+            with logger.stage('collect'):
+                jobs = writer.week_jobs()
+            writer.batch_content_generation(jobs, max_workers=args.workers)
+        elif args.tools:
+            with logger.stage('collect'):
+                jobs = writer.tool_jobs(args.tools)
+            writer.batch_content_generation(jobs, max_workers=args.workers)
+        else:
+            writer.run()
     except ValueError as e:
-        print(f"❌ 配置错误: {e}")
-        print("请检查 .env 文件中的 GEMINI_API_KEY 设置")
+        logger.error(f"❌ 配置错误: {e}")
+        logger.info("请检查 .env 文件中的 GEMINI_API_KEY 设置")
     except Exception as e:
-        print(f"❌ 程序运行错误: {e}")
+        logger.error(f"❌ 程序运行错误: {e}")
+    finally:
+        # 缓冲区中的日志在退出前写入文件
+        logger.close()
 
 if __name__ == "__main__":
     main()
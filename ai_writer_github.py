@@ -7,32 +7,58 @@ AI工具公众号自动化内容生成器 - GitHub Actions版
 
 import os
 import json
-import schedule
 import time
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
-import google.generativeai as genai
-import requests
-import feedparser
-from media_generator import MediaGenerator
+from feed_fetcher import FeedFetcher
+from seen_index import SeenIndex
+from stream_writer import stream_generate
+from response_cache import ResponseCache, CachedModel
+from rate_limiter import RateLimitedModel
+from llm_backend import create_backend
+from wechat_client import load_targets
+from delivery_outbox import DeliveryOutbox, file_digest
+from run_logger import RunLogger
 
 # 加载环境变量
 load_dotenv()
 
+# 运行日志：控制台输出 "[时间] 级别: 消息"，同时写入 logs/content_generation_<日期>.jsonl
+logger = RunLogger('content_generation', console='timestamped')
+
 class AIContentWriter:
     """AI内容生成器 - GitHub Actions版"""
     
     def __init__(self):
+        # 大模型后端：gemini（默认）或 stub（本地确定性模拟，无需网络和API密钥）
+        self.backend_name = os.getenv('LLM_BACKEND', 'gemini').lower()
         self.api_key = os.getenv('GEMINI_API_KEY')
-        if not self.api_key or self.api_key == 'your-gemini-api-key-here':
+        if self.backend_name == 'gemini' and (not self.api_key or self.api_key == 'your-gemini-api-key-here'):
             raise ValueError("请在 GitHub Secrets 中设置正确的 GEMINI_API_KEY")
 
-        # 初始化Gemini
-        genai.configure(api_key=self.api_key)
-        self.model = genai.GenerativeModel('gemini-1.5-flash')
-
-        # 企业微信配置
-        self.wechat_webhook_url = os.getenv('WECHAT_WEBHOOK_URL')
+        self.backend = create_backend(self.backend_name, self.api_key)
+        # 限速、重试和熔断（GEMINI_RPM / GEMINI_TPM），缓存命中时不占用配额
+        self.rate_limited_model = RateLimitedModel(
+            self.backend,
+            log=lambda message: self.log_message(message, "WARNING")
+        )
+        # 提示词完全相同时直接复用缓存的响应（LLM_CACHE_BYPASS=true 强制重新生成）
+        self.model = CachedModel(self.rate_limited_model, ResponseCache())
+
+        # RSS并发抓取器
+        self.feed_fetcher = FeedFetcher()
+
+        # 跨运行去重索引，避免重复选用已发布过的内容
+        self.seen_index = SeenIndex()
+
+        # 企业微信配置：WECHAT_WEBHOOK_URL 和 WECHAT_WEBHOOK_URLS 中的所有群，每个群的Webhook请求共用连接池
+        self.wechat_targets = load_targets()
+        # 推送队列：生成一次，通知和文件对每个群各入队一次，由后台线程并行发送，上次未完成的推送在启动时继续发送
+        self.outbox = None
+        if self.wechat_targets:
+            # 后台线程的推送日志与主线程当前阶段无关，固定记为 deliver 阶段
+            self.outbox = DeliveryOutbox(self.wechat_targets,
+                                         log=lambda message: logger.log(message, stage='deliver')).start()
 
         # 内容类型配置
         self.content_schedule = {
@@ -64,139 +90,38 @@ class AIContentWriter:
             }
         }
 
+        # 流式生成模式：边生成边写入文件，中断时保留已生成的部分
+        self.stream_output = os.getenv('STREAM_OUTPUT', 'false').lower() == 'true'
+        self.stream_path = None
+
         # 确保输出目录存在
         self.output_dir = "output"
         os.makedirs(self.output_dir, exist_ok=True)
-        
-        # 确保日志目录存在
-        self.log_dir = "logs"
-        os.makedirs(self.log_dir, exist_ok=True)
 
     def log_message(self, message, level="INFO"):
-        """记录日志消息"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        log_entry = f"[{timestamp}] {level}: {message}"
-        print(log_entry)
-        
-        # 写入日志文件
-        log_file = os.path.join(self.log_dir, f"content_generation_{datetime.now().strftime('%Y%m%d')}.log")
-        with open(log_file, 'a', encoding='utf-8') as f:
-            f.write(log_entry + "\n")
-
-    def send_wechat_notification(self, title, content, success=True):
-        """发送企业微信通知"""
-        if not self.wechat_webhook_url:
-            self.log_message("未配置企业微信Webhook URL，跳过通知", "WARNING")
-            return
-
-        emoji = "✅" if success else "❌"
-        message = f"{emoji} {title}\n\n{content}"
-
-        try:
-            response = requests.post(
-                self.wechat_webhook_url,
-                json={
-                    'msgtype': 'text',
-                    'text': {'content': message}
-                },
-                timeout=10
-            )
-
-            if response.status_code == 200:
-                self.log_message("企业微信通知发送成功")
-            else:
-                self.log_message(f"企业微信通知发送失败: {response.status_code}", "ERROR")
-
-        except Exception as e:
-            self.log_message(f"发送企业微信通知时出错: {str(e)}", "ERROR")
-
-    def upload_file_to_wechat(self, file_path):
-        """上传文件到企业微信获取media_id"""
-        if not self.wechat_webhook_url:
-            self.log_message("未配置企业微信Webhook URL，无法上传文件", "ERROR")
-            return None
-
-        # 从webhook URL中提取key
-        try:
-            key = self.wechat_webhook_url.split('key=')[1]
-            upload_url = f"https://qyapi.weixin.qq.com/cgi-bin/webhook/upload_media?key={key}&type=file"
-
-            with open(file_path, 'rb') as f:
-                files = {
-                    'media': (os.path.basename(file_path), f, 'application/octet-stream')
-                }
-
-                response = requests.post(upload_url, files=files, timeout=30)
-
-                if response.status_code == 200:
-                    result = response.json()
-                    if result.get('errcode') == 0:
-                        media_id = result.get('media_id')
-                        self.log_message(f"文件上传成功，media_id: {media_id}")
-                        return media_id
-                    else:
-                        self.log_message(f"文件上传失败: {result.get('errmsg')}", "ERROR")
-                        return None
-                else:
-                    self.log_message(f"文件上传请求失败: {response.status_code}", "ERROR")
-                    return None
-
-        except Exception as e:
-            self.log_message(f"上传文件时出错: {str(e)}", "ERROR")
-            return None
-
-    def send_file_to_wechat(self, file_path, title="AI生成内容"):
-        """发送文件到企业微信群"""
-        if not os.path.exists(file_path):
-            self.log_message(f"文件不存在: {file_path}", "ERROR")
-            return False
-
-        # 1. 上传文件获取media_id
-        media_id = self.upload_file_to_wechat(file_path)
-        if not media_id:
-            return False
-
-        # 2. 发送文件消息
-        try:
-            response = requests.post(
-                self.wechat_webhook_url,
-                json={
-                    'msgtype': 'file',
-                    'file': {'media_id': media_id}
-                },
-                timeout=10
-            )
-
-            if response.status_code == 200:
-                result = response.json()
-                if result.get('errcode') == 0:
-                    self.log_message(f"文件发送成功: {os.path.basename(file_path)}")
-                    return True
-                else:
-                    self.log_message(f"文件发送失败: {result.get('errmsg')}", "ERROR")
-                    return False
-            else:
-                self.log_message(f"文件发送请求失败: {response.status_code}", "ERROR")
-                return False
-
-        except Exception as e:
-            self.log_message(f"发送文件时出错: {str(e)}", "ERROR")
-            return False
+        """记录日志消息（缓冲写入运行日志，文件在整个运行期间保持打开）"""
+        logger.log(message, level)
 
     def fetch_data_sources(self):
         """获取各种数据源的最新信息"""
         all_data = []
+
+        # 先并发抓取所有RSS类型的数据源，单个源超时不会拖慢其他源
+        feed_urls = [self.data_sources[name]['url'] for name in ('producthunt', 'ai_news')]
+        self.log_message(f"正在并发获取 {len(feed_urls)} 个RSS数据源...")
+        feeds = self.feed_fetcher.fetch_all(feed_urls)
+        self.log_message(self.feed_fetcher.stats_summary())
         
         for source_name, source_config in self.data_sources.items():
             try:
                 self.log_message(f"正在获取 {source_config['description']} 数据...")
                 
                 if source_name == 'producthunt':
-                    data = self._fetch_producthunt_data()
+                    data = self._fetch_producthunt_data(feeds.get(source_config['url']))
                 elif source_name == 'github_trending':
                     data = self._fetch_github_trending()
                 elif source_name == 'ai_news':
-                    data = self._fetch_ai_news()
+                    data = self._fetch_ai_news(feeds.get(source_config['url']))
                 else:
                     continue
                 
@@ -208,13 +133,23 @@ class AIContentWriter:
                     
             except Exception as e:
                 self.log_message(f"获取 {source_config['description']} 数据时出错: {str(e)}", "ERROR")
+
+        # 过滤掉之前已经发布过的内容，避免在重复选题上浪费生成调用
+        fresh_data = [item for item in all_data
+                      if not self.seen_index.is_seen(item.get('link'), item['title'])]
+        if len(fresh_data) < len(all_data):
+            self.log_message(f"跳过 {len(all_data) - len(fresh_data)} 条已发布过的内容")
         
-        return all_data
+        return fresh_data
 
-    def _fetch_producthunt_data(self):
+    def _fetch_producthunt_data(self, feed):
         """获取Product Hunt数据"""
         try:
-            feed = feedparser.parse('https://www.producthunt.com/feed')
+            if feed is None or not feed.ok:
+                reason = feed.error if feed is not None else "未抓取"
+                self.log_message(f"Product Hunt数据源不可用: {reason}", "WARNING")
+                return []
+
             data = []
             
             for entry in feed.entries[:10]:  # 获取最新10条
@@ -245,10 +180,14 @@ class AIContentWriter:
             }
         ]
 
-    def _fetch_ai_news(self):
+    def _fetch_ai_news(self, feed):
         """获取AI新闻"""
         try:
-            feed = feedparser.parse('https://feeds.feedburner.com/oreilly/radar')
+            if feed is None or not feed.ok:
+                reason = feed.error if feed is not None else "未抓取"
+                self.log_message(f"AI新闻数据源不可用: {reason}", "WARNING")
+                return []
+
             data = []
             
             for entry in feed.entries[:5]:  # 获取最新5条
@@ -273,12 +212,20 @@ class AIContentWriter:
             
             self.log_message("正在使用Gemini生成内容...")
             
-            # 调用Gemini API
-            response = self.model.generate_content(prompt)
+            if self.stream_output:
+                # 流式生成：边生成边写入输出文件，中断时保留已生成的部分
+                self.stream_path = self._new_output_path(content_type)
+                self.log_message(f"流式生成中，实时写入: {self.stream_path}")
+                text, stats = stream_generate(self.model, prompt, self.stream_path)
+                self.log_message(stats.summary())
+            else:
+                # 调用Gemini API
+                response = self.model.generate_content(prompt)
+                text = response.text
             
-            if response.text:
+            if text:
                 self.log_message("内容生成成功")
-                return response.text
+                return text
             else:
                 self.log_message("Gemini返回空内容", "ERROR")
                 return None
@@ -335,9 +282,9 @@ class AIContentWriter:
     def save_content(self, content, content_type):
         """保存生成的内容"""
         try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"{content_type}_{timestamp}.md"
-            filepath = os.path.join(self.output_dir, filename)
+            # 流式生成时沿用同一文件，最终版本覆盖流式写入的草稿
+            filepath = self.stream_path or self._new_output_path(content_type)
+            self.stream_path = None
             
             with open(filepath, 'w', encoding='utf-8') as f:
                 f.write(content)
@@ -349,6 +296,11 @@ class AIContentWriter:
             self.log_message(f"保存内容失败: {str(e)}", "ERROR")
             return None
 
+    def _new_output_path(self, content_type):
+        """生成输出目录下带时间戳的文件路径"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return os.path.join(self.output_dir, f"{content_type}_{timestamp}.md")
+
     def run_daily_generation(self):
         """执行每日内容生成任务"""
         try:
@@ -361,7 +313,8 @@ class AIContentWriter:
             self.log_message(f"今日内容类型: {content_type}")
             
             # 获取数据源
-            data_sources = self.fetch_data_sources()
+            with logger.stage('fetch'):
+                data_sources = self.fetch_data_sources()
             
             if not data_sources:
                 self.log_message("未获取到任何数据源，使用默认内容", "WARNING")
@@ -374,27 +327,28 @@ class AIContentWriter:
                 ]
             
             # 生成内容
-            content = self.generate_content(content_type, data_sources)
+            with logger.stage('generate'):
+                content = self.generate_content(content_type, data_sources)
+            self.log_message(self.model.cache.stats_summary())
+            self.log_message(self.rate_limited_model.stats_summary())
             
             if content:
                 # 保存内容
-                filepath = self.save_content(content, content_type)
+                with logger.stage('save'):
+                    filepath = self.save_content(content, content_type)
 
                 if filepath:
-                    # 先发送文本通知
-                    self.send_wechat_notification(
+                    # 记录本次写入提示词的内容，之后的运行不再重复选题
+                    for item in data_sources[:5]:
+                        self.seen_index.mark_seen(item.get('link'), item['title'])
+
+                    # 文本通知和文件加入推送队列，由后台线程发送，生成任务到此结束
+                    self.queue_delivery(
                         "AI内容生成成功",
                         f"今日{content_type}类型文章已生成完成\n文件: {os.path.basename(filepath)}\n\n{content[:200]}...",
-                        success=True
+                        filepath
                     )
-
-                    # 然后发送文件
-                    file_sent = self.send_file_to_wechat(filepath, f"AI生成文章-{content_type}")
-
-                    if file_sent:
-                        self.log_message("每日内容生成任务完成，文件已发送到企业微信")
-                    else:
-                        self.log_message("内容生成完成，但文件发送失败", "WARNING")
+                    self.log_message("每日内容生成任务完成，推送已加入后台队列")
                 else:
                     raise Exception("内容保存失败")
             else:
@@ -404,12 +358,32 @@ class AIContentWriter:
             error_msg = f"每日内容生成任务失败: {str(e)}"
             self.log_message(error_msg, "ERROR")
             
-            # 发送失败通知
-            self.send_wechat_notification(
-                "AI内容生成失败",
-                error_msg,
-                success=False
-            )
+            # 发送失败通知（幂等键带上时间，每次失败都会通知）
+            self.queue_delivery("AI内容生成失败", error_msg, success=False,
+                                key=f"failure:{datetime.now().isoformat()}")
+
+    def queue_delivery(self, title, content, filepath=None, success=True, key=None):
+        """把通知（以及文件）加入每个群的推送队列；同一文件对每个群只会推送一次，重复运行不会重复发送"""
+        if not self.outbox:
+            self.log_message("未配置企业微信Webhook URL，跳过通知", "WARNING")
+            return
+
+        emoji = "✅" if success else "❌"
+        key = key or (f"notify:{file_digest(filepath)}" if filepath else None)
+        self.outbox.enqueue_text_all(f"{emoji} {title}\n\n{content}", key=key)
+        if filepath:
+            self.outbox.enqueue_file_all(filepath)
+
+    def finish_deliveries(self):
+        """等待队列中的推送发送完毕（最多 OUTBOX_DRAIN_TIMEOUT 秒），未完成的留到下次运行"""
+        if not self.outbox:
+            return
+        with logger.stage('deliver'):
+            remaining = self.outbox.drain()
+            if remaining:
+                self.log_message(f"还有 {remaining} 条推送未完成，将在下次运行时继续发送", "WARNING")
+            self.log_message(self.outbox.stats_summary())
+            self.outbox.close()
 
 def main():
     """主函数 - GitHub Actions入口"""
@@ -419,12 +393,18 @@ def main():
         
         # 直接运行一次生成任务
         writer.run_daily_generation()
+
+        # 进程退出前等待后台推送完成
+        writer.finish_deliveries()
         
         writer.log_message("AI内容生成器任务完成")
         
     except Exception as e:
-        print(f"程序运行出错: {str(e)}")
+        logger.error(f"程序运行出错: {str(e)}")
         exit(1)
+    finally:
+        # 缓冲区中的日志在退出前写入文件
+        logger.close()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+批量生成基准测试
+用本地Gemini模拟服务器对比逐篇生成一周七篇文章与 batch_generate 并发生成的耗时
+
+用法: python benchmarks/bench_batch_generation.py
+"""
+
+import os
+import sys
+import time
+import tempfile
+import contextlib
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+os.environ.setdefault('GEMINI_API_KEY', 'benchmark-fake-key')
+
+from fake_gemini_server import start_fake_gemini_server, FakeGeminiModel
+from rate_limiter import RateLimitedModel
+
+
+def make_writer(base_url):
+    import ai_writer
+
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        writer = ai_writer.AIContentWriter()
+    writer.model = FakeGeminiModel(base_url)
+    writer.collect_ai_tools = lambda min_count=1: [
+        {'name': 'Cursor', 'description': 'AI代码编辑器', 'url': 'https://cursor.sh'},
+        {'name': 'Gamma', 'description': 'AI演示文稿生成工具', 'url': 'https://gamma.app'},
+    ]
+    return writer
+
+
+def main():
+    server, base_url = start_fake_gemini_server()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        writer = make_writer(base_url)
+        jobs = writer.week_jobs()
+
+        print(f"📊 批量生成基准测试（{len(jobs)} 篇，模拟延迟 0.5~2.0s）")
+        print("-" * 60)
+
+        start = time.perf_counter()
+        sequential = [writer._generate_job(*job) for job in jobs]
+        sequential_time = time.perf_counter() - start
+        print(f"逐篇生成:              {sequential_time:6.2f}s")
+
+        for workers in (2, 4, 7):
+            start = time.perf_counter()
+            batch = writer.batch_generate(jobs, max_workers=workers)
+            elapsed = time.perf_counter() - start
+            ordered = [a['type'] for a in batch] == [a['type'] for a in sequential]
+            print(f"并发生成 (workers={workers}):  {elapsed:6.2f}s  "
+                  f"加速 {sequential_time / elapsed:.1f}x  顺序一致: {ordered}")
+
+        writer.model = RateLimitedModel(FakeGeminiModel(base_url), rpm=60, log=lambda message: None)
+        start = time.perf_counter()
+        writer.batch_generate(jobs, max_workers=7)
+        print(f"并发生成 (限速60rpm):  {time.perf_counter() - start:6.2f}s")
+
+        os.chdir(ROOT)
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
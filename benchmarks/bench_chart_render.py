@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+图表渲染基准测试
+对比原先每次用 pyplot 从头创建图形与复用 Agg 图形模板 (chart_renderer) 的单张耗时和进程峰值内存，
+两种方式分别在独立子进程中运行，峰值内存 (ru_maxrss) 互不影响
+
+用法: python benchmarks/bench_chart_render.py [每种图表的张数]
+"""
+
+import os
+import sys
+import json
+import time
+import resource
+import tempfile
+import warnings
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def legacy_comparison(filepath):
+    """原 _generate_comparison_chart 的实现"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    plt.rcParams['font.sans-serif'] = ['SimHei', 'Arial Unicode MS', 'DejaVu Sans']
+    plt.rcParams['axes.unicode_minus'] = False
+    fig, ax = plt.subplots(figsize=(10, 6))
+    tools = ['工具A', '工具B']
+    features = ['易用性', '功能性', '价格', '支持']
+    x = range(len(features))
+    width = 0.35
+    ax.bar([i - width/2 for i in x], [8, 9, 6, 7], width, label=tools[0], color='#4A90E2')
+    ax.bar([i + width/2 for i in x], [7, 8, 9, 8], width, label=tools[1], color='#F5A623')
+    ax.set_xlabel('评估维度')
+    ax.set_ylabel('评分')
+    ax.set_title('AI工具对比分析')
+    ax.set_xticks(x)
+    ax.set_xticklabels(features)
+    ax.legend()
+    ax.set_ylim(0, 10)
+    plt.savefig(filepath, dpi=300, bbox_inches='tight')
+    plt.close()
+
+
+def legacy_stats(filepath):
+    """原 _generate_stats_chart 的实现"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    plt.rcParams['font.sans-serif'] = ['SimHei', 'Arial Unicode MS', 'DejaVu Sans']
+    plt.rcParams['axes.unicode_minus'] = False
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 6))
+    colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7']
+    ax1.pie([35, 25, 20, 15, 5], labels=['对话AI', '图像生成', '文档处理', '代码助手', '其他'],
+            colors=colors, autopct='%1.1f%%', startangle=90)
+    ax1.set_title('本周热门AI工具类型分布', fontsize=14, fontweight='bold')
+    popularity = [95, 88, 82, 76, 71]
+    bars = ax2.bar(['ChatGPT', 'Midjourney', 'Claude', 'Notion AI', 'GitHub Copilot'], popularity, color=colors)
+    ax2.set_title('本周AI工具热度排行', fontsize=14, fontweight='bold')
+    ax2.set_ylabel('热度指数')
+    ax2.set_ylim(0, 100)
+    for bar, value in zip(bars, popularity):
+        ax2.text(bar.get_x() + bar.get_width()/2., bar.get_height() + 1, f'{value}', ha='center', va='bottom')
+    ax2.tick_params(axis='x', rotation=45)
+    plt.tight_layout()
+    plt.savefig(filepath, dpi=300, bbox_inches='tight')
+    plt.close()
+
+
+def run_mode(mode, count):
+    """在当前进程中渲染，返回各图表的首张/后续平均耗时和峰值内存"""
+    warnings.filterwarnings('ignore')  # 缺少中文字形的警告
+    from chart_renderer import render_chart
+
+    renderers = {
+        'legacy': {'comparison': legacy_comparison, 'stats': legacy_stats},
+        'template': {kind: (lambda path, kind=kind: render_chart(kind, {}, path, dpi=300))
+                     for kind in ('comparison', 'stats')},
+    }[mode]
+
+    result = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for kind, render in renderers.items():
+            timings = []
+            for i in range(count):
+                start = time.perf_counter()
+                render(os.path.join(workdir, f"{kind}_{i}.png"))
+                timings.append(time.perf_counter() - start)
+            result[kind] = {'first': timings[0], 'rest': sum(timings[1:]) / max(1, count - 1)}
+    result['peak_rss_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return result
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == '--child':
+        print(json.dumps(run_mode(sys.argv[2], int(sys.argv[3]))))
+        return
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    results = {}
+    for mode in ('legacy', 'template'):
+        output = subprocess.run([sys.executable, __file__, '--child', mode, str(count)],
+                                capture_output=True, text=True, check=True).stdout
+        results[mode] = json.loads(output.strip().splitlines()[-1])
+
+    print(f"📊 图表渲染基准测试（每种图表 {count} 张，dpi=300）")
+    print("-" * 60)
+    for kind in ('comparison', 'stats'):
+        legacy, template = results['legacy'][kind], results['template'][kind]
+        print(f"{kind}:")
+        print(f"  pyplot重新创建: 首张 {legacy['first'] * 1000:7.1f}ms  之后 {legacy['rest'] * 1000:7.1f}ms/张")
+        print(f"  复用Agg模板:    首张 {template['first'] * 1000:7.1f}ms  之后 {template['rest'] * 1000:7.1f}ms/张"
+              f"  ({legacy['rest'] / template['rest']:4.2f}x)")
+    print(f"峰值内存: pyplot {results['legacy']['peak_rss_mb']:.1f}MB，"
+          f"模板 {results['template']['peak_rss_mb']:.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
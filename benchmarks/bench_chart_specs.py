@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+配图记忆化基准测试
+用精选工具库生成四种配图数据，对比首次渲染与相同数据再次渲染（按内容哈希命中已有文件）的耗时
+"""
+
+import os
+import sys
+import time
+import tempfile
+import warnings
+import contextlib
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from chart_specs import comparison_from_tools, stats_from_tools, steps_from_tool, features_from_tool
+from media_generator import MediaGenerator
+
+TOOLS = [
+    {'name': 'ChatGPT', 'description': 'OpenAI开发的对话式AI助手，支持GPT-4o模型', 'url': 'https://chat.openai.com',
+     'category': '对话AI', 'hot_features': ['GPT-4o', '多模态', '实时对话', 'Code Interpreter']},
+    {'name': 'Midjourney', 'description': '顶级AI图像生成工具', 'url': 'https://midjourney.com',
+     'category': '图像生成', 'hot_features': ['V6版本', '超高画质', '艺术风格']},
+    {'name': 'Cursor', 'description': '基于AI的代码编辑器', 'url': 'https://cursor.sh', 'relevance': 4,
+     'matched_keywords': ['cursor', 'ai', 'coding']},
+]
+
+
+def main():
+    warnings.filterwarnings('ignore')  # 缺少中文字形的警告
+    specs = [comparison_from_tools(TOOLS), stats_from_tools(TOOLS),
+             steps_from_tool(TOOLS[0]), features_from_tool(TOOLS[0])]
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        with contextlib.redirect_stdout(open(os.devnull, 'w')):
+            generator = MediaGenerator()
+
+        print("📊 配图记忆化基准测试（数据来自工具列表）")
+        print("-" * 60)
+        for spec in specs:
+            with contextlib.redirect_stdout(open(os.devnull, 'w')):
+                start = time.perf_counter()
+                first = generator.generate_content_image(spec.kind, spec)
+                rendered = time.perf_counter() - start
+                start = time.perf_counter()
+                again = generator.generate_content_image(spec.kind, spec)
+                cached = time.perf_counter() - start
+            assert first == again
+            print(f"{spec.kind:<11} 首次渲染 {rendered * 1000:8.1f}ms  相同数据 {cached * 1000:6.2f}ms  "
+                  f"→ {os.path.basename(first)}")
+        os.chdir(ROOT)
+
+
+if __name__ == "__main__":
+    main()
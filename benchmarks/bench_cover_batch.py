@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+批量封面生成基准测试
+对比逐张生成与进程池批量生成 (MediaGenerator.generate_covers) 在 1 / 10 / 100 张封面下的耗时，
+进程池耗时包含工作进程启动和预热；并行收益取决于机器核心数
+
+用法: python benchmarks/bench_cover_batch.py [最大进程数]
+"""
+
+import os
+import sys
+import time
+import random
+import tempfile
+import contextlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from media_generator import MediaGenerator
+
+TITLES = [
+    "🔥Notion AI太牛了！我用了一周，效率翻了3倍",
+    "「ChatGPT」与《Claude》深度对比：写作、编程、分析谁更强？",
+    "打工人必备的10个免费AI工具，最后一个绝了",
+    "Cursor 实测：AI 编程助手到底能不能替代程序员",
+]
+TOOLS = ["Notion AI", "ChatGPT", "Claude", "Cursor", ""]
+STYLES = ["tech", "warm", "purple"]
+
+
+def make_jobs(count, tag=''):
+    """标题带序号和 tag，保证每张封面都需要真正渲染（相同输入会命中媒体存储中的已有文件）"""
+    rng = random.Random(count)
+    return [(f"{rng.choice(TITLES)} {tag}{i}", rng.choice(TOOLS), rng.choice(STYLES)) for i in range(count)]
+
+
+def main():
+    cpus = os.cpu_count() or 1
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else max(4, cpus)
+    worker_counts = sorted({w for w in (2, 4, cpus, max_workers) if 2 <= w <= max_workers})
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        with contextlib.redirect_stdout(open(os.devnull, 'w')):
+            generator = MediaGenerator()
+            generator.generate_cover_image(*make_jobs(1, 'warmup')[0])  # 预热字体和渐变缓存，与工作进程的预热对等
+
+        print(f"📊 批量封面生成基准测试（CPU核心数: {cpus}）")
+        print("-" * 60)
+        for count in (1, 10, 100):
+            jobs = make_jobs(count, 'seq')
+            with contextlib.redirect_stdout(open(os.devnull, 'w')):
+                start = time.perf_counter()
+                for job in jobs:
+                    generator.generate_cover_image(*job)
+                sequential = time.perf_counter() - start
+
+            print(f"{count:>3} 张  逐张生成: {sequential:6.2f}s  ({sequential / count * 1000:6.1f}ms/张)")
+            for workers in worker_counts:
+                jobs = make_jobs(count, f'pool{workers}-')
+                with contextlib.redirect_stdout(open(os.devnull, 'w')):
+                    start = time.perf_counter()
+                    paths = generator.generate_covers(jobs, workers=workers)
+                    elapsed = time.perf_counter() - start
+                assert len(paths) == count and len(set(paths)) == count
+                print(f"{count:>3} 张  {workers} 进程:   {elapsed:6.2f}s  ({elapsed / count * 1000:6.1f}ms/张, "
+                      f"{sequential / elapsed:4.1f}x)")
+        print("-" * 60)
+        os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+封面图层合成基准测试
+对比原先的绘制方式（RGB画布上直接绘制，装饰圆形画在从未粘贴的图片上、阴影的透明度被忽略）
+与图层合成（缓存的背景+装饰层上合成一层文字）的单张耗时，并检查装饰和半透明阴影确实出现在输出中
+"""
+
+import os
+import sys
+import time
+import random
+import tempfile
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image, ImageChops, ImageDraw
+
+import cover_layers
+from cover_layers import new_layer, cover_background, compose
+from gradients import paste_gradient
+from media_generator import MediaGenerator, COVER_STYLES
+
+TITLE = "🔥Notion AI太牛了！我用了一周，效率翻了3倍"
+ROUNDS = 50
+
+
+def legacy_cover(generator, colors):
+    """原 _draw_cover：装饰圆形只画在临时图片上，阴影的RGBA颜色画在RGB画布上"""
+    img = Image.new('RGB', generator.cover_size, color='white')
+    draw = ImageDraw.Draw(img)
+    paste_gradient(img, colors)
+    width, height = generator.cover_size
+    for _ in range(5):
+        radius = random.randint(20, 80)
+        alpha = random.randint(10, 30)
+        circle_img = Image.new('RGBA', (radius * 2, radius * 2), (255, 255, 255, alpha))
+        ImageDraw.Draw(circle_img).ellipse([0, 0, radius * 2, radius * 2], fill=(255, 255, 255, alpha))
+    generator._add_title_text(draw, TITLE, generator.cover_size)
+    generator._add_tool_label(draw, "Notion AI", generator.cover_size)
+    generator._add_date(draw, "2025.07.01", generator.cover_size)
+    return img
+
+
+def layered_cover(generator, colors, seed):
+    layer = new_layer(generator.cover_size)
+    draw = ImageDraw.Draw(layer)
+    generator._add_title_text(draw, TITLE, generator.cover_size)
+    generator._add_tool_label(draw, "Notion AI", generator.cover_size)
+    generator._add_date(draw, "2025.07.01", generator.cover_size)
+    return compose(cover_background(generator.cover_size, colors, seed), layer)
+
+
+def timed(func):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        result = func()
+    return (time.perf_counter() - start) / ROUNDS * 1000, result
+
+
+def main():
+    warnings.filterwarnings('ignore')  # 缺少中文字形的警告
+    with tempfile.TemporaryDirectory() as workdir:
+        generator = MediaGenerator(workdir)
+    colors = COVER_STYLES["tech"]
+    layered_cover(generator, colors, 0)  # 预热字体和渐变缓存
+
+    print("📊 封面图层合成基准测试")
+    print("-" * 60)
+    legacy_ms, legacy = timed(lambda: legacy_cover(generator, colors))
+    cover_layers._background.cache_clear()
+    cover_layers.decorative_overlay.cache_clear()
+    start = time.perf_counter()
+    cover_background(generator.cover_size, colors, 3)
+    cold_ms = (time.perf_counter() - start) * 1000
+    layered_ms, layered = timed(lambda: layered_cover(generator, colors, 3))
+    print(f"原绘制方式（装饰未生效）: {legacy_ms:6.1f}ms/张")
+    print(f"背景+装饰层首次合成:     {cold_ms:6.1f}ms（每种风格×布局一次）")
+    print(f"图层合成（背景命中缓存）: {layered_ms:6.1f}ms/张")
+
+    # 装饰层：与纯渐变相比有像素变亮；阴影：标题下方出现比背景更暗的像素
+    plain = Image.new('RGB', generator.cover_size)
+    paste_gradient(plain, colors)
+    background = cover_background(generator.cover_size, colors, 3).convert('RGB')
+    decorated = sum(1 for value in ImageChops.subtract(background, plain).convert('L').getdata() if value)
+    darker = sum(1 for value in ImageChops.subtract(plain, layered).convert('L').getdata() if value > 8)
+    legacy_darker = sum(1 for value in ImageChops.subtract(plain, legacy).convert('L').getdata() if value > 8)
+    print(f"装饰圆形覆盖像素: {decorated}（原实现: 0）")
+    print(f"阴影变暗像素:     {darker}（原实现: {legacy_darker}，RGB画布上阴影为不透明黑色）")
+    print("-" * 60)
+
+
+if __name__ == "__main__":
+    main()
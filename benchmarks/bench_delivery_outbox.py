@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+推送队列基准测试（本地企业微信模拟服务）
+1. 慢Webhook（每个请求 0.5s）下，生成流程在推送上等待的时间：逐个同步推送 vs 加入队列后台发送
+2. 前几次请求失败时，队列按退避重试直到成功
+3. 同一文件重复入队只发送一次；进程在发送前退出后，下次运行从队列继续发送
+
+用法: python benchmarks/bench_delivery_outbox.py
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fake_wechat_server import start_fake_wechat_server
+from wechat_client import WeChatClient
+from delivery_outbox import DeliveryOutbox
+
+os.environ['NO_PROXY'] = '127.0.0.1,localhost'
+quiet = lambda message, level=None: None
+
+
+def write_article(workdir, name, text):
+    path = os.path.join(workdir, name)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    return path
+
+
+def main():
+    with tempfile.TemporaryDirectory() as workdir:
+        os.environ['WECHAT_UPLOAD_CACHE_PATH'] = os.path.join(workdir, 'uploads.db')
+        article = write_article(workdir, 'new_tool.md', '# AI工具推荐\n\n' + '正文内容。' * 500)
+        print("📊 推送队列基准测试")
+        print("-" * 60)
+
+        # 1. 慢Webhook：同步推送 vs 入队
+        server, webhook_url = start_fake_wechat_server(delay=0.5)
+        client = WeChatClient(webhook_url)
+        start = time.perf_counter()
+        client.send_text("✅ AI内容生成成功")
+        client.send_file(client.upload_media(article))
+        inline = time.perf_counter() - start
+
+        outbox = DeliveryOutbox({'default': webhook_url}, path=os.path.join(workdir, 'slow.db'), log=quiet).start()
+        start = time.perf_counter()
+        outbox.enqueue_text('default', "✅ AI内容生成成功")
+        outbox.enqueue_file('default', article)
+        queued = time.perf_counter() - start
+        outbox.drain(timeout=30)
+        delivered = time.perf_counter() - start
+        outbox.close()
+        print(f"慢Webhook(0.5s/请求) 同步推送阻塞生成: {inline * 1000:7.1f}ms")
+        print(f"慢Webhook(0.5s/请求) 入队阻塞生成:     {queued * 1000:7.1f}ms（后台 {delivered:.2f}s 内送达）")
+        server.shutdown()
+
+        # 2. 前 3 个请求失败：退避重试
+        server, webhook_url = start_fake_wechat_server(fail_first=3)
+        outbox = DeliveryOutbox({'default': webhook_url}, path=os.path.join(workdir, 'retry.db'),
+                                base_delay=0.05, max_delay=0.5, log=quiet).start()
+        outbox.enqueue_file('default', article)
+        remaining = outbox.drain(timeout=30)
+        print(f"前3个请求失败: 剩余 {remaining} 条，{outbox.stats_summary()}")
+        outbox.close()
+        server.shutdown()
+
+        # 3. 幂等和恢复（使用新的上传缓存，前面的场景已上传过同一文件）
+        os.environ['WECHAT_UPLOAD_CACHE_PATH'] = os.path.join(workdir, 'resume_uploads.db')
+        server, webhook_url = start_fake_wechat_server()
+        db = os.path.join(workdir, 'resume.db')
+        first_run = DeliveryOutbox({'default': webhook_url}, path=db, log=quiet)  # 不启动后台线程，模拟发送前退出
+        first_run.enqueue_file('default', article)
+        first_run.enqueue_file('default', article)
+        first_run.close()
+
+        second_run = DeliveryOutbox({'default': webhook_url}, path=db, log=quiet).start()
+        second_run.enqueue_file('default', article)  # 下次运行再次生成同一文件
+        second_run.drain(timeout=30)
+        third_run = DeliveryOutbox({'default': webhook_url}, path=db, log=quiet)
+        resent = third_run.enqueue_file('default', article)
+        third_run.close()
+        print(f"同一文件入队 4 次（跨 3 次运行）: 上传 {server.counts.get('/cgi-bin/webhook/upload_media', 0)} 次，"
+              f"发送 {server.counts.get('/cgi-bin/webhook/send', 0)} 次，发送后再次入队被忽略: {not resent}")
+        second_run.close()
+        server.shutdown()
+        print("-" * 60)
+
+
+if __name__ == "__main__":
+    main()
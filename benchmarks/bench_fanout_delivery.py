@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+多群推送基准测试（本地企业微信模拟服务）
+1. 同一篇文章（文本通知 + 文件）推送到 5 个群，其中一个群响应慢：逐个群同步发送 vs 推送队列并行发送
+2. 每个群机器人每分钟20条的限速：用 1 秒窗口、5 条上限演示滑动窗口限速，任意窗口内都不超过上限
+
+用法: python benchmarks/bench_fanout_delivery.py
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fake_wechat_server import start_fake_wechat_server
+from wechat_client import WeChatClient
+from delivery_outbox import DeliveryOutbox
+from rate_limiter import SlidingWindowLimiter
+
+os.environ['NO_PROXY'] = '127.0.0.1,localhost'
+quiet = lambda message, level=None: None
+
+GROUPS = 5
+DELAY = 0.2       # 每个请求的响应时间（秒）
+SLOW_DELAY = 1.0  # 最后一个群的响应时间
+
+
+def write_article(workdir):
+    path = os.path.join(workdir, 'weekly_report.md')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('# 本周AI工具周报\n\n' + '正文内容。' * 500)
+    return path
+
+
+def start_groups():
+    servers, targets = [], {}
+    for i in range(GROUPS):
+        server, webhook_url = start_fake_wechat_server(delay=SLOW_DELAY if i == GROUPS - 1 else DELAY)
+        servers.append(server)
+        targets[f"group{i + 1}"] = webhook_url
+    return servers, targets
+
+
+def max_in_window(timestamps, window):
+    return max(sum(1 for t in timestamps if start <= t < start + window) for start in timestamps)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as workdir:
+        article = write_article(workdir)
+        print("📊 多群推送基准测试")
+        print(f"{GROUPS} 个群，每个请求 {DELAY}s（最后一个群 {SLOW_DELAY}s），每个群: 文本通知 + 上传文件 + 文件消息")
+        print("-" * 60)
+
+        # 1. 逐个群同步发送
+        os.environ['WECHAT_UPLOAD_CACHE_PATH'] = os.path.join(workdir, 'sequential_uploads.db')
+        servers, targets = start_groups()
+        start = time.perf_counter()
+        for webhook_url in targets.values():
+            with WeChatClient(webhook_url) as client:
+                client.send_text("✅ AI内容生成成功")
+                client.send_file_path(article)
+        sequential = time.perf_counter() - start
+        for server in servers:
+            server.shutdown()
+        print(f"逐个群同步发送:       {sequential:6.2f}s")
+
+        # 2. 推送队列并行发送（内容只生成一次，每个群各入队一次）
+        os.environ['WECHAT_UPLOAD_CACHE_PATH'] = os.path.join(workdir, 'fanout_uploads.db')
+        servers, targets = start_groups()
+        outbox = DeliveryOutbox(targets, path=os.path.join(workdir, 'fanout.db'), workers=GROUPS, log=quiet).start()
+        start = time.perf_counter()
+        outbox.enqueue_text_all("✅ AI内容生成成功")
+        outbox.enqueue_file_all(article)
+        remaining = outbox.drain(timeout=60)
+        parallel = time.perf_counter() - start
+        print(f"推送队列并行发送:     {parallel:6.2f}s（{sequential / parallel:.1f}x，剩余 {remaining} 条）")
+        print(outbox.stats_summary())
+        outbox.close()
+        for server in servers:
+            server.shutdown()
+        print("-" * 60)
+
+        # 3. 滑动窗口限速：12 条消息，每秒最多 5 条
+        server, webhook_url = start_fake_wechat_server()
+        client = WeChatClient(webhook_url, rate_limit=0)
+        limiter = SlidingWindowLimiter(5, 1.0)
+        sent_at = []  # 限速器放行的时刻（与限速器使用同一时钟）
+
+        def acquire():
+            waited = limiter.acquire()
+            sent_at.append(time.monotonic())
+            return waited
+
+        client.limiter = type('RecordingLimiter', (), {'acquire': staticmethod(acquire)})()
+        start = time.perf_counter()
+        for i in range(12):
+            client.send_text(f"消息 {i + 1}")
+        elapsed = time.perf_counter() - start
+        print(f"限速 5条/秒 发送 12 条: {elapsed:.2f}s，等待 {client.stats['throttled']:.2f}s，"
+              f"任意1秒窗口内最多 {max_in_window(sent_at, 1.0)} 条")
+        client.close()
+        server.shutdown()
+        print("-" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+RSS条件请求缓存基准测试
+对比首次抓取（完整下载+解析）与再次抓取（304复用缓存）的流量和耗时
+
+用法: python benchmarks/bench_feed_cache.py
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from feed_cache import FeedCache
+from feed_fetcher import FeedFetcher
+from local_feed_server import start_feed_server, ConditionalFeedHandler
+
+FEEDS = ['techcrunch', 'theverge', 'venturebeat', 'oreilly']
+
+
+def run(urls, cache_dir, label):
+    fetcher = FeedFetcher(timeout=10, deadline=30, cache=FeedCache(cache_dir))
+    start = time.perf_counter()
+    results = fetcher.fetch_all(urls)
+    elapsed = time.perf_counter() - start
+    entries = sum(len(r.entries) for r in results.values())
+    print(f"{label}: {elapsed * 1000:7.1f}ms  条目 {entries}")
+    print(f"    {fetcher.stats_summary()}")
+
+
+def main():
+    # 避免本地请求走代理
+    for key in ('http_proxy', 'https_proxy', 'all_proxy', 'HTTP_PROXY', 'HTTPS_PROXY', 'ALL_PROXY'):
+        os.environ.pop(key, None)
+
+    server, base_url = start_feed_server(ConditionalFeedHandler)
+    urls = [f"{base_url}/feed/{name}" for name in FEEDS]
+
+    print("📊 RSS条件请求缓存基准测试")
+    print("-" * 60)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        run(urls, cache_dir, "首次运行(冷缓存)")
+        run(urls, cache_dir, "再次运行(304)   ")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+RSS抓取基准测试
+对比逐个 feedparser.parse(url) 与 FeedFetcher 并发抓取在慢源下的耗时
+
+用法: python benchmarks/bench_feed_fetch.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import feedparser
+
+from feed_fetcher import FeedFetcher
+from local_feed_server import start_feed_server
+
+# 模拟四个数据源的响应延迟（秒），最后一个源远超单源超时
+DELAYS = {
+    'techcrunch': 0.8,
+    'theverge': 1.2,
+    'venturebeat': 0.5,
+    'oreilly': 6.0,
+}
+
+
+def run_sequential(urls):
+    """原有实现：逐个解析，总耗时为各源延迟之和"""
+    start = time.perf_counter()
+    counts = [len(feedparser.parse(url).entries) for url in urls]
+    return time.perf_counter() - start, counts
+
+
+def run_concurrent(urls, timeout, deadline):
+    """并发实现：总耗时约为最慢源与截止时间中的较小值"""
+    fetcher = FeedFetcher(timeout=timeout, deadline=deadline, cache=False)
+    start = time.perf_counter()
+    results = fetcher.fetch_all(urls)
+    return time.perf_counter() - start, [len(r.entries) for r in results.values()]
+
+
+def main():
+    # 避免本地请求走代理
+    for key in ('http_proxy', 'https_proxy', 'all_proxy', 'HTTP_PROXY', 'HTTPS_PROXY', 'ALL_PROXY'):
+        os.environ.pop(key, None)
+
+    server, base_url = start_feed_server()
+    urls = [f"{base_url}/feed/{name}?delay={delay}" for name, delay in DELAYS.items()]
+
+    print("📊 RSS抓取基准测试")
+    print(f"模拟延迟: {DELAYS}")
+    print("-" * 60)
+
+    elapsed, counts = run_sequential(urls)
+    print(f"逐个抓取:              {elapsed:6.2f}s  条目数 {counts}")
+
+    elapsed, counts = run_concurrent(urls, timeout=10, deadline=30)
+    print(f"并发抓取(无超时):      {elapsed:6.2f}s  条目数 {counts}")
+
+    elapsed, counts = run_concurrent(urls, timeout=2, deadline=30)
+    print(f"并发抓取(单源超时2s):  {elapsed:6.2f}s  条目数 {counts}")
+
+    elapsed, counts = run_concurrent(urls, timeout=10, deadline=1.5)
+    print(f"并发抓取(截止1.5s):    {elapsed:6.2f}s  条目数 {counts}")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
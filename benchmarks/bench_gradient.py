@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+渐变背景生成基准测试
+对比原先逐行 draw.line 的实现、numpy向量化实现（首次生成）和缓存命中三种情况，
+并校验纵向渐变与逐行实现的像素差异
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image, ImageChops, ImageDraw
+import gradients
+from gradients import gradient_image
+
+SIZE = (900, 500)
+COLORS = [(64, 123, 255), (112, 161, 255)]
+
+
+def per_row_gradient(size, colors):
+    """原 MediaGenerator._draw_gradient 的实现"""
+    img = Image.new('RGB', size, color='white')
+    draw = ImageDraw.Draw(img)
+    width, height = size
+    start_color, end_color = colors
+    for y in range(height):
+        ratio = y / height
+        r = int(start_color[0] * (1 - ratio) + end_color[0] * ratio)
+        g = int(start_color[1] * (1 - ratio) + end_color[1] * ratio)
+        b = int(start_color[2] * (1 - ratio) + end_color[2] * ratio)
+        draw.line([(0, y), (width, y)], fill=(r, g, b))
+    return img
+
+
+def timeit(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def uncached(direction, colors=COLORS):
+    gradients._render.cache_clear()
+    return gradient_image(SIZE, colors, direction)
+
+
+def main():
+    repeat = 50
+    gradient_image((1, 1), COLORS)  # 预先导入numpy，不计入耗时
+
+    print(f"📊 渐变背景生成基准测试（{SIZE[0]}x{SIZE[1]}，每项 {repeat} 次取平均）")
+    print("-" * 60)
+    baseline = timeit(lambda: per_row_gradient(SIZE, COLORS), repeat)
+    print(f"逐行 draw.line:        {baseline:7.2f}ms")
+
+    for direction in ('vertical', 'horizontal', 'diagonal'):
+        elapsed = timeit(lambda: uncached(direction), repeat)
+        print(f"向量化 {direction:<11}:   {elapsed:7.2f}ms  ({baseline / elapsed:5.1f}x)")
+
+    multi = [(255, 107, 107), (78, 205, 196), (69, 183, 209), (150, 206, 180)]
+    elapsed = timeit(lambda: uncached('diagonal', multi), repeat)
+    print(f"向量化 4色对角线:      {elapsed:7.2f}ms  ({baseline / elapsed:5.1f}x)")
+
+    gradient_image(SIZE, COLORS)
+    elapsed = timeit(lambda: gradient_image(SIZE, COLORS), repeat)
+    print(f"缓存命中(返回副本):    {elapsed:7.2f}ms  ({baseline / elapsed:5.1f}x)")
+
+    diff = ImageChops.difference(per_row_gradient(SIZE, COLORS), gradient_image(SIZE, COLORS))
+    max_diff = max(high for _, high in diff.getextrema())
+    print("-" * 60)
+    print(f"纵向渐变与逐行实现的最大像素差: {max_diff}")
+    print(f"缓存状态: {gradients.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+图片编码基准测试
+对封面图和统计图分别按各发布配置（公众号封面、缩略图、分享卡片、正文配图）编码，
+与原先的保存方式（PNG，quality 参数对PNG无效；图表 dpi=300）比较输出大小和编码耗时
+"""
+
+import os
+import sys
+import time
+import tempfile
+import warnings
+import contextlib
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from PIL import Image
+
+from chart_renderer import render_chart
+from chart_specs import StatsSpec
+from image_encoder import PROFILES, encode_image
+from media_generator import MediaGenerator
+
+
+def main():
+    warnings.filterwarnings('ignore')  # 缺少中文字形的警告
+    with tempfile.TemporaryDirectory() as workdir:
+        with contextlib.redirect_stdout(open(os.devnull, 'w')):
+            generator = MediaGenerator(workdir)
+            cover = generator.generate_cover_image("🔥Notion AI太牛了！我用了一周，效率翻了3倍", "Notion AI")
+
+        sources = [(f"封面 {generator.cover_size[0]}×{generator.cover_size[1]}", cover)]
+        for dpi in (300, 150):
+            path = os.path.join(workdir, f"stats_{dpi}.png")
+            start = time.perf_counter()
+            render_chart('stats', StatsSpec().to_dict(), path, dpi=dpi)
+            elapsed = time.perf_counter() - start
+            with Image.open(path) as img:
+                size = img.size
+            sources.append((f"统计图 dpi={dpi} ({size[0]}×{size[1]}, 渲染 {elapsed * 1000:.0f}ms)", path))
+
+        print("📊 图片编码基准测试")
+        print("-" * 72)
+        for label, source in sources:
+            print(f"{label}：原PNG {os.path.getsize(source) / 1024:.1f}KB")
+            for name, profile in PROFILES.items():
+                result = encode_image(source, profile, os.path.join(workdir, f"out_{name}"))
+                print(f"  {result.summary():<52} 预算 {profile.max_bytes // 1024}KB")
+        print("-" * 72)
+
+
+if __name__ == "__main__":
+    main()
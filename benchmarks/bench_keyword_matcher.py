@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+AI相关性关键词匹配基准测试
+在一万篇合成文章上对比原有的逐条重建关键词列表 + any() 循环与预编译匹配器：
+仓库实际使用的两个关键词表（AI_CONTENT_KEYWORDS 9个、AI_TOOL_KEYWORDS 17个），
+以及关键词扩充到 50/100/200 个时两者的耗时变化
+
+用法: python benchmarks/bench_keyword_matcher.py
+"""
+
+import os
+import sys
+import time
+import random
+import string
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from keyword_matcher import KeywordMatcher, AI_TOOL_KEYWORDS, AI_CONTENT_KEYWORDS
+
+ENTRY_COUNT = 10000
+HIT_RATE = 0.3
+
+FILLER = (
+    'startup funding cloud platform release update users security privacy market '
+    'model robot data chip open source the a of and to in for with on new company'
+).split()
+
+
+def make_keywords(count, rng, base=AI_TOOL_KEYWORDS):
+    """在现有关键词基础上补充随机关键词，模拟关键词表扩充"""
+    keywords = list(base)
+    while len(keywords) < count:
+        keywords.append(''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(5, 12))))
+    return keywords
+
+
+def make_entries(keywords, count, rng):
+    """生成合成文章（标题 + 约600字符摘要），约30%包含关键词"""
+    entries = []
+    for _ in range(count):
+        title = ' '.join(rng.choice(FILLER) for _ in range(8)).title()
+        words = [rng.choice(FILLER) for _ in range(100)]
+        if rng.random() < HIT_RATE:
+            words.insert(rng.randrange(len(words)), rng.choice(keywords))
+        entries.append((title, ' '.join(words)))
+    return entries
+
+
+def nested_any(entries, keywords):
+    """原有实现：每篇文章重建关键词列表，每个关键词扫描一遍全文"""
+    hits = 0
+    for title, summary in entries:
+        content = f"{title.lower()} {summary.lower()}"
+        ai_keywords = list(keywords)
+        if any(keyword in content for keyword in ai_keywords):
+            hits += 1
+    return hits
+
+
+def nested_matched(entries, keywords):
+    """原有方式下要得到命中的关键词列表，只能逐个检查全部关键词"""
+    hits = 0
+    for title, summary in entries:
+        content = f"{title.lower()} {summary.lower()}"
+        if [keyword for keyword in keywords if keyword in content]:
+            hits += 1
+    return hits
+
+
+def matcher_is_relevant(entries, matcher):
+    return sum(1 for title, summary in entries if matcher.is_relevant(f"{title} {summary}"))
+
+
+def matcher_match(entries, matcher):
+    return sum(1 for title, summary in entries if matcher.match(f"{title} {summary}"))
+
+
+def bench(func, *args, repeat=5):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    rng = random.Random(42)
+
+    print(f"📊 关键词匹配基准测试 ({ENTRY_COUNT} 篇合成文章，命中率约{HIT_RATE:.0%}，取5次最优)")
+
+    cases = [('AI_CONTENT_KEYWORDS', list(AI_CONTENT_KEYWORDS)), ('AI_TOOL_KEYWORDS', list(AI_TOOL_KEYWORDS))]
+    cases += [('扩充', make_keywords(count, rng)) for count in (50, 100, 200)]
+    for label, keywords in cases:
+        entries = make_entries(keywords, ENTRY_COUNT, rng)
+        matcher = KeywordMatcher(keywords)
+
+        print("-" * 60)
+        print(f"关键词数量: {len(keywords)}（{label}，{'前缀树正则' if matcher.use_regex else '逐个查找子串'}）")
+
+        any_time, expected = bench(nested_any, entries, keywords)
+        listed_time, _ = bench(nested_matched, entries, keywords)
+        relevant_time, relevant_hits = bench(matcher_is_relevant, entries, matcher)
+        match_time, match_hits = bench(matcher_match, entries, matcher)
+        assert relevant_hits == match_hits == expected, "匹配结果与原有实现不一致"
+        for title, summary in entries:
+            content = f"{title.lower()} {summary.lower()}"
+            assert matcher.match(content).keywords == {k for k in matcher.keywords if k in content}, \
+                f"命中的关键词与逐个检查不一致: {content}"
+
+        print(f"  判断是否相关  any() 循环 {any_time * 1000:7.1f}ms | "
+              f"is_relevant {relevant_time * 1000:7.1f}ms ({any_time / relevant_time:.1f}x)")
+        print(f"  列出命中关键词 逐个检查 {listed_time * 1000:7.1f}ms | "
+              f"match       {match_time * 1000:7.1f}ms ({listed_time / match_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
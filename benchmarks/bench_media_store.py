@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+媒体存储基准测试
+1. 相同标题的封面、相同数据的配图再次生成时命中已有文件，对比耗时
+2. 连续生成大量封面时，目录大小被容量上限约束，manifest 只保留仍存在的文件
+"""
+
+import os
+import sys
+import time
+import tempfile
+import warnings
+import contextlib
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from chart_specs import StatsSpec
+from media_generator import MediaGenerator
+from media_store import MediaStore
+
+
+def dir_size(path):
+    return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+
+
+def main():
+    warnings.filterwarnings('ignore')  # 缺少中文字形的警告
+    quiet = lambda: contextlib.redirect_stdout(open(os.devnull, 'w'))
+
+    with tempfile.TemporaryDirectory() as workdir:
+        print("📊 媒体存储基准测试")
+        print("-" * 60)
+        with quiet():
+            generator = MediaGenerator(os.path.join(workdir, 'media'))
+
+        cases = [
+            ('封面', lambda: generator.generate_cover_image("Cursor 实测：AI 编程助手到底能不能替代程序员", "Cursor")),
+            ('统计图', lambda: generator.generate_content_image('stats', StatsSpec())),
+        ]
+        for label, make in cases:
+            with quiet():
+                start = time.perf_counter()
+                first = make()
+                rendered = time.perf_counter() - start
+                start = time.perf_counter()
+                again = make()
+                cached = time.perf_counter() - start
+            assert first == again
+            print(f"{label:<4} 首次渲染 {rendered * 1000:8.1f}ms  再次生成 {cached * 1000:6.2f}ms "
+                  f"({rendered / cached:,.0f}x)")
+
+        # 容量上限：256KB，连续生成 60 张不同标题的封面
+        store_dir = os.path.join(workdir, 'bounded')
+        with quiet():
+            bounded = MediaGenerator(store_dir)
+            bounded.store.max_bytes = 256 * 1024
+            peak = 0
+            for i in range(60):
+                bounded.generate_cover_image(f"第{i}期：本周最值得关注的AI工具", style="tech")
+                peak = max(peak, dir_size(store_dir))
+
+        files = [name for name in os.listdir(store_dir) if name.endswith('.png')]
+        manifest = MediaStore(store_dir)._load_manifest()
+        assert all(os.path.exists(os.path.join(store_dir, entry['path'])) for entry in manifest.values())
+        assert not [name for name in os.listdir(store_dir) if name.startswith('.tmp_')]
+        print(f"容量上限 256KB：生成 60 张，保留 {len(files)} 张，目录峰值 {peak / 1024 / 1024:.2f}MB，"
+              f"manifest {len(manifest)} 条")
+        print(bounded.store.stats_summary())
+        print("-" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+文件上传基准测试（本地企业微信模拟服务）
+1. 大文件上传：requests files= （整个请求体在内存中拼好） vs 从磁盘流式读取，比较耗时和Python内存峰值
+2. 同一文件多次发送：每次重新上传 vs 按内容哈希复用缓存的 media_id
+
+用法: python benchmarks/bench_media_upload.py [大文件MB]
+"""
+
+import os
+import sys
+import time
+import tempfile
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+os.environ['NO_PROXY'] = '127.0.0.1,localhost'
+
+import requests
+
+from fake_wechat_server import start_fake_wechat_server
+from wechat_client import WeChatClient, UploadCache
+
+
+def traced(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    server, webhook_url = start_fake_wechat_server()
+    upload_url = f"{webhook_url.split('/cgi-bin/')[0]}/cgi-bin/webhook/upload_media?key=benchmark&type=file"
+
+    with tempfile.TemporaryDirectory() as workdir:
+        big = os.path.join(workdir, 'big.bin')
+        with open(big, 'wb') as f:
+            f.write(os.urandom(size_mb * 1024 * 1024))
+        article = os.path.join(workdir, 'article.md')
+        with open(article, 'w', encoding='utf-8') as f:
+            f.write('# AI工具推荐\n\n' + '正文内容。' * 2000)
+
+        print("📊 文件上传基准测试")
+        print("-" * 60)
+
+        def multipart_in_memory():
+            with open(big, 'rb') as f:
+                requests.post(upload_url, files={'media': ('big.bin', f, 'application/octet-stream')}, timeout=60)
+
+        client = WeChatClient(webhook_url, upload_cache=UploadCache(os.path.join(workdir, 'nocache.db'), ttl_hours=0))
+        for label, func in (('requests files=', multipart_in_memory),
+                            ('流式请求体', lambda: client.upload_media(big))):
+            elapsed, peak = traced(func)
+            print(f"{size_mb}MB {label:<16} {elapsed * 1000:8.1f}ms  内存峰值 {peak / 1024 / 1024:7.2f}MB")
+
+        for label, cache in (('每次重新上传', UploadCache(os.path.join(workdir, 'off.db'), ttl_hours=0)),
+                             ('复用 media_id', UploadCache(os.path.join(workdir, 'on.db')))):
+            client = WeChatClient(webhook_url, upload_cache=cache)
+            start = time.perf_counter()
+            for _ in range(5):
+                client.send_file_path(article)
+            elapsed = time.perf_counter() - start
+            print(f"同一文件发送5次 {label:<12} {elapsed * 1000:8.1f}ms  上传 {client.stats['uploads']} 次")
+            client.close()
+        print("-" * 60)
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+端到端流程基准测试（完全离线）
+使用本地RSS源、模拟大模型后端 (LLM_BACKEND=stub) 和本地企业微信模拟服务，
+分阶段统计 采集 → 生成 → 保存 → 推送 的耗时，并输出cProfile热点
+
+用法: python benchmarks/bench_pipeline.py [运行次数]
+"""
+
+import os
+import sys
+import time
+import pstats
+import cProfile
+import tempfile
+import contextlib
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+os.environ.update({
+    'LLM_BACKEND': 'stub',
+    'STUB_TTFT': '0.2',
+    'STUB_TOKENS_PER_SEC': '400',
+    'LLM_CACHE_BYPASS': 'true',
+    'GEMINI_RPM': '0',
+    'NO_PROXY': '127.0.0.1,localhost',
+    'WECHAT_WEBHOOK_URLS': '',
+})
+
+from local_feed_server import start_feed_server, ConditionalFeedHandler
+from fake_wechat_server import start_fake_wechat_server
+
+
+def timed(stages, name, func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    stages[name] = stages.get(name, 0.0) + time.perf_counter() - start
+    return result
+
+
+def run_once(writer, stages, run):
+    """与 run_daily_generation 相同的步骤，分别计时；推送包括入队和等待推送队列发送完毕"""
+    data = timed(stages, '采集', writer.fetch_data_sources)
+    content = timed(stages, '生成', writer.generate_content, 'new_tool', data)
+    # 模拟后端每次生成相同的正文，加上运行序号，避免推送队列按文件内容去重后跳过发送
+    filepath = timed(stages, '保存', writer.save_content, f"{content}\n\n<!-- run {run} -->", 'new_tool')
+    timed(stages, '推送', lambda: (
+        writer.queue_delivery("AI内容生成成功", content[:200], filepath),
+        writer.outbox.drain(timeout=30)))
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    feed_server, feed_base = start_feed_server(ConditionalFeedHandler)
+    wechat_server, webhook_url = start_fake_wechat_server(delay=0.02)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        os.environ['WECHAT_WEBHOOK_URL'] = webhook_url
+        import ai_writer_github
+
+        devnull = open(os.devnull, 'w')
+        with contextlib.redirect_stdout(devnull):
+            writer = ai_writer_github.AIContentWriter()
+        writer.data_sources['producthunt']['url'] = f"{feed_base}/feed/producthunt"
+        writer.data_sources['ai_news']['url'] = f"{feed_base}/feed/oreilly"
+
+        stages = {}
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(devnull):
+            profiler.enable()
+            for run in range(runs):
+                run_once(writer, stages, run)
+            profiler.disable()
+            writer.finish_deliveries()
+        total = time.perf_counter() - start
+
+        print(f"📊 端到端流程基准测试（{runs} 次运行，全部离线）")
+        print("-" * 60)
+        for name, elapsed in stages.items():
+            print(f"{name}: 平均 {elapsed / runs * 1000:8.1f}ms  占比 {elapsed / total:5.1%}")
+        print(f"合计: 平均 {total / runs * 1000:8.1f}ms  吞吐 {runs / total * 60:.1f} 篇/分钟")
+        print(f"企业微信请求数: {wechat_server.counts}")
+        print("-" * 60)
+        print("cProfile 热点（按累计耗时前15）:")
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(15)
+
+        os.chdir(ROOT)
+
+    feed_server.shutdown()
+    wechat_server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
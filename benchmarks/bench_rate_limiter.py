@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Gemini限速与重试基准测试
+本地模拟服务器限制每秒5个请求（超出返回429），8个线程并发发起30次调用，对比：
+不限速直接调用、按配额限速、限速配置高于配额（依赖429退避和自动降速）三种情况
+
+用法: python benchmarks/bench_rate_limiter.py
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rate_limiter import RateLimitedModel, CircuitBreaker
+from fake_gemini_server import start_fake_gemini_server, FakeGeminiModel
+
+CALLS = 30
+WORKERS = 8
+QUOTA = (5, 1.0)  # 每秒最多5个请求，相当于300 rpm
+
+
+def run(model, label):
+    def call(i):
+        try:
+            model.generate_content(f"第{i}篇文章的提示词")
+            return True
+        except Exception:
+            return False
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+        results = list(executor.map(call, range(CALLS)))
+    elapsed = time.perf_counter() - start
+
+    print(f"{label}: 成功 {sum(results):2d}/{CALLS}  耗时 {elapsed:5.2f}s  "
+          f"吞吐 {sum(results) / elapsed * 60:6.1f} 篇/分钟")
+    if isinstance(model, RateLimitedModel):
+        print(f"    {model.stats_summary()}")
+
+
+def limited(base_url, rpm):
+    return RateLimitedModel(FakeGeminiModel(base_url), rpm=rpm, tpm=0, max_retries=8,
+                            base_delay=0.2, max_delay=2.0,
+                            breaker=CircuitBreaker(threshold=20, cooldown=5), log=lambda message: None)
+
+
+def main():
+    print(f"📊 Gemini限速与重试基准测试（配额 {QUOTA[0]} 次/{QUOTA[1]:.0f}s，{WORKERS} 线程，{CALLS} 次调用）")
+    print("-" * 60)
+
+    for label, make_model in (
+            ("不限速直接调用      ", lambda url: FakeGeminiModel(url)),
+            ("按配额限速 300rpm   ", lambda url: limited(url, 300)),
+            ("限速高于配额 900rpm ", lambda url: limited(url, 900))):
+        # 每个场景使用独立的服务器，配额窗口互不影响
+        server, base_url = start_fake_gemini_server(delay_range=(0.1, 0.3), quota=QUOTA)
+        run(make_model(base_url), label)
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+常驻渲染服务基准测试
+冷启动：每个任务启动一个新进程，导入 media_generator、创建 MediaGenerator 后渲染一张图；
+常驻服务：服务预热一次后，通过 RenderClient 提交同样的任务（每次数据不同，不命中媒体存储）；
+另外给出命中媒体存储时的请求往返耗时
+
+用法: python benchmarks/bench_render_server.py [每种任务的次数]
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import tempfile
+import subprocess
+import statistics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from render_server import RenderClient, RenderError
+
+COLD_SCRIPT = """
+import sys, json
+sys.path.insert(0, {root!r})
+from media_generator import MediaGenerator
+job = json.loads(sys.argv[1])
+generator = MediaGenerator({output!r})
+if job['job'] == 'cover':
+    generator.generate_cover_image(job['title'], job['tool_name'])
+else:
+    generator.generate_content_image(job['content_type'], job['data'])
+"""
+
+
+def make_jobs(count, tag):
+    jobs = []
+    for i in range(count):
+        jobs.append({'job': 'cover', 'title': f"本周最值得关注的AI工具 {tag}{i}", 'tool_name': "Cursor"})
+        jobs.append({'job': 'content', 'content_type': 'stats',
+                     'data': {'popularity': [95 - i, 88, 82, 76, 71], 'bar_title': f"热度排行 {tag}{i}"}})
+    return jobs
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def submit(client, job):
+    if job['job'] == 'cover':
+        return client.generate_cover_image(job['title'], job['tool_name'])
+    return client.generate_content_image(job['content_type'], job['data'])
+
+
+def report(label, samples):
+    by_kind = {}
+    for kind, seconds in samples:
+        by_kind.setdefault(kind, []).append(seconds * 1000)
+    for kind, values in by_kind.items():
+        print(f"{label:<16} {kind:<8} 中位数 {statistics.median(values):8.1f}ms  最大 {max(values):8.1f}ms")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    devnull = open(os.devnull, 'w')
+
+    with tempfile.TemporaryDirectory() as workdir:
+        print("📊 常驻渲染服务基准测试")
+        print("-" * 60)
+
+        cold = []
+        script = COLD_SCRIPT.format(root=ROOT, output=os.path.join(workdir, 'cold'))
+        for job in make_jobs(count, 'cold'):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, '-c', script, json.dumps(job)], check=True,
+                           stdout=devnull, stderr=devnull)
+            cold.append((job['job'], time.perf_counter() - start))
+        report("冷启动（新进程）", cold)
+
+        port = free_port()
+        start = time.perf_counter()
+        server = subprocess.Popen([sys.executable, os.path.join(ROOT, 'render_server.py'), '--port', str(port),
+                                   '--output-dir', os.path.join(workdir, 'warm')], stdout=devnull, stderr=devnull)
+        client = RenderClient(f"http://127.0.0.1:{port}")
+        try:
+            while True:
+                try:
+                    client.health()
+                    break
+                except RenderError:
+                    if server.poll() is not None:
+                        raise SystemExit("❌ 渲染服务启动失败")
+                    time.sleep(0.05)
+            print(f"服务启动+预热: {(time.perf_counter() - start) * 1000:.0f}ms（只需一次）")
+
+            warm, hits = [], []
+            for job in make_jobs(count, 'warm'):
+                start = time.perf_counter()
+                submit(client, job)
+                warm.append((job['job'], time.perf_counter() - start))
+                start = time.perf_counter()
+                submit(client, job)
+                hits.append((job['job'], time.perf_counter() - start))
+            report("常驻服务", warm)
+            report("常驻服务(已存在)", hits)
+            print(client.health()['store'])
+        finally:
+            server.terminate()
+            server.wait()
+        print("-" * 60)
+
+
+if __name__ == "__main__":
+    main()
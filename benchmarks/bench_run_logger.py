@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+运行日志基准测试
+1. 写入 2 万条日志：原来的 log_message（每条重新计算文件名、打开、追加一行、关闭）vs RunLogger（文件保持打开，缓冲写入JSON Lines）
+2. 单个文件上限 1MB 时按大小切换文件，程序退出前 close() 把缓冲区写入文件
+
+只比较写文件的开销，两种方式都不输出到控制台
+用法: python benchmarks/bench_run_logger.py [--lines N]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from run_logger import RunLogger
+
+
+def legacy_log_message(log_dir, message, level="INFO"):
+    """原 AIContentWriter.log_message 的写文件部分"""
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    log_entry = f"[{timestamp}] {level}: {message}"
+    log_file = os.path.join(log_dir, f"content_generation_{datetime.now().strftime('%Y%m%d')}.log")
+    with open(log_file, 'a', encoding='utf-8') as f:
+        f.write(log_entry + "\n")
+
+
+def count_lines(log_dir):
+    total = 0
+    for name in os.listdir(log_dir):
+        with open(os.path.join(log_dir, name), encoding='utf-8') as f:
+            total += sum(1 for _ in f)
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="运行日志基准测试")
+    parser.add_argument('--lines', type=int, default=20000)
+    args = parser.parse_args()
+    messages = [f"📨 已推送（group{i % 5}: 文章_{i}.md），队列剩余 {args.lines - i} 条" for i in range(args.lines)]
+
+    print(f"📊 运行日志基准测试（{args.lines} 条）")
+    print("-" * 60)
+    with tempfile.TemporaryDirectory() as workdir:
+        legacy_dir = os.path.join(workdir, 'legacy')
+        os.makedirs(legacy_dir)
+        start = time.perf_counter()
+        for message in messages:
+            legacy_log_message(legacy_dir, message)
+        legacy = time.perf_counter() - start
+        print(f"每条打开/追加/关闭:  {legacy * 1000:8.1f}ms  {legacy / args.lines * 1e6:6.1f}µs/条  "
+              f"打开文件 {args.lines} 次")
+
+        logger = RunLogger('content_generation', log_dir=os.path.join(workdir, 'buffered'), console=None)
+        start = time.perf_counter()
+        with logger.stage('deliver'):
+            for message in messages:
+                logger.info(message)
+        logger.close()
+        buffered = time.perf_counter() - start
+        files = os.listdir(logger.file.log_dir)
+        print(f"RunLogger 缓冲写入:  {buffered * 1000:8.1f}ms  {buffered / args.lines * 1e6:6.1f}µs/条  "
+              f"打开文件 {len(files)} 次（{legacy / buffered:.1f}x）")
+
+        with open(logger.path, encoding='utf-8') as f:
+            last = json.loads(f.readlines()[-1])
+        print(f"最后一行: stage={last['stage']} duration_ms={last['duration_ms']} run_id={last['run_id']}")
+        print("-" * 60)
+
+        # 按大小切换文件
+        logger = RunLogger('content_generation', log_dir=os.path.join(workdir, 'rotating'), console=None, max_mb=1)
+        for message in messages:
+            logger.info(message)
+        logger.close()
+        rotating_dir = logger.file.log_dir
+        sizes = ", ".join(f"{name} {os.path.getsize(os.path.join(rotating_dir, name)) / 1024:.0f}KB"
+                          for name in sorted(os.listdir(rotating_dir)))
+        print(f"LOG_MAX_MB=1 切换文件: {sizes}")
+        print(f"close() 后写入的行数: {count_lines(rotating_dir)}/{args.lines}")
+        print("-" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+去重索引基准测试
+观察历史记录从一千条增长到一百万条时，启动加载和单次查询耗时的变化
+
+用法: python benchmarks/bench_seen_index.py
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from seen_index import SeenIndex
+
+LOOKUPS = 10000
+
+
+def fill(index, count):
+    """批量写入 count 条模拟历史（每条含URL和标题两个指纹）"""
+    now = time.time()
+    rows = []
+    for i in range(count):
+        for fp in SeenIndex.fingerprints(f"https://example.com/post/{i}", f"AI tool #{i}"):
+            rows.append((fp, f"AI tool #{i}", now, now))
+    index.conn.executemany("INSERT OR IGNORE INTO seen_items VALUES (?, ?, ?, ?)", rows)
+    index.conn.commit()
+
+
+def main():
+    print(f"📊 去重索引基准测试 (每档查询 {LOOKUPS} 次，一半命中)")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in (1000, 100000, 1000000):
+            path = os.path.join(tmp, f"seen_{count}.db")
+            index = SeenIndex(path, ttl_days=0)
+            fill(index, count)
+            index.close()
+
+            start = time.perf_counter()
+            index = SeenIndex(path, ttl_days=0)
+            load_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            hits = 0
+            for i in range(LOOKUPS):
+                post = i * (count // LOOKUPS) if i % 2 == 0 else count + i
+                hits += index.is_seen(f"https://example.com/post/{post}", f"AI tool #{post}")
+            per_lookup = (time.perf_counter() - start) / LOOKUPS
+            index.close()
+
+            print(f"历史 {count:>9} 条: 启动加载 {load_time * 1000:8.1f}ms  "
+                  f"单次查询 {per_lookup * 1e6:5.2f}µs  命中 {hits}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+启动耗时基准测试
+在全新的解释器中以 -X importtime 导入各入口模块，汇总总导入耗时和最慢的依赖，
+用于发现有人又在模块顶层导入了重量级依赖（matplotlib、google.generativeai 等）
+
+用法: python benchmarks/bench_startup.py [--runs N] [--budget-ms MS]
+超出 --budget-ms 时以非0状态码退出，可用于CI
+"""
+
+import os
+import sys
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = ['ai_writer', 'ai_writer_github', 'media_generator', 'check_data_sources']
+
+# 不应在导入入口模块时被加载的重量级依赖
+HEAVY_MODULES = ['matplotlib', 'google.generativeai', 'feedparser', 'schedule']
+
+
+def import_profile(module):
+    """在子进程中导入模块，返回 {模块名: 累计耗时(微秒)}"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, capture_output=True, text=True,
+        env={**os.environ, 'PYTHONDONTWRITEBYTECODE': '1'},
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"导入 {module} 失败:\n{result.stderr[-2000:]}")
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        # 格式: "import time: <self_us> | <cumulative_us> | <缩进的模块名>"
+        _, cumulative_us, name = line.split('|')
+        timings[name.strip()] = int(cumulative_us)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="入口模块导入耗时基准测试")
+    parser.add_argument('--runs', type=int, default=5, help="每个模块重复测量的次数（取中位数）")
+    parser.add_argument('--budget-ms', type=float, help="单个模块导入耗时上限，超出则失败")
+    args = parser.parse_args()
+
+    print(f"📊 启动耗时基准测试（每个模块 {args.runs} 次，取中位数）")
+    print("-" * 60)
+
+    over_budget = []
+    for module in MODULES:
+        runs = [import_profile(module) for _ in range(args.runs)]
+        total_ms = statistics.median(run.get(module, 0) for run in runs) / 1000
+        last = runs[-1]
+        heavy = [name for name in HEAVY_MODULES if name in last]
+
+        status = "✅"
+        if args.budget_ms is not None and total_ms > args.budget_ms:
+            status = "❌"
+            over_budget.append(module)
+        print(f"{status} {module}: {total_ms:.1f}ms")
+        if heavy:
+            print(f"   ⚠️ 导入时加载了重量级依赖: {', '.join(heavy)}")
+
+        slowest = sorted(((us, name) for name, us in last.items() if name != module), reverse=True)[:5]
+        for us, name in slowest:
+            print(f"   {us / 1000:8.1f}ms  {name}")
+
+    print("-" * 60)
+    if over_budget:
+        print(f"❌ 超出导入耗时预算 {args.budget_ms}ms: {', '.join(over_budget)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
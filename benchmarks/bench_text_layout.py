@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+文字排版基准测试
+对比原先 _wrap_text（每个候选行新建画布并 textbbox 测量）与缓存宽度累加的换行，
+每次 truetype 加载字体与字体缓存、自动缩小字号的耗时，
+以及中文长标题下逐字重新测量整行与前缀宽度二分查找的断行
+"""
+
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image, ImageDraw, ImageFont
+import text_layout
+from text_layout import find_font_path, get_font, wrap_text, fit_text
+
+CJK_PHRASES = ['🔥', 'Notion AI', '太牛了！', '我用了一周，', '效率翻了3倍', '「ChatGPT」', '与', '《Claude》',
+               '对比：', '谁更强？', '国产大模型', '实测', '……', '免费', '神器', '打工人必备', '👨‍💻', '教程']
+WORDS = ['ChatGPT', 'Claude', 'Midjourney', 'Notion', 'AI', 'agent', 'workflow', 'prompt',
+         'coding', 'assistant', 'review', 'tips', 'guide', 'open-source', 'tool', 'weekly']
+
+
+def legacy_wrap_text(text, font, max_width):
+    """原 MediaGenerator._wrap_text 的实现"""
+    lines = []
+    words = text.split()
+    current_line = ""
+    for word in words:
+        test_line = current_line + " " + word if current_line else word
+        bbox = ImageDraw.Draw(Image.new('RGB', (1, 1))).textbbox((0, 0), test_line, font=font)
+        if bbox[2] - bbox[0] <= max_width:
+            current_line = test_line
+        else:
+            if current_line:
+                lines.append(current_line)
+                current_line = word
+            else:
+                lines.append(word)
+    if current_line:
+        lines.append(current_line)
+    return lines
+
+
+def linear_cjk_wrap(text, font, max_width):
+    """逐字追加并重新测量整行宽度的朴素中文换行（O(n²) 次测量）"""
+    lines = []
+    current_line = ""
+    for char in text:
+        test_line = current_line + char
+        if current_line and font.getlength(test_line) > max_width:
+            lines.append(current_line)
+            current_line = char
+        else:
+            current_line = test_line
+    if current_line:
+        lines.append(current_line)
+    return lines
+
+
+def timeit(func, items):
+    start = time.perf_counter()
+    for item in items:
+        func(item)
+    return (time.perf_counter() - start) / len(items) * 1000
+
+
+def main():
+    rng = random.Random(0)
+    titles = [' '.join(rng.choice(WORDS) for _ in range(rng.randint(6, 14))) for _ in range(1000)]
+    path = find_font_path()
+    font = get_font(path, 48)
+    max_width = 800
+
+    print(f"📊 文字排版基准测试（{len(titles)} 个标题，字体: {path or 'Pillow默认字体'}）")
+    print("-" * 60)
+
+    legacy = timeit(lambda title: legacy_wrap_text(title, font, max_width), titles)
+    print(f"原换行 (画布+textbbox): {legacy:7.3f}ms/标题")
+
+    text_layout.text_width.cache_clear()
+    cold = timeit(lambda title: wrap_text(title, font, max_width), titles)
+    print(f"缓存换行 (首轮):        {cold:7.3f}ms/标题  ({legacy / cold:5.1f}x)")
+    warm = timeit(lambda title: wrap_text(title, font, max_width), titles)
+    print(f"缓存换行 (缓存命中):    {warm:7.3f}ms/标题  ({legacy / warm:5.1f}x)")
+
+    mismatched = sum(legacy_wrap_text(title, font, max_width) != wrap_text(title, font, max_width)
+                     for title in titles)
+    print(f"换行结果与原实现不同的标题: {mismatched}（宽度用字符前进量累加，不含字距调整）")
+
+    if path:
+        sizes = [48, 44, 40, 36, 32, 28, 24] * 20
+        load = timeit(lambda size: ImageFont.truetype(path, size), sizes)
+        cached = timeit(lambda size: get_font(path, size), sizes)
+        print(f"加载字体 truetype:      {load:7.3f}ms/次")
+        print(f"加载字体 缓存:          {cached:7.3f}ms/次  ({load / cached:5.0f}x)")
+
+    fit = timeit(lambda title: fit_text(title, max_width, max_lines=2, path=path), titles)
+    print(f"自动缩小字号 (2行内):   {fit:7.3f}ms/标题")
+    print("-" * 60)
+    cjk_titles = [''.join(rng.choice(CJK_PHRASES) for _ in range(rng.randint(8, 16))) for _ in range(1000)]
+    avg_len = sum(map(len, cjk_titles)) / len(cjk_titles)
+    print(f"中文长标题（平均 {avg_len:.0f} 字）:")
+    overflow = sum(any(font.getlength(line) > max_width for line in legacy_wrap_text(title, font, max_width))
+                   for title in cjk_titles)
+    print(f"按空格换行: 超出宽度的标题 {overflow}/{len(cjk_titles)}")
+    linear = timeit(lambda title: linear_cjk_wrap(title, font, max_width), cjk_titles)
+    print(f"逐字重新测量整行:       {linear:7.3f}ms/标题")
+    engine = timeit(lambda title: wrap_text(title, font, max_width), cjk_titles)
+    print(f"前缀宽度二分查找:       {engine:7.3f}ms/标题  ({linear / engine:5.1f}x)")
+    overflow = sum(any(font.getlength(line) > max_width for line in wrap_text(title, font, max_width))
+                   for title in cjk_titles)
+    print(f"前缀宽度二分查找: 超出宽度的标题 {overflow}/{len(cjk_titles)}")
+    print("-" * 60)
+    print(f"缓存状态: {text_layout.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+企业微信连接池基准测试（本地HTTPS模拟服务，自签名证书）
+一次成功运行会发送 文本通知 + 文件上传 + 文件消息 三个请求；
+对比每个请求单独 requests.post（每次新建TCP连接并完成TLS握手）与 WeChatClient 共用连接池的耗时和连接数
+
+用法: python benchmarks/bench_wechat_client.py [模拟运行次数]
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import requests
+
+from fake_wechat_server import start_fake_wechat_server
+from wechat_client import WeChatClient, UploadCache
+
+
+def bare_run(webhook_url, file_path):
+    """原实现：三个请求各自调用 requests.post"""
+    key = webhook_url.split('key=')[1]
+    base_url = webhook_url.split('/cgi-bin/')[0]
+    requests.post(webhook_url, json={'msgtype': 'text', 'text': {'content': '✅ AI内容生成成功'}}, timeout=10)
+    with open(file_path, 'rb') as f:
+        files = {'media': (os.path.basename(file_path), f, 'application/octet-stream')}
+        media_id = requests.post(f"{base_url}/cgi-bin/webhook/upload_media?key={key}&type=file",
+                                 files=files, timeout=30).json()['media_id']
+    requests.post(webhook_url, json={'msgtype': 'file', 'file': {'media_id': media_id}}, timeout=10)
+
+
+def pooled_run(client, file_path):
+    client.send_text('✅ AI内容生成成功')
+    client.send_file(client.upload_media(file_path))
+
+
+def measure(server, func, runs):
+    before = dict(server.counts)
+    start = time.perf_counter()
+    for _ in range(runs):
+        func()
+    elapsed = time.perf_counter() - start
+    requests_sent = server.counts.get('requests', 0) - before.get('requests', 0)
+    connections = server.counts.get('connections', 0) - before.get('connections', 0)
+    return elapsed, requests_sent, connections
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    server, webhook_url = start_fake_wechat_server(tls=True)
+    os.environ['REQUESTS_CA_BUNDLE'] = server.cafile
+    os.environ['NO_PROXY'] = '127.0.0.1,localhost'
+
+    with tempfile.TemporaryDirectory() as workdir:
+        file_path = os.path.join(workdir, 'article.md')
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write('# AI工具推荐\n\n' + '正文内容。' * 2000)
+
+        print(f"📊 企业微信连接池基准测试（HTTPS，本地模拟服务，{runs} 次运行 × 3 个请求）")
+        print("-" * 64)
+        bare_run(webhook_url, file_path)  # 预热
+        for label, func in (
+            ('每次 requests.post', lambda: bare_run(webhook_url, file_path)),
+            ('WeChatClient 连接池', None),
+        ):
+            if func is None:
+                # 关闭上传缓存和每分钟条数限速，只比较连接复用
+                client = WeChatClient(webhook_url, upload_cache=UploadCache(os.path.join(workdir, 'uploads.db'),
+                                                                            ttl_hours=0), rate_limit=0)
+                func = lambda: pooled_run(client, file_path)
+            elapsed, sent, connections = measure(server, func, runs)
+            print(f"{label:<20} {elapsed * 1000:8.1f}ms  每请求 {elapsed / sent * 1000:6.2f}ms  "
+                  f"请求 {sent}  TCP/TLS连接 {connections}")
+        print("-" * 64)
+
+    server.shutdown()
+    shutil.rmtree(server.cert_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+本地Gemini模拟服务器
+POST /generate 接收 {"prompt": ...}，按提示词哈希确定的延迟（默认 0.5~2 秒）后返回 {"text": ...}，
+可选模拟配额：时间窗口内请求数超限时返回429。
+用于在无网络、无API配额的情况下测量生成流水线的吞吐
+"""
+
+import json
+import time
+import hashlib
+import threading
+from collections import deque
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import requests
+
+
+def prompt_delay(prompt, low=0.5, high=2.0):
+    """同一提示词总是得到相同的延迟"""
+    digest = int(hashlib.md5(prompt.encode('utf-8')).hexdigest()[:8], 16)
+    return low + (high - low) * (digest / 0xFFFFFFFF)
+
+
+class FakeGeminiHandler(BaseHTTPRequestHandler):
+    delay_range = (0.5, 2.0)
+    quota = None  # (窗口内最大请求数, 窗口秒数)
+    quota_lock = threading.Lock()
+    recent = deque()
+
+    def _over_quota(self):
+        if not self.quota:
+            return False
+        limit, window = self.quota
+        now = time.monotonic()
+        with self.quota_lock:
+            while self.recent and now - self.recent[0] > window:
+                self.recent.popleft()
+            if len(self.recent) >= limit:
+                return True
+            self.recent.append(now)
+            return False
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        payload = json.loads(self.rfile.read(length) or b'{}')
+        prompt = payload.get('prompt', '')
+
+        if self._over_quota():
+            body = b'{"error": {"code": 429, "status": "RESOURCE_EXHAUSTED"}}'
+            self.send_response(429)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        delay = prompt_delay(prompt, *self.delay_range)
+        time.sleep(delay)
+
+        body = json.dumps({
+            'text': f"# 模拟文章\n\n这是一篇模拟生成的文章（延迟 {delay:.2f}s）。\n\n" + "正文内容。" * 200,
+            'delay': delay,
+        }, ensure_ascii=False).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fake_gemini_server(delay_range=(0.5, 2.0), quota=None):
+    """在随机端口启动模拟服务器，返回 (server, base_url)"""
+    handler = type('ConfiguredFakeGeminiHandler', (FakeGeminiHandler,), {
+        'delay_range': delay_range,
+        'quota': quota,
+        'quota_lock': threading.Lock(),
+        'recent': deque(),
+    })
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeGeminiModel:
+    """通过HTTP调用模拟服务器的模型，接口与 GenerativeModel.generate_content 一致"""
+
+    model_name = 'fake-gemini'
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.session = requests.Session()
+        self.session.trust_env = False  # 不走代理
+
+    def generate_content(self, prompt, generation_config=None, stream=False, **kwargs):
+        response = self.session.post(f"{self.base_url}/generate", json={'prompt': prompt}, timeout=30)
+        response.raise_for_status()
+        result = FakeResponse(response.json()['text'])
+        return iter([result]) if stream else result
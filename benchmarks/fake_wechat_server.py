@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+本地企业微信群机器人模拟服务器
+模拟 /cgi-bin/webhook/send 和 /cgi-bin/webhook/upload_media 两个接口，
+可配置响应延迟，统计收到的请求数和TCP连接数；tls=True 时使用临时自签名证书提供HTTPS
+"""
+
+import os
+import ssl
+import json
+import time
+import uuid
+import tempfile
+import threading
+import subprocess
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse
+
+
+class FakeWeChatHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # 支持长连接
+    disable_nagle_algorithm = True  # 与真实服务一致，响应不因延迟确认多等约40ms
+    delay = 0.0
+    fail_first = 0
+    counts = None
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with self.lock:
+            self.counts['connections'] = self.counts.get('connections', 0) + 1
+
+    def do_POST(self):
+        # 分块读取并丢弃请求体，大文件上传时模拟服务本身不占用内存
+        remaining = int(self.headers.get('Content-Length', 0))
+        while remaining > 0:
+            chunk = self.rfile.read(min(remaining, 64 * 1024))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+        path = urlparse(self.path).path
+
+        with self.lock:
+            self.counts[path] = self.counts.get(path, 0) + 1
+
+        time.sleep(self.delay)
+        with self.lock:
+            failing = self.counts.get('requests', 0) < self.fail_first
+            self.counts['requests'] = self.counts.get('requests', 0) + 1
+        if failing:
+            result = {'errcode': -1, 'errmsg': 'system busy'}
+        elif path.endswith('/upload_media'):
+            result = {'errcode': 0, 'errmsg': 'ok', 'type': 'file', 'media_id': uuid.uuid4().hex}
+        elif path.endswith('/send'):
+            result = {'errcode': 0, 'errmsg': 'ok'}
+        else:
+            result = {'errcode': 404, 'errmsg': 'not found'}
+
+        body = json.dumps(result).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_self_signed_cert(directory):
+    """用 openssl 生成 127.0.0.1 的自签名证书，返回 (证书路径, 私钥路径)"""
+    cert, key = os.path.join(directory, 'cert.pem'), os.path.join(directory, 'key.pem')
+    subprocess.run(['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+                    '-keyout', key, '-out', cert, '-subj', '/CN=127.0.0.1',
+                    '-addext', 'subjectAltName=IP:127.0.0.1'],
+                   check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return cert, key
+
+
+def start_fake_wechat_server(delay=0.0, tls=False, fail_first=0):
+    """
+    在随机端口启动模拟服务器，返回 (server, webhook_url)
+    server.counts 为各接口请求数，其中 'connections' 为建立的TCP连接数；
+    tls=True 时 server.cafile 为自签名证书路径（客户端用 verify=cafile 或 REQUESTS_CA_BUNDLE 信任）；
+    fail_first: 前 N 个请求返回 errcode=-1（系统繁忙），用于测试重试
+    """
+    handler = type('ConfiguredFakeWeChatHandler', (FakeWeChatHandler,), {
+        'delay': delay,
+        'fail_first': fail_first,
+        'counts': {},
+        'lock': threading.Lock(),
+    })
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    server.daemon_threads = True
+    server.counts = handler.counts
+    scheme = 'http'
+    if tls:
+        server.cert_dir = tempfile.mkdtemp(prefix='fake_wechat_')
+        server.cafile, keyfile = make_self_signed_cert(server.cert_dir)
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(server.cafile, keyfile)
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+        scheme = 'https'
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"{scheme}://127.0.0.1:{server.server_address[1]}/cgi-bin/webhook/send?key=benchmark"
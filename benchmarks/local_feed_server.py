@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+本地RSS模拟服务器
+为基准测试提供带人为延迟的RSS源，路径格式：/feed/<名称>?delay=<秒>
+"""
+
+import time
+import hashlib
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+
+def make_rss(name, count=20):
+    """生成一个包含 count 篇文章的RSS文档"""
+    items = []
+    for i in range(count):
+        items.append(f"""
+    <item>
+      <title>{name} AI tool launch #{i}: new AI assistant released</title>
+      <link>https://example.com/{name}/{i}</link>
+      <description>Startup ships a new AI platform built on machine learning, item {i}.</description>
+      <pubDate>Mon, 06 Jan 2025 08:{i % 60:02d}:00 GMT</pubDate>
+    </item>""")
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0">
+  <channel>
+    <title>{name}</title>
+    <link>https://example.com/{name}</link>
+    <description>Local benchmark feed</description>{''.join(items)}
+  </channel>
+</rss>""".encode('utf-8')
+
+
+class FeedHandler(BaseHTTPRequestHandler):
+    """按查询参数延迟返回RSS内容"""
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        params = parse_qs(parsed.query)
+        delay = float(params.get('delay', ['0'])[0])
+        name = parsed.path.rstrip('/').split('/')[-1] or 'feed'
+
+        time.sleep(delay)
+        body = make_rss(name)
+        try:
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/rss+xml; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ConditionalFeedHandler(FeedHandler):
+    """支持 ETag / Last-Modified 条件请求的RSS源"""
+
+    last_modified = 'Mon, 06 Jan 2025 09:00:00 GMT'
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        name = parsed.path.rstrip('/').split('/')[-1] or 'feed'
+        etag = '"' + hashlib.md5(name.encode('utf-8')).hexdigest() + '"'
+
+        if (self.headers.get('If-None-Match') == etag or
+                self.headers.get('If-Modified-Since') == self.last_modified):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        body = make_rss(name, count=200)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/rss+xml; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', self.last_modified)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_feed_server(handler=FeedHandler):
+    """在随机端口启动模拟服务器，返回 (server, base_url)"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+图表渲染模块
+基于 matplotlib 面向对象的 Agg 接口生成对比图和统计图，不使用 pyplot 全局状态；
+每种图表在首次使用时创建一次图形模板，之后只更新柱高、扇区和文字后重新输出
+"""
+
+import os
+import math
+import threading
+
+from chart_specs import ComparisonSpec, StatsSpec
+
+# 中文字体设置，只在创建和输出图形时通过 rc_context 生效，不修改全局配置
+FONT_RC = {
+    'font.sans-serif': ['SimHei', 'Arial Unicode MS', 'Noto Sans CJK SC', 'WenQuanYi Micro Hei', 'DejaVu Sans'],
+    'axes.unicode_minus': False,
+}
+
+PALETTE = ['#4A90E2', '#F5A623', '#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7']
+
+# 未给出的字段使用配图数据类的默认示例值
+DEFAULT_COMPARISON = ComparisonSpec().to_dict()
+DEFAULT_STATS = StatsSpec().to_dict()
+
+
+class ChartTemplate:
+    """图形模板基类：build 创建全部图元，update 只修改数据相关的属性"""
+
+    figsize = (10, 6)
+    defaults = {}
+
+    def __init__(self, data):
+        import matplotlib
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        self._rc_context = matplotlib.rc_context
+        self._canvas_class = FigureCanvasAgg
+        self.data = {**self.defaults, **data}
+        with self._rc_context(FONT_RC):
+            self.figure = Figure(figsize=self.figsize)
+            FigureCanvasAgg(self.figure)
+            self.build(self.data)
+            self.update(self.data)
+
+    def shape(self, data):
+        """决定图元数量的数据维度；维度变化时需要重新创建模板"""
+        raise NotImplementedError
+
+    def matches(self, data):
+        return self.shape({**self.defaults, **data}) == self.shape(self.data)
+
+    def build(self, data):
+        raise NotImplementedError
+
+    def update(self, data):
+        raise NotImplementedError
+
+    def render(self, data, filepath, dpi):
+        self.data = {**self.defaults, **data}
+        with self._rc_context(FONT_RC):
+            self.update(self.data)
+            self.figure.savefig(filepath, dpi=dpi, bbox_inches='tight')
+        self.release_renderer()
+
+    def release_renderer(self):
+        """
+        释放按输出dpi分配的位图（300dpi的统计图约30MB）：画布和每个文字图元都引用着最后一次绘制用的渲染器，
+        不释放时常驻的每个模板各占一份；换成新画布并清掉文字图元的引用，下次输出时会重新分配
+        """
+        from matplotlib.text import Text
+
+        self._canvas_class(self.figure)
+        for text in self.figure.findobj(Text):
+            text._renderer = None
+
+
+class ComparisonChart(ChartTemplate):
+    """多个工具在各评估维度上的分组柱状图"""
+
+    defaults = DEFAULT_COMPARISON
+
+    def shape(self, data):
+        return len(data['tools']), len(data['features'])
+
+    def build(self, data):
+        self.ax = self.figure.add_subplot()
+        tools, features = len(data['tools']), len(data['features'])
+        width = 0.7 / tools
+
+        self.bar_groups = []
+        for i in range(tools):
+            offset = (i - (tools - 1) / 2) * width
+            bars = self.ax.bar([x + offset for x in range(features)], [0] * features, width,
+                               label=data['tools'][i], color=PALETTE[i % len(PALETTE)])
+            self.bar_groups.append(bars)
+
+        self.ax.set_xticks(range(features))
+        self.legend = self.ax.legend()
+
+    def update(self, data):
+        for bars, scores in zip(self.bar_groups, data['scores']):
+            for bar, score in zip(bars, scores):
+                bar.set_height(score)
+        for text, tool in zip(self.legend.get_texts(), data['tools']):
+            text.set_text(tool)
+
+        self.ax.set_xticklabels(data['features'])
+        self.ax.set_xlabel(data['xlabel'])
+        self.ax.set_ylabel(data['ylabel'])
+        self.ax.set_title(data['title'])
+        self.ax.set_ylim(0, data['max_score'])
+
+
+class StatsChart(ChartTemplate):
+    """左侧类型分布饼图 + 右侧热度排行柱状图"""
+
+    figsize = (12, 6)
+    defaults = DEFAULT_STATS
+
+    # 与 Axes.pie 的默认参数一致
+    start_angle = 90
+    label_distance = 1.1
+    pct_distance = 0.6
+
+    def shape(self, data):
+        return len(data['categories']), len(data['tools'])
+
+    def build(self, data):
+        self.pie_ax, self.bar_ax = self.figure.subplots(1, 2)
+
+        count = len(data['categories'])
+        colors = [PALETTE[(i + 2) % len(PALETTE)] for i in range(count)]
+        self.wedges, self.labels, self.pcts = self.pie_ax.pie(
+            [1] * count, labels=[''] * count, colors=colors, autopct='%1.1f%%',
+            startangle=self.start_angle, labeldistance=self.label_distance, pctdistance=self.pct_distance)
+
+        tools = len(data['tools'])
+        colors = [PALETTE[(i + 2) % len(PALETTE)] for i in range(tools)]
+        self.bars = self.bar_ax.bar(range(tools), [0] * tools, color=colors)
+        self.values = [self.bar_ax.text(bar.get_x() + bar.get_width() / 2., 0, '', ha='center', va='bottom')
+                       for bar in self.bars]
+        self.bar_ax.set_xticks(range(tools))
+        self.bar_ax.tick_params(axis='x', rotation=45)
+
+        self.figure.tight_layout()
+
+    def update(self, data):
+        # 饼图：按占比重新计算每个扇区的角度，以及标签和百分比的位置
+        total = float(sum(data['shares'])) or 1.0
+        theta = self.start_angle
+        for wedge, label, pct, category, share in zip(self.wedges, self.labels, self.pcts,
+                                                      data['categories'], data['shares']):
+            span = 360.0 * share / total
+            wedge.set_theta1(theta)
+            wedge.set_theta2(theta + span)
+            middle = math.radians(theta + span / 2)
+            x, y = math.cos(middle), math.sin(middle)
+
+            label.set_position((self.label_distance * x, self.label_distance * y))
+            label.set_horizontalalignment('left' if x > 0 else 'right')
+            label.set_text(category)
+            pct.set_position((self.pct_distance * x, self.pct_distance * y))
+            pct.set_text(f"{100.0 * share / total:1.1f}%")
+            theta += span
+        self.pie_ax.set_title(data['pie_title'], fontsize=14, fontweight='bold')
+
+        # 柱状图：更新柱高和顶部数值
+        for bar, text, value in zip(self.bars, self.values, data['popularity']):
+            bar.set_height(value)
+            text.set_position((bar.get_x() + bar.get_width() / 2., value + 1))
+            text.set_text(f'{value}')
+        self.bar_ax.set_xticklabels(data['tools'])
+        self.bar_ax.set_title(data['bar_title'], fontsize=14, fontweight='bold')
+        self.bar_ax.set_ylabel(data['ylabel'])
+        self.bar_ax.set_ylim(0, data['max_popularity'])
+
+
+TEMPLATES = {
+    'comparison': ComparisonChart,
+    'stats': StatsChart,
+}
+
+_templates = {}
+_lock = threading.Lock()
+
+
+def render_chart(kind, data, filepath, dpi=None):
+    """
+    渲染图表到 filepath；data 中未给出的字段使用默认示例数据
+    同一种图表的模板在进程内复用，图元数量变化（如对比的工具数不同）时才重新创建
+    """
+    data = data if isinstance(data, dict) else {}
+    dpi = dpi or int(os.getenv('CHART_DPI', '150'))
+
+    # 模板是可变对象，多线程调用时串行渲染
+    with _lock:
+        template = _templates.get(kind)
+        if template is None or not template.matches(data):
+            template = _templates[kind] = TEMPLATES[kind](data)
+        template.render(data, filepath, dpi)
+    return filepath
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+配图数据模块
+用不可变的数据类描述每种配图要画的内容（对比图、统计图、步骤图、功能展示图），
+由采集到的工具数据和文章信息生成；相同内容的配图通过内容哈希识别，只渲染一次
+"""
+
+import json
+import hashlib
+import dataclasses
+from collections import Counter
+from dataclasses import dataclass
+from typing import Tuple
+from urllib.parse import urlparse
+
+
+@dataclass(frozen=True)
+class ChartSpec:
+    """配图数据基类，kind 对应 MediaGenerator 的配图类型"""
+
+    kind = ''
+
+    def to_dict(self):
+        return dataclasses.asdict(self)
+
+    def content_hash(self, *extra):
+        """配图内容的哈希，extra 用于加入影响输出的渲染参数（如dpi）"""
+        payload = json.dumps([self.kind, self.to_dict(), extra], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+@dataclass(frozen=True)
+class ComparisonSpec(ChartSpec):
+    """多个工具在各评估维度上的对比"""
+
+    kind = 'comparison'
+    tools: Tuple[str, ...] = ('工具A', '工具B')
+    features: Tuple[str, ...] = ('易用性', '功能性', '价格', '支持')
+    scores: Tuple[Tuple[float, ...], ...] = ((8, 9, 6, 7), (7, 8, 9, 8))
+    title: str = 'AI工具对比分析'
+    xlabel: str = '评估维度'
+    ylabel: str = '评分'
+    max_score: float = 10
+
+
+@dataclass(frozen=True)
+class StatsSpec(ChartSpec):
+    """工具类型分布 + 热度排行"""
+
+    kind = 'stats'
+    categories: Tuple[str, ...] = ('对话AI', '图像生成', '文档处理', '代码助手', '其他')
+    shares: Tuple[float, ...] = (35, 25, 20, 15, 5)
+    tools: Tuple[str, ...] = ('ChatGPT', 'Midjourney', 'Claude', 'Notion AI', 'GitHub Copilot')
+    popularity: Tuple[float, ...] = (95, 88, 82, 76, 71)
+    pie_title: str = '本周热门AI工具类型分布'
+    bar_title: str = '本周AI工具热度排行'
+    ylabel: str = '热度指数'
+    max_popularity: float = 100
+
+
+@dataclass(frozen=True)
+class StepsSpec(ChartSpec):
+    """上手步骤流程图"""
+
+    kind = 'tutorial'
+    steps: Tuple[str, ...] = ('注册账号', '安装工具', '配置设置', '开始使用')
+
+
+@dataclass(frozen=True)
+class FeatureSpec(ChartSpec):
+    """核心功能网格"""
+
+    kind = 'features'
+    title: str = '核心功能一览'
+    features: Tuple[str, ...] = ('🤖 智能对话', '📝 文档处理', '🎨 创意生成',
+                                 '📊 数据分析', '🔍 信息搜索', '⚡ 快速响应')
+
+
+SPEC_TYPES = {spec.kind: spec for spec in (ComparisonSpec, StatsSpec, StepsSpec, FeatureSpec)}
+
+
+def _tool_features(tool):
+    """工具的功能点：精选库的 hot_features，RSS资讯退回匹配到的关键词"""
+    return [str(feature) for feature in (tool.get('hot_features') or tool.get('matched_keywords') or [])]
+
+
+def _tool_category(tool):
+    return tool.get('category') or (tool.get('matched_keywords') or ['其他'])[0]
+
+
+def _tool_heat(tool):
+    """热度：RSS资讯用关键词相关度，精选工具用热门功能数量"""
+    return tool.get('relevance') or len(tool.get('hot_features') or []) or 1
+
+
+def _scale(values, top=10):
+    """按组内最大值缩放到 0-top 分"""
+    peak = max(values) or 1
+    return tuple(round(value * top / peak, 1) for value in values)
+
+
+def comparison_from_tools(tools, title=None):
+    """用采集到的工具数据生成对比图：关键词相关度、功能数量、介绍完整度三个维度（组内归一化为10分制）"""
+    tools = tools[:4]
+    dimensions = {
+        '相关度': [_tool_heat(tool) for tool in tools],
+        '功能数量': [len(_tool_features(tool)) for tool in tools],
+        '介绍完整度': [len(tool.get('description', '')) for tool in tools],
+    }
+    columns = [_scale(values) for values in dimensions.values()]
+    return ComparisonSpec(
+        tools=tuple(tool['name'] for tool in tools),
+        features=tuple(dimensions),
+        scores=tuple(zip(*columns)),
+        title=title or f"{' vs '.join(tool['name'] for tool in tools)} 对比",
+    )
+
+
+def stats_from_tools(tools, top=5):
+    """用本期采集的工具生成统计图：类型分布 + 热度前几名"""
+    categories = Counter(_tool_category(tool) for tool in tools).most_common(5)
+    ranked = sorted(tools, key=_tool_heat, reverse=True)[:top]
+    heat = _scale([_tool_heat(tool) for tool in ranked], top=100)
+    return StatsSpec(
+        categories=tuple(name for name, _ in categories),
+        shares=tuple(count for _, count in categories),
+        tools=tuple(tool['name'] for tool in ranked),
+        popularity=heat,
+        pie_title='本期AI工具类型分布',
+        bar_title='本期AI工具热度排行',
+    )
+
+
+def steps_from_tool(tool):
+    """教程步骤：打开官网 → 体验前两个核心功能 → 开始使用"""
+    host = urlparse(tool.get('url', '')).netloc
+    steps = [f"打开 {host or tool['name']}"]
+    steps += [f"体验{feature}" for feature in _tool_features(tool)[:2]]
+    steps.append(f"用{tool['name']}开始工作")
+    return StepsSpec(steps=tuple(steps))
+
+
+def features_from_tool(tool):
+    features = _tool_features(tool)[:6]
+    if not features:
+        return FeatureSpec(title=f"{tool['name']} 核心功能")
+    return FeatureSpec(title=f"{tool['name']} 核心功能", features=tuple(features))
+
+
+# 各文章类型生成配图至少需要的工具数量，不在表中的类型没有数据配图
+TOOLS_NEEDED = {'new_tool': 1, 'tutorial': 1, 'weekly_summary': 1, 'comparison': 2}
+
+
+def spec_for_article(content_type, tool=None, tools=None):
+    """
+    按文章类型选择配图数据：新工具 → 功能展示，教程 → 步骤图，
+    周报 → 统计图，工具对比 → 对比图；缺少所需数据时返回None
+    """
+    tools = tools or []
+    if content_type == 'new_tool' and tool:
+        return features_from_tool(tool)
+    if content_type == 'tutorial' and tool:
+        return steps_from_tool(tool)
+    if content_type == 'weekly_summary' and tools:
+        return stats_from_tools(tools)
+    if content_type == 'comparison' and len(tools) >= TOOLS_NEEDED['comparison']:
+        return comparison_from_tools(tools[:2])
+    return None
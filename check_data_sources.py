@@ -4,59 +4,57 @@
 检查RSS源的可用性和内容新鲜度
 """
 
-import feedparser
-import requests
 from datetime import datetime, timedelta
 import json
 
-def check_rss_source(url, name):
+from feed_fetcher import FeedFetcher
+from keyword_matcher import AI_CONTENT_MATCHER
+
+def check_rss_source(url, name, fetcher=None):
     """检查单个RSS源的状态"""
     print(f"\n📡 检查 {name}")
     print(f"🔗 URL: {url}")
     
     try:
-        # 设置超时和用户代理
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        
-        # 先检查HTTP状态
-        response = requests.get(url, headers=headers, timeout=10)
-        print(f"📊 HTTP状态: {response.status_code}")
-        
-        if response.status_code != 200:
-            print(f"❌ HTTP错误: {response.status_code}")
+        # 使用带条件请求缓存的抓取器，内容未变化时不重复下载和解析
+        fetcher = fetcher or FeedFetcher(timeout=10)
+        result = fetcher.fetch_one(url)
+
+        if result.status is None:
+            if result.error == "请求超时":
+                print("❌ 请求超时")
+            else:
+                print(f"❌ 连接错误: {result.error}")
             return False
+
+        cache_note = " (内容未变化，使用缓存)" if result.from_cache else ""
+        print(f"📊 HTTP状态: {result.status}{cache_note}")
         
-        # 解析RSS
-        feed = feedparser.parse(url)
+        if result.status not in (200, 304):
+            print(f"❌ HTTP错误: {result.status}")
+            return False
         
-        if not hasattr(feed, 'entries') or len(feed.entries) == 0:
+        if len(result.entries) == 0:
             print("❌ 无法获取RSS内容或内容为空")
             return False
         
-        print(f"✅ 成功获取 {len(feed.entries)} 篇文章")
+        print(f"✅ 成功获取 {len(result.entries)} 篇文章")
         
         # 检查最新文章时间
-        if hasattr(feed.entries[0], 'published_parsed'):
-            pub_time = datetime(*feed.entries[0].published_parsed[:6])
+        if hasattr(result.entries[0], 'published_parsed'):
+            pub_time = datetime(*result.entries[0].published_parsed[:6])
             days_ago = (datetime.now() - pub_time).days
-            print(f"📅 最新文章: {feed.entries[0].title[:50]}...")
+            print(f"📅 最新文章: {result.entries[0].title[:50]}...")
             print(f"🕒 发布时间: {days_ago} 天前")
             
             if days_ago > 7:
                 print("⚠️ 内容可能不够新鲜")
         
         # 检查AI相关内容
-        ai_keywords = [
-            'ai', 'artificial intelligence', 'chatgpt', 'gpt', 'claude',
-            'midjourney', 'dall-e', 'machine learning', 'ai tool'
-        ]
-        
         ai_count = 0
-        for entry in feed.entries[:10]:
-            content = f"{entry.title} {getattr(entry, 'summary', '')}".lower()
-            if any(keyword in content for keyword in ai_keywords):
+        for entry in result.entries[:10]:
+            content = f"{entry.title} {getattr(entry, 'summary', '')}"
+            if AI_CONTENT_MATCHER.is_relevant(content):
                 ai_count += 1
         
         print(f"🤖 AI相关内容: {ai_count}/10 篇")
@@ -66,12 +64,6 @@ def check_rss_source(url, name):
         
         return True
         
-    except requests.exceptions.Timeout:
-        print("❌ 请求超时")
-        return False
-    except requests.exceptions.ConnectionError:
-        print("❌ 连接错误")
-        return False
     except Exception as e:
         print(f"❌ 其他错误: {e}")
         return False
@@ -98,10 +90,11 @@ def check_all_sources():
     ]
     
     working_sources = []
+    fetcher = FeedFetcher(timeout=10)
     
     print("\n📊 当前数据源检查:")
     for name, url in sources:
-        if check_rss_source(url, name):
+        if check_rss_source(url, name, fetcher):
             working_sources.append((name, url))
     
     print(f"\n✅ 可用数据源: {len(working_sources)}/{len(sources)}")
@@ -109,11 +102,13 @@ def check_all_sources():
     if len(working_sources) < 2:
         print("\n🔄 检查备选数据源:")
         for name, url in alternative_sources:
-            if check_rss_source(url, name):
+            if check_rss_source(url, name, fetcher):
                 working_sources.append((name, url))
                 if len(working_sources) >= 3:
                     break
     
+    print(f"\n📦 {fetcher.stats_summary()}")
+    
     print("\n" + "=" * 50)
     print("📋 推荐使用的数据源:")
     for i, (name, url) in enumerate(working_sources[:3], 1):
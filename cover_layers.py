@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+封面图层合成模块
+封面由三层组成：渐变背景、半透明圆形装饰层、文字层（阴影、标签、日期），用 Image.alpha_composite 合成；
+背景和装饰层按 (尺寸, 颜色, 种子) 预先合成并缓存，每张封面只需要把文字层合成一次
+"""
+
+import zlib
+import random
+from functools import lru_cache
+
+from PIL import Image, ImageDraw
+
+from gradients import gradient_image
+
+# 装饰层的布局数量：标题决定使用哪一种，相同标题的封面装饰一致
+OVERLAY_VARIANTS = 8
+
+
+def overlay_seed(title):
+    """由标题得到装饰层种子（跨进程稳定，不受 PYTHONHASHSEED 影响）"""
+    return zlib.crc32(title.encode('utf-8')) % OVERLAY_VARIANTS
+
+
+def new_layer(size):
+    """全透明的 RGBA 图层，用于绘制文字等半透明元素"""
+    return Image.new('RGBA', size, (0, 0, 0, 0))
+
+
+@lru_cache(maxsize=32)
+def decorative_overlay(size, seed, count=5):
+    """
+    半透明白色圆形装饰层，圆心、半径和透明度由种子决定
+    每个圆先画在单独的图层上再逐个合成，重叠部分的透明度会叠加
+    """
+    rng = random.Random(seed)
+    width, height = size
+    overlay = new_layer(size)
+    for _ in range(count):
+        x = rng.randint(0, width)
+        y = rng.randint(0, height)
+        radius = rng.randint(20, 80)
+        alpha = rng.randint(10, 30)
+
+        circle = new_layer(size)
+        ImageDraw.Draw(circle).ellipse([x - radius, y - radius, x + radius, y + radius],
+                                       fill=(255, 255, 255, alpha))
+        overlay = Image.alpha_composite(overlay, circle)
+    return overlay
+
+
+@lru_cache(maxsize=32)
+def _background(size, colors, seed):
+    return Image.alpha_composite(gradient_image(size, colors).convert('RGBA'), decorative_overlay(size, seed))
+
+
+def cover_background(size, colors, seed):
+    """渐变背景 + 装饰层（RGBA），结果缓存，调用方不要在返回的图片上绘制"""
+    colors = tuple(tuple(int(c) for c in color[:3]) for color in colors)
+    return _background(tuple(size), colors, seed)
+
+
+def compose(background, layer):
+    """把文字层合成到背景上，返回可保存的 RGB 图片"""
+    return Image.alpha_composite(background, layer).convert('RGB')
+
+
+def cache_info():
+    return {'overlays': decorative_overlay.cache_info(), 'backgrounds': _background.cache_info()}
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+推送队列模块
+待推送的消息（文本通知、文件）先写入SQLite持久化队列，由后台线程逐条发送到企业微信，
+生成流程保存文件后即可结束；失败按指数退避重试，进程退出时未完成的推送留在队列中，下次运行继续发送。
+每条推送有幂等键（目标 + 内容哈希），同一文件、同一通知不会重复发送。
+多个目标（群）由固定数量的后台线程并行发送：每个目标只发送最早入队、尚未完成的一条，
+这一条发送中或退避等待时，该目标后面的推送都等它完成，保持入队顺序（先通知后文件）；
+不同目标互不等待，慢的群不会拖住其他群
+"""
+
+import os
+import json
+import time
+import random
+import sqlite3
+import hashlib
+import threading
+
+from wechat_client import WeChatClient, WeChatConfigError, file_digest
+
+PENDING, SENDING, DONE, FAILED = 'pending', 'sending', 'done', 'failed'
+
+
+class DeliveryOutbox:
+    """
+    持久化推送队列
+    targets: {目标名: Webhook URL}，队列中只保存目标名，Webhook密钥不落盘
+    workers: 后台发送线程数（OUTBOX_WORKERS），不超过目标数
+    """
+
+    def __init__(self, targets, path=None, max_attempts=None, base_delay=2.0, max_delay=300.0, log=print,
+                 workers=None):
+        self.targets = dict(targets)
+        workers = workers or int(os.getenv('OUTBOX_WORKERS', '4'))
+        self.worker_count = max(1, min(workers, len(self.targets)))
+        self.path = path or os.getenv('OUTBOX_PATH', os.path.join('cache', 'outbox.db'))
+        self.max_attempts = max_attempts if max_attempts is not None else int(os.getenv('OUTBOX_MAX_ATTEMPTS', '5'))
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.log = log
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # 入队在主线程、发送在后台线程，共用一个连接并用锁串行化
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS deliveries (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                idempotency_key TEXT UNIQUE,
+                target TEXT,
+                kind TEXT,
+                payload TEXT,
+                status TEXT,
+                attempts INTEGER DEFAULT 0,
+                next_attempt REAL,
+                last_error TEXT,
+                created_at REAL,
+                updated_at REAL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_deliveries_due ON deliveries(status, next_attempt)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_deliveries_target ON deliveries(target, status, id)")
+        self.conn.commit()
+        self.db_lock = threading.Lock()
+
+        self.clients = {}
+        self.wakeup = threading.Condition()
+        self.changes = 0  # 入队和发送完成时递增，线程据此判断查询队列后是否有新变化
+        self.workers = []
+        self.stopping = False
+        self.stats_lock = threading.Lock()
+        self.stats = {'sent': 0, 'retries': 0, 'failed': 0, 'duplicates': 0}
+        self.target_stats = {target: {'sent': 0, 'retries': 0, 'failed': 0} for target in self.targets}
+
+        self._resume()
+
+    def client(self, target):
+        """每个目标一个连接池客户端"""
+        with self.stats_lock:
+            if target not in self.clients:
+                self.clients[target] = WeChatClient(self.targets[target])
+            return self.clients[target]
+
+    def _count(self, target, stat):
+        with self.stats_lock:
+            self.stats[stat] += 1
+            if target in self.target_stats:
+                self.target_stats[target][stat] += 1
+
+    def _resume(self):
+        """上次运行发送中途退出的推送重新排队（至少发送一次：极少数情况下对方已收到会再发一次）"""
+        with self.db_lock:
+            cursor = self.conn.execute("UPDATE deliveries SET status = ? WHERE status = ?", (PENDING, SENDING))
+            self.conn.commit()
+            pending = self.conn.execute("SELECT COUNT(*) FROM deliveries WHERE status = ?", (PENDING,)).fetchone()[0]
+        if pending:
+            self.log(f"📮 队列中有 {pending} 条上次未完成的推送，将继续发送"
+                     + (f"（其中 {cursor.rowcount} 条发送中断）" if cursor.rowcount else ""))
+
+    # ---------- 入队 ----------
+
+    def enqueue_text_all(self, content, key=None):
+        """同一条文本通知发给所有目标，返回新加入队列的目标数"""
+        return sum(self.enqueue_text(target, content, key) for target in self.targets)
+
+    def enqueue_file_all(self, file_path, key=None):
+        """同一个文件发给所有目标（文件哈希只计算一次），返回新加入队列的目标数"""
+        key = key or f"file:{file_digest(file_path)}"
+        return sum(self.enqueue_file(target, file_path, key) for target in self.targets)
+
+    def enqueue_text(self, target, content, key=None):
+        """
+        加入一条文本通知，返回是否为新推送（幂等键已存在时不会重复发送）
+        默认幂等键为内容哈希；内容可能与以往相同但需要再次发送时（如失败通知）应传入 key
+        """
+        key = key or f"text:{hashlib.sha256(content.encode('utf-8')).hexdigest()}"
+        return self._enqueue(key, target, 'text', {'content': content})
+
+    def enqueue_file(self, target, file_path, key=None):
+        """加入一个文件推送；默认幂等键为文件内容哈希，同一文件对同一目标只发送一次"""
+        key = key or f"file:{file_digest(file_path)}"
+        return self._enqueue(key, target, 'file', {'path': os.path.abspath(file_path)})
+
+    def _enqueue(self, key, target, kind, payload):
+        if target not in self.targets:
+            raise ValueError(f"未知的推送目标: {target}")
+        key = f"{target}:{key}"  # 幂等键按目标区分，同一内容可以发给多个目标
+        now = time.time()
+        with self.db_lock:
+            # 已发送或排队中的相同推送直接忽略；之前放弃的推送重新排队
+            cursor = self.conn.execute("""
+                INSERT INTO deliveries
+                    (idempotency_key, target, kind, payload, status, next_attempt, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(idempotency_key) DO UPDATE SET
+                    payload = excluded.payload, status = excluded.status, attempts = 0,
+                    next_attempt = excluded.next_attempt, updated_at = excluded.updated_at
+                WHERE deliveries.status = ?
+            """, (key, target, kind, json.dumps(payload, ensure_ascii=False), PENDING, now, now, now, FAILED))
+            self.conn.commit()
+        if not cursor.rowcount:
+            with self.stats_lock:
+                self.stats['duplicates'] += 1
+            return False
+        self._notify()
+        return True
+
+    # ---------- 发送 ----------
+
+    def deliver(self, target, kind, payload):
+        """发送一条推送，失败时抛出异常"""
+        client = self.client(target)
+        if kind == 'text':
+            client.send_text(payload['content'])
+        elif kind == 'file':
+            client.send_file_path(payload['path'])
+        else:
+            raise ValueError(f"未知的推送类型: {kind}")
+
+    def _claim(self):
+        """
+        在各目标队首（该目标最早入队、尚未完成的一条）中取出最早到期的一条，标记为发送中；
+        队首还没有到期时返回 (None, 等待秒数)，所有队首都在发送中时返回 (None, None)
+        """
+        now = time.time()
+        with self.db_lock:
+            row = self.conn.execute("""
+                SELECT id, target, kind, payload, attempts, next_attempt FROM deliveries AS d
+                WHERE status = ? AND id = (
+                    SELECT MIN(id) FROM deliveries WHERE target = d.target AND status IN (?, ?)
+                )
+                ORDER BY next_attempt, id LIMIT 1
+            """, (PENDING, PENDING, SENDING)).fetchone()
+            if row is None:
+                return None, None
+            if row[5] > now:
+                return None, row[5] - now
+            self.conn.execute("UPDATE deliveries SET status = ?, updated_at = ? WHERE id = ?", (SENDING, now, row[0]))
+            self.conn.commit()
+        return row[:5], None
+
+    def _finish(self, delivery_id, status, attempts, next_attempt=None, error=None):
+        with self.db_lock:
+            self.conn.execute("""
+                UPDATE deliveries SET status = ?, attempts = ?, next_attempt = ?, last_error = ?, updated_at = ?
+                WHERE id = ?
+            """, (status, attempts, next_attempt, error, time.time(), delivery_id))
+            self.conn.commit()
+        # 该目标的下一条推送可以由空闲线程发送了
+        self._notify()
+
+    def _notify(self):
+        with self.wakeup:
+            self.changes += 1
+            self.wakeup.notify_all()
+
+    def process_one(self):
+        """发送一条到期的推送；返回 (是否处理了推送, 没有到期推送时的等待秒数)"""
+        row, wait = self._claim()
+        if row is None:
+            return False, wait
+
+        delivery_id, target, kind, payload, attempts = row
+        payload = json.loads(payload)
+        label = os.path.basename(payload['path']) if kind == 'file' else '文本通知'
+        try:
+            if target not in self.targets:
+                raise LookupError(f"目标 {target} 未配置")
+            if kind == 'file' and not os.path.exists(payload['path']):
+                raise FileNotFoundError(f"文件不存在: {payload['path']}")
+            self.deliver(target, kind, payload)
+        except Exception as e:
+            attempts += 1
+            permanent = isinstance(e, (LookupError, FileNotFoundError, WeChatConfigError))
+            if permanent or attempts >= self.max_attempts:
+                self._finish(delivery_id, FAILED, attempts, error=str(e))
+                self._count(target, 'failed')
+                self.log(f"❌ 推送失败（{target}: {label}），已放弃: {e}")
+            else:
+                # 带随机抖动的指数退避
+                delay = random.uniform(self.base_delay, min(self.max_delay, self.base_delay * 2 ** attempts))
+                self._finish(delivery_id, PENDING, attempts, time.time() + delay, str(e))
+                self._count(target, 'retries')
+                self.log(f"🔁 推送失败（{target}: {label}），{delay:.1f}s 后第 {attempts} 次重试: {e}")
+            return True, None
+
+        self._finish(delivery_id, DONE, attempts + 1)
+        self._count(target, 'sent')
+        self.log(f"📨 已推送（{target}: {label}）")
+        return True, None
+
+    def start(self):
+        """启动后台发送线程"""
+        if not any(worker.is_alive() for worker in self.workers):
+            self.stopping = False
+            self.workers = [threading.Thread(target=self._run, name=f'delivery-outbox-{i}', daemon=True)
+                            for i in range(self.worker_count)]
+            for worker in self.workers:
+                worker.start()
+        return self
+
+    def _run(self):
+        while not self.stopping:
+            changes = self.changes
+            processed, wait = self.process_one()
+            if processed:
+                continue
+            with self.wakeup:
+                if not self.stopping and self.changes == changes:
+                    self.wakeup.wait(timeout=min(wait, 5.0) if wait is not None else 5.0)
+
+    def pending_count(self):
+        with self.db_lock:
+            return self.conn.execute("SELECT COUNT(*) FROM deliveries WHERE status IN (?, ?)",
+                                     (PENDING, SENDING)).fetchone()[0]
+
+    def drain(self, timeout=None):
+        """等待队列中的推送发送完毕（包括退避重试），最多等待 timeout 秒；返回剩余未完成的条数"""
+        timeout = timeout if timeout is not None else float(os.getenv('OUTBOX_DRAIN_TIMEOUT', '60'))
+        self.start()
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if not self.pending_count():
+                return 0
+            time.sleep(0.05)
+        return self.pending_count()
+
+    def close(self):
+        """停止后台线程（正在发送的一条会先完成）并关闭数据库"""
+        self.stopping = True
+        with self.wakeup:
+            self.wakeup.notify_all()
+        for worker in self.workers:
+            worker.join()
+        for client in self.clients.values():
+            client.close()
+        self.conn.close()
+
+    def target_report(self):
+        """各目标的推送结果：本次运行的发送、重试、放弃次数，以及队列中仍未完成的条数"""
+        with self.db_lock:
+            pending = dict(self.conn.execute("SELECT target, COUNT(*) FROM deliveries WHERE status IN (?, ?) "
+                                             "GROUP BY target", (PENDING, SENDING)).fetchall())
+        with self.stats_lock:
+            return {target: {**stats, 'pending': pending.get(target, 0)}
+                    for target, stats in self.target_stats.items()}
+
+    def stats_summary(self):
+        stats = self.stats
+        summary = (f"推送队列统计: 已发送 {stats['sent']} 条，重试 {stats['retries']} 次，"
+                   f"放弃 {stats['failed']} 条，重复入队忽略 {stats['duplicates']} 条")
+        if len(self.targets) > 1:
+            for target, result in self.target_report().items():
+                status = "✅" if not result['failed'] and not result['pending'] else "⚠️"
+                summary += (f"\n  {status} {target}: 已发送 {result['sent']}，重试 {result['retries']}，"
+                            f"放弃 {result['failed']}，未完成 {result['pending']}")
+        return summary
+
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+RSS条件请求缓存模块
+按URL持久化保存 ETag / Last-Modified 和解析后的文章列表，
+服务端返回304时直接复用缓存的解析结果，无需重新下载和解析XML
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+
+
+def _to_json(value):
+    """将feedparser的条目转换为可JSON序列化的结构"""
+    if isinstance(value, time.struct_time):
+        return list(value)
+    if isinstance(value, dict):
+        return {key: _to_json(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_json(item) for item in value]
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+def _from_json(value):
+    """将缓存内容还原为支持属性访问的FeedParserDict"""
+    from feedparser import FeedParserDict
+
+    if isinstance(value, dict):
+        return FeedParserDict({key: _from_json(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return [_from_json(item) for item in value]
+    return value
+
+
+class CachedFeed:
+    """单个RSS源的缓存记录"""
+
+    def __init__(self, url, etag=None, last_modified=None, entries=None,
+                 content_length=0, parse_time=0.0, fetched_at=None):
+        self.url = url
+        self.etag = etag
+        self.last_modified = last_modified
+        self.entries = entries or []
+        self.content_length = content_length
+        self.parse_time = parse_time
+        self.fetched_at = fetched_at
+
+    def conditional_headers(self):
+        """构建条件请求头"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class FeedCache:
+    """基于磁盘目录的RSS缓存，整个目录可在GitHub Actions运行之间恢复"""
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir or os.getenv('FEED_CACHE_DIR', os.path.join('cache', 'feeds'))
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, url):
+        digest = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.json")
+
+    def get(self, url):
+        """读取缓存记录，不存在或损坏时返回None"""
+        path = self._path(url)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if data.get('url') != url:
+            return None
+
+        return CachedFeed(
+            url,
+            etag=data.get('etag'),
+            last_modified=data.get('last_modified'),
+            entries=_from_json(data.get('entries', [])),
+            content_length=data.get('content_length', 0),
+            parse_time=data.get('parse_time', 0.0),
+            fetched_at=data.get('fetched_at'),
+        )
+
+    def delete(self, url):
+        """删除缓存记录（不存在时忽略）"""
+        try:
+            os.remove(self._path(url))
+        except FileNotFoundError:
+            pass
+
+    def put(self, url, etag, last_modified, entries, content_length, parse_time):
+        """写入缓存记录（先写临时文件再替换，避免并发读到半个文件）"""
+        if not etag and not last_modified:
+            # 服务端不支持条件请求，缓存没有意义；同时删除旧记录，否则下次会带着过期的校验值请求，
+            # 收到304时返回旧内容
+            self.delete(url)
+            return
+
+        data = {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'entries': _to_json(list(entries)),
+            'content_length': content_length,
+            'parse_time': parse_time,
+            'fetched_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        }
+
+        path = self._path(url)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+RSS并发抓取模块
+并发获取多个RSS源，支持单源超时、整体截止时间，超时的源不影响其他源的结果
+配合 FeedCache 发送条件请求，源内容未变化时直接复用缓存的解析结果
+"""
+
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from urllib.parse import urlparse
+
+from feed_cache import FeedCache
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+
+class FeedResult:
+    """单个RSS源的抓取结果"""
+
+    def __init__(self, url, entries=None, status=None, error=None, elapsed=0.0,
+                 from_cache=False, bytes_downloaded=0, parse_time=0.0):
+        self.url = url
+        self.entries = entries or []
+        self.status = status
+        self.error = error
+        self.elapsed = elapsed
+        self.from_cache = from_cache
+        self.bytes_downloaded = bytes_downloaded
+        self.parse_time = parse_time
+
+    @property
+    def host(self):
+        return urlparse(self.url).netloc
+
+    @property
+    def ok(self):
+        return self.error is None and len(self.entries) > 0
+
+    def __repr__(self):
+        return (f"FeedResult(host={self.host!r}, entries={len(self.entries)}, "
+                f"status={self.status}, error={self.error!r}, elapsed={self.elapsed:.2f}s, "
+                f"from_cache={self.from_cache})")
+
+
+class FeedFetcher:
+    """RSS并发抓取器"""
+
+    def __init__(self, timeout=None, deadline=None, max_workers=8, host_timeouts=None, cache=None):
+        # 单源超时（秒），可按域名单独覆盖
+        self.timeout = timeout if timeout is not None else float(os.getenv('FEED_TIMEOUT', '10'))
+        # 整体截止时间（秒），到点后直接返回已完成的结果
+        self.deadline = deadline if deadline is not None else float(os.getenv('FEED_DEADLINE', '20'))
+        self.max_workers = max_workers
+        self.host_timeouts = host_timeouts or {}
+
+        # 条件请求缓存，传入 False 可禁用
+        if cache is None:
+            cache = FeedCache() if os.getenv('FEED_CACHE', 'true').lower() != 'false' else False
+        self.cache = cache or None
+
+        # 本次运行的缓存统计
+        self._stats_lock = threading.Lock()
+        self.stats = {
+            'requests': 0,
+            'not_modified': 0,
+            'bytes_downloaded': 0,
+            'bytes_saved': 0,
+            'parse_time': 0.0,
+            'parse_time_saved': 0.0,
+        }
+
+        # 连接池在第一次抓取时才创建（导入 requests 约70ms，只导入模块或创建抓取器时不需要）
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self):
+        with self._session_lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                session.headers.update(DEFAULT_HEADERS)
+                adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._session = session
+            return self._session
+
+    def get_timeout(self, url):
+        """获取某个URL对应域名的超时时间"""
+        return self.host_timeouts.get(urlparse(url).netloc, self.timeout)
+
+    def fetch_one(self, url):
+        """抓取并解析单个RSS源"""
+        import requests
+
+        start = time.perf_counter()
+        cached = self.cache.get(url) if self.cache else None
+        headers = cached.conditional_headers() if cached else {}
+
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.get_timeout(url))
+
+            if response.status_code == 304 and cached:
+                # 源内容未变化，直接复用缓存的解析结果
+                self._record(not_modified=1, bytes_saved=cached.content_length,
+                             parse_time_saved=cached.parse_time)
+                return FeedResult(url, entries=cached.entries, status=304,
+                                  elapsed=time.perf_counter() - start, from_cache=True)
+
+            if response.status_code != 200:
+                self._record()
+                return FeedResult(url, status=response.status_code,
+                                  error=f"HTTP {response.status_code}",
+                                  elapsed=time.perf_counter() - start)
+
+            import feedparser  # 首次解析时才导入，缩短启动时间
+
+            content = response.content
+            parse_start = time.perf_counter()
+            feed = feedparser.parse(content, response_headers=dict(response.headers))
+            parse_time = time.perf_counter() - parse_start
+
+            if self.cache:
+                self.cache.put(url, response.headers.get('ETag'), response.headers.get('Last-Modified'),
+                               feed.entries, len(content), parse_time)
+
+            self._record(bytes_downloaded=len(content), parse_time=parse_time)
+            return FeedResult(url, entries=feed.entries, status=response.status_code,
+                              elapsed=time.perf_counter() - start,
+                              bytes_downloaded=len(content), parse_time=parse_time)
+
+        except requests.exceptions.Timeout:
+            return FeedResult(url, error="请求超时", elapsed=time.perf_counter() - start)
+        except Exception as e:
+            return FeedResult(url, error=str(e), elapsed=time.perf_counter() - start)
+
+    def _record(self, **counters):
+        """累加缓存统计（多个抓取线程共享）"""
+        with self._stats_lock:
+            self.stats['requests'] += 1
+            for key, value in counters.items():
+                self.stats[key] += value
+
+    def stats_summary(self):
+        """生成用于运行日志的缓存统计摘要"""
+        stats = self.stats
+        return (f"RSS缓存统计: 请求 {stats['requests']} 次，304命中 {stats['not_modified']} 次，"
+                f"下载 {stats['bytes_downloaded'] / 1024:.1f}KB，节省 {stats['bytes_saved'] / 1024:.1f}KB，"
+                f"解析耗时 {stats['parse_time'] * 1000:.0f}ms，节省解析 {stats['parse_time_saved'] * 1000:.0f}ms")
+
+    def fetch_all(self, urls):
+        """并发抓取多个RSS源，返回按输入顺序排列的 {url: FeedResult}"""
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            return {}
+
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(urls)))
+        start = time.perf_counter()
+        try:
+            futures = {url: executor.submit(self.fetch_one, url) for url in urls}
+            wait(futures.values(), timeout=self.deadline)
+        finally:
+            # 不等待超过截止时间的请求，让它们在后台自行结束
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        results = {}
+        for url, future in futures.items():
+            if future.done() and not future.cancelled():
+                results[url] = future.result()
+            else:
+                results[url] = FeedResult(url, error="超过整体截止时间",
+                                          elapsed=time.perf_counter() - start)
+        return results
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+渐变背景生成模块
+用numpy一次性计算整幅渐变（替代逐行 draw.line），支持纵向、横向、对角线和多色渐变；
+生成结果按 (尺寸, 颜色, 方向, 色标位置) 缓存，同样风格的封面无需重复计算
+"""
+
+from functools import lru_cache
+
+from PIL import Image
+
+DIRECTIONS = ('vertical', 'horizontal', 'diagonal')
+
+
+def _normalize_stops(colors, stops):
+    """校验颜色和色标位置；未指定位置时颜色均匀分布在 [0, 1)"""
+    if len(colors) < 2:
+        raise ValueError("渐变至少需要两种颜色")
+    if stops is None:
+        return tuple(i / (len(colors) - 1) for i in range(len(colors)))
+    if len(stops) != len(colors):
+        raise ValueError("色标位置数量必须与颜色数量一致")
+    if list(stops) != sorted(stops):
+        raise ValueError("色标位置必须递增")
+    return tuple(stops)
+
+
+def _ramp(ratio, colors, stops):
+    """按比例数组在色标之间线性插值，截断取整（与原先 int() 的结果一致）"""
+    import numpy as np  # 按需导入，只有生成图片时才需要
+
+    channels = np.asarray(colors, dtype=np.float64)
+    pixels = np.empty(ratio.shape + (3,), dtype=np.uint8)
+    for channel in range(3):
+        pixels[..., channel] = np.interp(ratio, stops, channels[:, channel])
+    return pixels
+
+
+@lru_cache(maxsize=32)
+def _render(size, colors, direction, stops):
+    import numpy as np
+
+    width, height = size
+    if direction == 'vertical':
+        # 只算一列（第y行的比例为 y / height），再用最近邻拉伸到整幅
+        strip = _ramp(np.arange(height) / height, colors, stops)[:, None]
+        return Image.fromarray(strip, 'RGB').resize(size, Image.NEAREST)
+
+    if direction == 'horizontal':
+        strip = _ramp(np.arange(width) / width, colors, stops)[None, :]
+        return Image.fromarray(strip, 'RGB').resize(size, Image.NEAREST)
+
+    if direction == 'diagonal':
+        # 左上角到右下角：比例 = (x/width + y/height) / 2
+        # 横、纵两条 0-127 的 uint8 灰度条按外和相加得到 0-254 的索引图（不生成整幅的浮点数组），
+        # 再通过256色调色板上色，上色在C中完成
+        xs = (np.arange(width) * 128 // width).astype(np.uint8)
+        ys = (np.arange(height) * 128 // height).astype(np.uint8)
+        palette = Image.fromarray(np.add.outer(ys, xs), 'P')
+        palette.putpalette(_ramp(np.arange(256) / 256, colors, stops).tobytes())
+        return palette.convert('RGB')
+
+    raise ValueError(f"不支持的渐变方向: {direction}（可选 {', '.join(DIRECTIONS)}）")
+
+
+def _cached_gradient(size, colors, direction, stops):
+    """把参数转换为可哈希的缓存键后取缓存（列表形式的颜色也能命中）"""
+    colors = tuple(tuple(int(c) for c in color[:3]) for color in colors)
+    stops = _normalize_stops(colors, tuple(stops) if stops is not None else None)
+    return _render(tuple(size), colors, direction, stops)
+
+
+def gradient_image(size, colors, direction='vertical', stops=None):
+    """
+    生成渐变图片（RGB）
+    colors: 两种或多种 (r, g, b) 颜色；stops: 各颜色在 [0, 1] 上的位置，默认均匀分布
+    返回缓存对象的副本，调用方可以直接在上面绘制
+    """
+    return _cached_gradient(size, colors, direction, stops).copy()
+
+
+def paste_gradient(img, colors, direction='vertical', stops=None, box=None):
+    """在 img 的 box 区域（默认整幅）铺上渐变，不需要额外复制缓存对象"""
+    left, top, right, bottom = box or (0, 0) + img.size
+    img.paste(_cached_gradient((right - left, bottom - top), colors, direction, stops), (left, top))
+
+
+def cache_info():
+    return _render.cache_info()
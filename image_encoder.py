@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+图片编码模块
+按发布目标（公众号封面、缩略图、分享卡片、正文配图）的配置缩放并编码图片：
+有损格式（JPEG/WebP）在字节预算内二分查找最高质量，PNG 先无损优化、超出预算再量化为256色调色板；
+每次编码返回格式、质量、字节数和耗时，便于比较各配置的效果
+"""
+
+import io
+import os
+import time
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from PIL import Image, ImageOps, features
+
+# 各格式对应的 Pillow 格式名、扩展名，以及是否需要编译时支持
+FORMATS = {
+    'jpeg': ('JPEG', 'jpg', 'jpg'),
+    'webp': ('WEBP', 'webp', 'webp'),
+    'png': ('PNG', 'png', None),
+}
+
+
+@dataclass(frozen=True)
+class EncodeProfile:
+    """
+    发布目标的编码配置
+    size: 目标尺寸，None 表示保持原尺寸；max_width: 只限制宽度（不放大）
+    fit: 'pad' 保持完整画面并用边缘颜色补齐（默认，封面上的标签、日期不会被裁掉），
+         'crop' 裁剪填满目标尺寸（只用于四周没有重要内容的图片）
+    formats: 按优先级尝试的格式，当前 Pillow 不支持的格式会被跳过
+    """
+
+    name: str
+    size: Optional[Tuple[int, int]] = None
+    max_width: Optional[int] = None
+    fit: str = 'pad'
+    formats: Tuple[str, ...] = ('jpeg',)
+    max_bytes: int = 200 * 1024
+    min_quality: int = 40
+    max_quality: int = 90
+
+
+PROFILES = {
+    # 公众号封面 2.35:1（封面按这个比例绘制，编码时只缩放）；渐变加文字的封面无损PNG比JPEG更小，
+    # 超出预算时再量化为调色板
+    'wechat_cover': EncodeProfile('wechat_cover', size=(900, 383), formats=('png',), max_bytes=200 * 1024),
+    # 公众号缩略图 / 企业微信图文消息图，微信缩略图上限 64KB；横版封面上下补边，不裁掉两侧的标题
+    'thumbnail': EncodeProfile('thumbnail', size=(200, 200), max_bytes=60 * 1024),
+    # 朋友圈、社群分享卡片
+    'share_card': EncodeProfile('share_card', size=(1080, 1080), fit='pad', formats=('webp', 'jpeg'),
+                                max_bytes=300 * 1024),
+    # 正文配图：图表以纯色为主，调色板PNG通常比JPEG更小且没有压缩噪点
+    'content': EncodeProfile('content', max_width=1080, formats=('png',), max_bytes=300 * 1024),
+}
+
+
+@dataclass(frozen=True)
+class EncodeResult:
+    profile: str
+    path: str
+    format: str
+    quality: Optional[int]
+    bytes: int
+    seconds: float
+    within_budget: bool
+
+    def summary(self):
+        quality = f" q={self.quality}" if self.quality is not None else ""
+        budget = "" if self.within_budget else "（超出预算）"
+        return (f"{self.profile}: {self.format}{quality} {self.bytes / 1024:.1f}KB "
+                f"{self.seconds * 1000:.1f}ms{budget}")
+
+
+def get_profile(profile):
+    if isinstance(profile, EncodeProfile):
+        return profile
+    if profile not in PROFILES:
+        raise ValueError(f"未知的编码配置: {profile}（可选 {', '.join(PROFILES)}）")
+    return PROFILES[profile]
+
+
+def choose_format(profile):
+    """配置中第一个当前 Pillow 支持的格式（可用 IMAGE_FORMAT 环境变量统一指定）"""
+    preferred = os.getenv('IMAGE_FORMAT', '').lower()
+    for name in ((preferred,) if preferred in FORMATS else ()) + profile.formats:
+        feature = FORMATS[name][2]
+        if feature is None or features.check(feature):
+            return name
+    return 'png'
+
+
+def extension(profile):
+    return FORMATS[choose_format(profile)][1]
+
+
+def resize_for(img, profile):
+    """按配置缩放：目标尺寸裁剪或补边，或只限制最大宽度"""
+    img = img.convert('RGB')
+    if profile.size:
+        if profile.fit == 'pad':
+            return ImageOps.pad(img, profile.size, Image.LANCZOS, color=img.getpixel((0, 0)))
+        return ImageOps.fit(img, profile.size, Image.LANCZOS)
+    if profile.max_width and img.width > profile.max_width:
+        height = round(img.height * profile.max_width / img.width)
+        return img.resize((profile.max_width, height), Image.LANCZOS)
+    return img
+
+
+def _encode(img, name, quality=None):
+    buffer = io.BytesIO()
+    pil_format = FORMATS[name][0]
+    if name == 'jpeg':
+        img.save(buffer, pil_format, quality=quality, optimize=True, progressive=True)
+    elif name == 'webp':
+        img.save(buffer, pil_format, quality=quality, method=4)
+    else:
+        img.save(buffer, pil_format, optimize=True)
+    return buffer.getvalue()
+
+
+def _encode_lossy(img, name, profile):
+    """
+    二分查找预算内的最高质量；最低质量仍超出时返回最低质量的结果
+    先试最高质量，多数图片一次编码就在预算内
+    """
+    data = _encode(img, name, profile.max_quality)
+    if len(data) <= profile.max_bytes:
+        return data, profile.max_quality
+
+    low, high = profile.min_quality, profile.max_quality - 1
+    best = None
+    while low <= high:
+        quality = (low + high) // 2
+        data = _encode(img, name, quality)
+        if len(data) <= profile.max_bytes:
+            best = (data, quality)
+            low = quality + 1
+        else:
+            high = quality - 1
+    return best or (_encode(img, name, profile.min_quality), profile.min_quality)
+
+
+def _encode_png(img, profile):
+    """无损优化PNG；超出预算时量化为256色调色板（图表、纯色卡片几乎看不出差别）"""
+    data = _encode(img, 'png')
+    if len(data) > profile.max_bytes:
+        quantized = _encode(img.quantize(256, method=Image.Quantize.MEDIANCUT, dither=Image.Dither.NONE), 'png')
+        data = min(data, quantized, key=len)
+    return data, None
+
+
+def encode_image(img, profile, filepath):
+    """按配置缩放并编码 img（PIL图片或文件路径），写入 filepath，返回 EncodeResult"""
+    profile = get_profile(profile)
+    start = time.perf_counter()
+    if not isinstance(img, Image.Image):
+        with Image.open(img) as source:
+            img = resize_for(source, profile)
+    else:
+        img = resize_for(img, profile)
+
+    name = choose_format(profile)
+    data, quality = _encode_png(img, profile) if name == 'png' else _encode_lossy(img, name, profile)
+    with open(filepath, 'wb') as f:
+        f.write(data)
+
+    return EncodeResult(profile.name, filepath, name, quality, len(data),
+                        time.perf_counter() - start, len(data) <= profile.max_bytes)
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+AI相关性关键词匹配模块
+关键词较少时按检查树逐个查找子串（共有的子串只查一次），较多时按前缀树合并编译为一个正则表达式，每篇文章只需扫描一次
+"""
+
+import os
+import re
+
+# 采集AI工具资讯时使用的关键词（更精确，偏向工具和产品）
+AI_TOOL_KEYWORDS = [
+    'ai tool', 'ai app', 'chatgpt', 'gpt-4', 'claude', 'gemini',
+    'midjourney', 'dall-e', 'stable diffusion', 'ai assistant',
+    'artificial intelligence', 'machine learning tool', 'ai platform',
+    'ai startup', 'new ai', 'ai launch', 'ai release'
+]
+
+# 检查数据源时使用的关键词（更宽泛，判断内容是否与AI相关）
+AI_CONTENT_KEYWORDS = [
+    'ai', 'artificial intelligence', 'chatgpt', 'gpt', 'claude',
+    'midjourney', 'dall-e', 'machine learning', 'ai tool'
+]
+
+
+def _trie_pattern(keywords):
+    """将关键词按公共前缀合并为正则，如 ai tool / ai app -> ai (?:app|tool)"""
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # 某个关键词在此结束且还有更长的关键词：贪婪匹配更长的那个
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+
+class KeywordMatch:
+    """单篇文章的匹配结果"""
+
+    def __init__(self, keywords, score):
+        self.keywords = keywords
+        self.score = score
+
+    def __bool__(self):
+        return bool(self.keywords)
+
+    def __repr__(self):
+        return f"KeywordMatch(keywords={sorted(self.keywords)!r}, score={self.score})"
+
+
+def _check_tree(keywords, min_prefix=3):
+    """
+    子串检查树：较短的子串没出现时，包含它的关键词也一定不会出现，不必再查
+    节点为关键词，以及至少两个关键词共有的前缀（如 ai app / ai tool 的 "ai "）；
+    每个节点挂在它包含的最长的其他节点下面，返回根节点列表 [(子串, 是否关键词, 子节点), ...]
+    """
+    keyword_set = set(keywords)
+    needles = set(keywords)
+    for i, first in enumerate(keywords):
+        for second in keywords[i + 1:]:
+            common = os.path.commonprefix([first, second])
+            if len(common) >= min_prefix:
+                needles.add(common)
+
+    children = {needle: [] for needle in needles}
+    roots = []
+    for needle in sorted(needles, key=len):
+        parents = [other for other in needles if len(other) < len(needle) and other in needle]
+        (children[max(parents, key=len)] if parents else roots).append(needle)
+
+    def build(items):
+        return tuple((needle, needle in keyword_set, build(children[needle])) for needle in items)
+
+    return build(roots)
+
+
+def _scan(nodes, text, found, first_only):
+    """按检查树查找命中的关键词加入 found；first_only 时找到一个即返回True"""
+    for needle, is_keyword, children in nodes:
+        if needle in text:
+            if is_keyword:
+                found.add(needle)
+                if first_only:
+                    return True
+            if children and _scan(children, text, found, first_only) and first_only:
+                return True
+    return False
+
+
+class KeywordMatcher:
+    """
+    多关键词匹配器（子串匹配，不区分大小写）
+    关键词较少时按检查树逐个用 in 查找子串（C实现），超过 REGEX_MIN_KEYWORDS 个时改用前缀树正则，
+    扫描一遍全文的耗时不随关键词数量增长
+    """
+
+    # 实测关键词在 64~100 个之间时两种方式耗时相当（见 benchmarks/bench_keyword_matcher.py）
+    REGEX_MIN_KEYWORDS = 80
+
+    def __init__(self, keywords, weights=None):
+        self.keywords = list(dict.fromkeys(keyword.lower() for keyword in keywords))
+        self.weights = {keyword.lower(): weight for keyword, weight in (weights or {}).items()}
+        self.use_regex = len(self.keywords) >= self.REGEX_MIN_KEYWORDS
+
+        if not self.use_regex:
+            self.tree = _check_tree(self.keywords)
+            return
+
+        # 前缀树合并后每个位置只需比较一次首字符，且总是优先匹配更长的关键词
+        self.pattern = re.compile(_trie_pattern(self.keywords))
+        # 零宽前瞻捕获：每个位置都尝试匹配，关键词之间可以重叠（如 "new ai tool" 同时命中 new ai 和 ai tool）
+        self.overlapping = re.compile(f'(?=({self.pattern.pattern}))')
+        # 同一位置只捕获最长的关键词，它的前缀关键词（如 ai tool 之于 ai）也算命中
+        self.prefixes = {keyword: frozenset(k for k in self.keywords if keyword.startswith(k))
+                         for keyword in self.keywords}
+
+    def is_relevant(self, text):
+        """是否包含任意关键词，找到第一个即返回"""
+        text = text.lower()
+        if self.use_regex:
+            return self.pattern.search(text) is not None
+        return _scan(self.tree, text, set(), True)
+
+    def match(self, text):
+        """返回命中的关键词集合和相关性得分（命中关键词的权重之和，默认每个记1分）"""
+        text = text.lower()
+        if self.use_regex:
+            first = self.pattern.search(text)
+            if first is None:
+                # 大部分文章不相关，先用一次普通扫描排除，只对命中的文章做重叠扫描
+                return KeywordMatch(frozenset(), 0)
+            longest = {m.group(1) for m in self.overlapping.finditer(text, first.start())}
+            found = frozenset().union(*(self.prefixes[keyword] for keyword in longest))
+        else:
+            hits = set()
+            _scan(self.tree, text, hits, False)
+            found = frozenset(hits)
+        score = sum(self.weights.get(keyword, 1.0) for keyword in found)
+        return KeywordMatch(found, score)
+
+
+AI_TOOL_MATCHER = KeywordMatcher(AI_TOOL_KEYWORDS)
+AI_CONTENT_MATCHER = KeywordMatcher(AI_CONTENT_KEYWORDS)
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+大模型后端模块
+统一的生成接口（与 GenerativeModel.generate_content 一致），包含 Gemini 实现和
+本地确定性模拟实现；模拟后端支持可配置的延迟、分块和故障注入，
+无需网络即可对 采集 → 生成 → 保存 → 推送 的完整流程做压测和性能分析
+"""
+
+import os
+import time
+import random
+import hashlib
+import threading
+
+
+class LLMBackend:
+    """大模型后端基类"""
+
+    model_name = 'unknown'
+
+    def generate_content(self, prompt, generation_config=None, stream=False, **kwargs):
+        """生成内容：非流式返回带 .text 的响应，流式返回带 .text 的分块迭代器"""
+        raise NotImplementedError
+
+
+class GeminiBackend(LLMBackend):
+    """Google Gemini 后端"""
+
+    def __init__(self, api_key, model_name='gemini-1.5-flash'):
+        import google.generativeai as genai
+
+        genai.configure(api_key=api_key)
+        self.model = genai.GenerativeModel(model_name)
+        self.model_name = self.model.model_name
+
+    def generate_content(self, prompt, generation_config=None, stream=False, **kwargs):
+        return self.model.generate_content(prompt, generation_config=generation_config, stream=stream, **kwargs)
+
+
+class StubBackendError(Exception):
+    """模拟后端注入的故障，code 与真实API的HTTP状态码一致"""
+
+    def __init__(self, code, message):
+        super().__init__(f"{code} {message}")
+        self.code = code
+
+
+class StubUsage:
+    def __init__(self, candidates_token_count):
+        self.candidates_token_count = candidates_token_count
+
+
+class StubResponse:
+    def __init__(self, text, tokens=0):
+        self.text = text
+        self.usage_metadata = StubUsage(tokens)
+
+
+class StubBackend(LLMBackend):
+    """本地确定性模拟后端：相同提示词总是得到相同的正文"""
+
+    model_name = 'stub'
+
+    def __init__(self, ttft=0.3, tokens_per_sec=50.0, length=1200, chunk_size=40,
+                 failure_rate=0.0, failure_code=429, seed=0):
+        self.ttft = ttft                      # 首个分块前的延迟（秒）
+        self.tokens_per_sec = tokens_per_sec  # 之后的输出速度，按每2个字符1个token估算
+        self.length = length                  # 正文字符数
+        self.chunk_size = chunk_size          # 流式输出时每个分块的字符数
+        self.failure_rate = failure_rate      # 每次调用失败的概率
+        self.failure_code = failure_code      # 注入故障的状态码（429限流 / 503不可用）
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            ttft=float(os.getenv('STUB_TTFT', '0.3')),
+            tokens_per_sec=float(os.getenv('STUB_TOKENS_PER_SEC', '50')),
+            length=int(os.getenv('STUB_LENGTH', '1200')),
+            chunk_size=int(os.getenv('STUB_CHUNK_SIZE', '40')),
+            failure_rate=float(os.getenv('STUB_FAILURE_RATE', '0')),
+            failure_code=int(os.getenv('STUB_FAILURE_CODE', '429')),
+            seed=int(os.getenv('STUB_SEED', '0')),
+        )
+
+    def render(self, prompt):
+        """根据提示词哈希生成确定的Markdown正文"""
+        digest = hashlib.sha1(prompt.encode('utf-8')).hexdigest()
+        header = f"# 模拟文章 {digest[:8]}\n\n"
+        sentence = f"这是模拟后端为提示词 {digest[:12]} 生成的正文，用于离线压测。\n\n"
+        body = (sentence * (self.length // len(sentence) + 1))[:max(0, self.length - len(header))]
+        return header + body
+
+    def _maybe_fail(self):
+        with self._lock:
+            self.calls += 1
+            failed = self.failure_rate > 0 and self._rng.random() < self.failure_rate
+        if failed:
+            message = 'RESOURCE_EXHAUSTED' if self.failure_code == 429 else 'UNAVAILABLE'
+            raise StubBackendError(self.failure_code, message)
+
+    def _chunk_delay(self, chars):
+        return (chars / 2) / self.tokens_per_sec if self.tokens_per_sec > 0 else 0.0
+
+    def generate_content(self, prompt, generation_config=None, stream=False, **kwargs):
+        self._maybe_fail()
+        text = self.render(prompt)
+
+        if not stream:
+            time.sleep(self.ttft + self._chunk_delay(len(text)))
+            return StubResponse(text, len(text) // 2)
+
+        return self._stream(text)
+
+    def _stream(self, text):
+        time.sleep(self.ttft)
+        for start in range(0, len(text), self.chunk_size):
+            chunk = text[start:start + self.chunk_size]
+            if start:
+                time.sleep(self._chunk_delay(len(chunk)))
+            yield StubResponse(chunk, (start + len(chunk)) // 2)
+
+
+def create_backend(name=None, api_key=None):
+    """根据 LLM_BACKEND 环境变量创建后端：gemini（默认）或 stub"""
+    name = (name or os.getenv('LLM_BACKEND', 'gemini')).lower()
+    if name == 'stub':
+        return StubBackend.from_env()
+    if name == 'gemini':
+        return GeminiBackend(api_key or os.getenv('GEMINI_API_KEY'),
+                             os.getenv('GEMINI_MODEL', 'gemini-1.5-flash'))
+    raise ValueError(f"未知的 LLM_BACKEND: {name}（可选 gemini / stub）")
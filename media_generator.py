@@ -5,168 +5,193 @@
 """
 
 import os
-import requests
-from PIL import Image, ImageDraw, ImageFont
-import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
+import dataclasses
+from PIL import Image, ImageDraw
+from cover_layers import OVERLAY_VARIANTS, overlay_seed, new_layer, cover_background, compose
+from text_layout import find_font_path, get_font, text_width, wrap_text, fit_text
+from chart_renderer import render_chart
+from chart_specs import ChartSpec, FeatureSpec, SPEC_TYPES
+from media_store import MediaStore
+from image_encoder import get_profile, choose_format, extension, encode_image
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-import random
+
+# 封面背景渐变色
+COVER_STYLES = {
+    "tech": [(64, 123, 255), (112, 161, 255)],  # 科技蓝
+    "warm": [(255, 154, 0), (255, 206, 84)],    # 温暖橙
+    "purple": [(138, 43, 226), (186, 85, 211)],  # 紫色
+}
+
 
 class MediaGenerator:
     """媒体内容生成器"""
     
-    def __init__(self):
-        self.output_dir = "media"
-        os.makedirs(self.output_dir, exist_ok=True)
+    def __init__(self, output_dir=None):
+        # 输出文件按渲染输入的哈希命名，相同输入直接复用（见 media_store.py）
+        self.store = MediaStore(output_dir)
+        self.output_dir = self.store.root
         
         # 设置中文字体
         self.setup_fonts()
         
         # 公众号常用尺寸
-        self.cover_size = (900, 500)  # 封面图尺寸
+        self.cover_size = (900, 383)  # 封面图尺寸：公众号封面 2.35:1，编码为 wechat_cover 时不需要裁剪
         self.content_size = (800, 600)  # 内容配图尺寸
+        self.chart_dpi = int(os.getenv('CHART_DPI', '150'))  # matplotlib图表的分辨率（10英寸宽 → 1500像素）
         
         print("🎨 媒体生成器初始化成功！")
     
     def setup_fonts(self):
-        """设置字体"""
+        """设置字体（字体对象在进程内缓存，多个生成器实例共用）"""
         try:
-            # 尝试使用系统中文字体
-            font_paths = [
-                '/System/Library/Fonts/PingFang.ttc',  # macOS
-                '/System/Library/Fonts/Helvetica.ttc',  # macOS备用
-                'C:/Windows/Fonts/msyh.ttc',  # Windows
-                '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf'  # Linux
-            ]
-            
-            self.title_font = None
-            self.content_font = None
-            
-            for font_path in font_paths:
-                if os.path.exists(font_path):
-                    try:
-                        self.title_font = ImageFont.truetype(font_path, 48)
-                        self.content_font = ImageFont.truetype(font_path, 24)
-                        break
-                    except:
-                        continue
-            
-            # 如果没有找到字体，使用默认字体
-            if not self.title_font:
-                self.title_font = ImageFont.load_default()
-                self.content_font = ImageFont.load_default()
-                
+            self.font_path = find_font_path()
+            self.title_font = get_font(self.font_path, 48)
+            self.content_font = get_font(self.font_path, 24)
         except Exception as e:
             print(f"字体设置警告: {e}")
-            self.title_font = ImageFont.load_default()
-            self.content_font = ImageFont.load_default()
+            self.font_path = None
+            self.title_font = get_font(None, 48)
+            self.content_font = get_font(None, 24)
     
-    def generate_cover_image(self, title, tool_name="", style="tech"):
-        """生成封面图"""
-        # 创建画布
-        img = Image.new('RGB', self.cover_size, color='white')
-        draw = ImageDraw.Draw(img)
-        
-        # 背景渐变色
-        if style == "tech":
-            colors = [(64, 123, 255), (112, 161, 255)]  # 科技蓝
-        elif style == "warm":
-            colors = [(255, 154, 0), (255, 206, 84)]   # 温暖橙
+    def generate_cover_image(self, title, tool_name="", style="tech", name=None, seed=None):
+        """
+        生成封面图；标题、工具名、风格和日期都相同时直接返回已有文件
+        name 为记录在 manifest 中的逻辑名称，默认 "cover/<日期>/<标题>"，传空字符串则不记录
+        seed 决定装饰圆形的布局，默认由标题得出
+        """
+        date_str = datetime.now().strftime("%Y.%m.%d")
+        seed = overlay_seed(title) if seed is None else seed
+        inputs = {'title': title, 'tool_name': tool_name, 'style': style, 'date': date_str,
+                  'size': self.cover_size, 'font': self.font_path, 'seed': seed}
+        if name is None:
+            name = f"cover/{date_str}/{title}"
+
+        filepath, hit = self.store.get_or_render(
+            "cover", inputs, lambda path: self._draw_cover(title, tool_name, style, date_str, path, seed),
+            name=name)
+        
+        if hit:
+            print(f"♻️ 相同内容的封面图已存在: {filepath}")
         else:
-            colors = [(138, 43, 226), (186, 85, 211)]  # 紫色
-        
-        # 绘制渐变背景
-        self._draw_gradient(draw, self.cover_size, colors)
-        
-        # 添加装饰元素
-        self._add_decorative_elements(draw, self.cover_size)
-        
-        # 添加标题
+            print(f"🖼️ 封面图已生成: {filepath}")
+        return filepath
+    
+    def _draw_cover(self, title, tool_name, style, date_str, filepath, seed=0):
+        """绘制封面图并保存到 filepath：缓存的背景（渐变+装饰）上合成一层文字"""
+        # 背景渐变色（未知风格使用紫色）
+        colors = COVER_STYLES.get(style, COVER_STYLES["purple"])
+        background = cover_background(self.cover_size, colors, seed)
+        
+        # 文字层：标题（含半透明阴影）、工具名称标签、日期
+        layer = new_layer(self.cover_size)
+        draw = ImageDraw.Draw(layer)
         self._add_title_text(draw, title, self.cover_size)
-        
-        # 添加工具名称标签
         if tool_name:
             self._add_tool_label(draw, tool_name, self.cover_size)
-        
-        # 添加日期
-        date_str = datetime.now().strftime("%Y.%m.%d")
         self._add_date(draw, date_str, self.cover_size)
         
         # 保存图片
-        filename = f"cover_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-        filepath = os.path.join(self.output_dir, filename)
-        img.save(filepath, 'PNG', quality=95)
-        
-        print(f"🖼️ 封面图已生成: {filepath}")
-        return filepath
+        compose(background, layer).save(filepath, 'PNG')
     
-    def generate_content_image(self, content_type, data=None):
-        """生成内容配图"""
-        if content_type == "comparison":
-            return self._generate_comparison_chart(data)
-        elif content_type == "tutorial":
-            return self._generate_step_diagram(data)
-        elif content_type == "stats":
-            return self._generate_stats_chart(data)
+    def generate_covers(self, jobs, workers=None):
+        """
+        批量生成封面图，jobs 为 (title, tool_name, style) 列表，按输入顺序返回图片路径
+        PIL绘图受GIL限制只能用满一个核心，这里用进程池并行，每个工作进程只初始化一次生成器；
+        工作进程只渲染文件，manifest 和容量清理都由主进程在进程池结束后统一处理
+        """
+        jobs = [tuple(job) for job in jobs]
+        workers = workers or int(os.getenv('MEDIA_WORKERS', '0')) or os.cpu_count() or 1
+        workers = min(workers, len(jobs))
+
+        if workers <= 1:
+            return [self.generate_cover_image(*job) for job in jobs]
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_cover_worker,
+                                 initargs=(self.output_dir,)) as pool:
+            chunksize = max(1, len(jobs) // (workers * 4))
+            paths = list(pool.map(_render_cover, jobs, chunksize=chunksize))
+
+        # manifest 由主进程统一记录一次，再按整个目录的大小清理一次
+        date_str = datetime.now().strftime("%Y.%m.%d")
+        self.store.record_many([(f"cover/{date_str}/{job[0]}", "cover", path) for job, path in zip(jobs, paths)])
+        self.store.gc()
+        return paths
+    
+    def generate_content_image(self, content_type, data=None, name=None):
+        """
+        生成内容配图
+        data 可以是 chart_specs 中的配图数据（由采集的工具数据生成）、字段字典，或None（示例数据）；
+        相同数据再次生成时直接返回已有文件，name 为记录在 manifest 中的逻辑名称
+        """
+        spec = self._chart_spec(content_type, data)
+        renderers = {
+            "comparison": (self._generate_comparison_chart, "comparison", self.chart_dpi, "📊 对比图表"),
+            "tutorial": (self._generate_step_diagram, "steps", None, "📋 步骤图"),
+            "stats": (self._generate_stats_chart, "stats", self.chart_dpi, "📈 统计图表"),
+            "features": (self._generate_feature_showcase, "features", None, "✨ 功能展示图"),
+        }
+        render, prefix, dpi, label = renderers[spec.kind]
+
+        inputs = {'spec': spec.content_hash(dpi), 'font': self.font_path}
+        filepath, hit = self.store.get_or_render(prefix, inputs, lambda path: render(spec, path), name=name)
+        if hit:
+            print(f"♻️ 相同数据的配图已存在: {filepath}")
         else:
-            return self._generate_feature_showcase(data)
+            print(f"{label}已生成: {filepath}")
+        return filepath
     
-    def _draw_gradient(self, draw, size, colors):
-        """绘制渐变背景"""
-        width, height = size
-        start_color = colors[0]
-        end_color = colors[1]
-        
-        for y in range(height):
-            # 计算当前行的颜色
-            ratio = y / height
-            r = int(start_color[0] * (1 - ratio) + end_color[0] * ratio)
-            g = int(start_color[1] * (1 - ratio) + end_color[1] * ratio)
-            b = int(start_color[2] * (1 - ratio) + end_color[2] * ratio)
-            
-            draw.line([(0, y), (width, y)], fill=(r, g, b))
+    def encode_for(self, filepath, profile):
+        """
+        把生成的图片按发布目标编码（见 image_encoder.PROFILES），返回编码后的文件路径
+        原图文件名即内容哈希，相同原图和配置再次编码时直接返回已有文件
+        """
+        profile = get_profile(profile)
+        inputs = {'source': os.path.basename(filepath), 'profile': dataclasses.asdict(profile),
+                  'format': choose_format(profile)}
+        results = []
+        path, hit = self.store.get_or_render(
+            profile.name, inputs, lambda path: results.append(encode_image(filepath, profile, path)),
+            ext=extension(profile))
+        if results:
+            print(f"🗜️ {results[0].summary()}: {path}")
+        return path
     
-    def _add_decorative_elements(self, draw, size):
-        """添加装饰元素"""
-        width, height = size
-        
-        # 添加一些圆形装饰
-        for _ in range(5):
-            x = random.randint(0, width)
-            y = random.randint(0, height)
-            radius = random.randint(20, 80)
-            alpha = random.randint(10, 30)
-            
-            # 创建半透明圆形
-            circle_img = Image.new('RGBA', (radius*2, radius*2), (255, 255, 255, alpha))
-            circle_draw = ImageDraw.Draw(circle_img)
-            circle_draw.ellipse([0, 0, radius*2, radius*2], fill=(255, 255, 255, alpha))
+    @staticmethod
+    def _chart_spec(content_type, data):
+        """把各种形式的 data 统一为配图数据对象"""
+        if isinstance(data, ChartSpec):
+            return data
+        spec_type = SPEC_TYPES.get(content_type, FeatureSpec)
+        if isinstance(data, dict):
+            fields = {field.name for field in dataclasses.fields(spec_type)}
+            return spec_type(**{key: _freeze(value) for key, value in data.items() if key in fields})
+        return spec_type()
     
     def _add_title_text(self, draw, title, size):
         """添加标题文字"""
         width, height = size
         
-        # 处理长标题，自动换行
+        # 处理长标题：自动换行，超过3行时逐级缩小字号
         max_width = width - 100
-        lines = self._wrap_text(title, self.title_font, max_width)
+        font, lines = fit_text(title, max_width, max_lines=3, path=self.font_path)
         
-        # 计算总高度
-        line_height = 60
+        # 计算总高度（48号字行高60）
+        line_height = int(font.size * 1.25)
         total_height = len(lines) * line_height
         start_y = (height - total_height) // 2
         
         # 绘制每一行
         for i, line in enumerate(lines):
             # 计算文字位置（居中）
-            bbox = draw.textbbox((0, 0), line, font=self.title_font)
-            text_width = bbox[2] - bbox[0]
-            x = (width - text_width) // 2
+            text_w = int(text_width(font, line))
+            x = (width - text_w) // 2
             y = start_y + i * line_height
             
             # 添加文字阴影
-            draw.text((x+2, y+2), line, font=self.title_font, fill=(0, 0, 0, 128))
+            draw.text((x+2, y+2), line, font=font, fill=(0, 0, 0, 128))
             # 添加主文字
-            draw.text((x, y), line, font=self.title_font, fill='white')
+            draw.text((x, y), line, font=font, fill='white')
     
     def _add_tool_label(self, draw, tool_name, size):
         """添加工具名称标签"""
@@ -183,9 +208,8 @@ class MediaGenerator:
                              radius=20, fill=(255, 255, 255, 200))
         
         # 添加工具名称
-        bbox = draw.textbbox((0, 0), tool_name, font=self.content_font)
-        text_width = bbox[2] - bbox[0]
-        text_x = x + (label_width - text_width) // 2
+        text_w = int(text_width(self.content_font, tool_name))
+        text_x = x + (label_width - text_w) // 2
         text_y = y + 8
         
         draw.text((text_x, text_y), tool_name, font=self.content_font, fill='black')
@@ -195,78 +219,25 @@ class MediaGenerator:
         width, height = size
         
         # 在右下角添加日期
-        bbox = draw.textbbox((0, 0), date_str, font=self.content_font)
-        text_width = bbox[2] - bbox[0]
-        x = width - text_width - 20
+        text_w = int(text_width(self.content_font, date_str))
+        x = width - text_w - 20
         y = height - 40
         
         draw.text((x, y), date_str, font=self.content_font, fill='white')
     
-    def _wrap_text(self, text, font, max_width):
-        """文字自动换行"""
-        lines = []
-        words = text.split()
-        current_line = ""
-        
-        for word in words:
-            test_line = current_line + " " + word if current_line else word
-            bbox = ImageDraw.Draw(Image.new('RGB', (1, 1))).textbbox((0, 0), test_line, font=font)
-            if bbox[2] - bbox[0] <= max_width:
-                current_line = test_line
-            else:
-                if current_line:
-                    lines.append(current_line)
-                current_line = word
-        
-        if current_line:
-            lines.append(current_line)
-        
-        return lines
-    
-    def _generate_comparison_chart(self, data):
-        """生成对比图表"""
-        # 使用matplotlib生成对比图
-        plt.rcParams['font.sans-serif'] = ['SimHei', 'Arial Unicode MS', 'DejaVu Sans']
-        plt.rcParams['axes.unicode_minus'] = False
-        
-        fig, ax = plt.subplots(figsize=(10, 6))
-        
-        # 示例数据
-        tools = ['工具A', '工具B']
-        features = ['易用性', '功能性', '价格', '支持']
-        scores_a = [8, 9, 6, 7]
-        scores_b = [7, 8, 9, 8]
-        
-        x = range(len(features))
-        width = 0.35
-        
-        ax.bar([i - width/2 for i in x], scores_a, width, label=tools[0], color='#4A90E2')
-        ax.bar([i + width/2 for i in x], scores_b, width, label=tools[1], color='#F5A623')
+    def _generate_comparison_chart(self, spec, filepath):
+        """生成对比图表（复用图形模板，见 chart_renderer.py）"""
+        render_chart("comparison", spec.to_dict(), filepath, dpi=self.chart_dpi)
         
-        ax.set_xlabel('评估维度')
-        ax.set_ylabel('评分')
-        ax.set_title('AI工具对比分析')
-        ax.set_xticks(x)
-        ax.set_xticklabels(features)
-        ax.legend()
-        ax.set_ylim(0, 10)
-        
-        # 保存图片
-        filename = f"comparison_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-        filepath = os.path.join(self.output_dir, filename)
-        plt.savefig(filepath, dpi=300, bbox_inches='tight')
-        plt.close()
-        
-        print(f"📊 对比图表已生成: {filepath}")
         return filepath
     
-    def _generate_step_diagram(self, data):
+    def _generate_step_diagram(self, spec, filepath):
         """生成步骤图"""
         # 创建步骤流程图
         img = Image.new('RGB', (800, 600), color='white')
         draw = ImageDraw.Draw(img)
         
-        steps = ["注册账号", "安装工具", "配置设置", "开始使用"]
+        steps = spec.steps
         step_height = 100
         step_width = 600
         start_y = 50
@@ -286,10 +257,11 @@ class MediaGenerator:
             draw.text((circle_x + 15, circle_y + 10), str(i + 1), 
                      font=self.content_font, fill='white')
             
-            # 添加步骤文字
+            # 添加步骤文字（来自真实工具数据，过长时缩小字号放进一行）
+            font, lines = fit_text(step, step_width - 40, max_lines=1, path=self.font_path, min_size=20)
             text_x = 120
-            text_y = y + step_height // 2 - 10
-            draw.text((text_x, text_y), step, font=self.title_font, fill='black')
+            text_y = y + (step_height - font.size) // 2
+            draw.text((text_x, text_y), lines[0], font=font, fill='black')
             
             # 添加箭头（除了最后一步）
             if i < len(steps) - 1:
@@ -298,74 +270,28 @@ class MediaGenerator:
                            fill='#666666')
         
         # 保存图片
-        filename = f"steps_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-        filepath = os.path.join(self.output_dir, filename)
-        img.save(filepath, 'PNG', quality=95)
+        img.save(filepath, 'PNG')
         
-        print(f"📋 步骤图已生成: {filepath}")
         return filepath
     
-    def _generate_stats_chart(self, data):
-        """生成统计图表"""
-        # 使用matplotlib生成统计图
-        plt.rcParams['font.sans-serif'] = ['SimHei', 'Arial Unicode MS', 'DejaVu Sans']
-        plt.rcParams['axes.unicode_minus'] = False
-
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 6))
-
-        # 左侧：工具类型分布饼图
-        categories = ['对话AI', '图像生成', '文档处理', '代码助手', '其他']
-        sizes = [35, 25, 20, 15, 5]
-        colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7']
-
-        ax1.pie(sizes, labels=categories, colors=colors, autopct='%1.1f%%', startangle=90)
-        ax1.set_title('本周热门AI工具类型分布', fontsize=14, fontweight='bold')
-
-        # 右侧：工具热度排行柱状图
-        tools = ['ChatGPT', 'Midjourney', 'Claude', 'Notion AI', 'GitHub Copilot']
-        popularity = [95, 88, 82, 76, 71]
+    def _generate_stats_chart(self, spec, filepath):
+        """生成统计图表（复用图形模板，见 chart_renderer.py）"""
+        render_chart("stats", spec.to_dict(), filepath, dpi=self.chart_dpi)
 
-        bars = ax2.bar(tools, popularity, color=['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7'])
-        ax2.set_title('本周AI工具热度排行', fontsize=14, fontweight='bold')
-        ax2.set_ylabel('热度指数')
-        ax2.set_ylim(0, 100)
-
-        # 在柱状图上添加数值
-        for bar, value in zip(bars, popularity):
-            height = bar.get_height()
-            ax2.text(bar.get_x() + bar.get_width()/2., height + 1,
-                    f'{value}', ha='center', va='bottom')
-
-        # 旋转x轴标签
-        ax2.tick_params(axis='x', rotation=45)
-
-        plt.tight_layout()
-
-        # 保存图片
-        filename = f"stats_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-        filepath = os.path.join(self.output_dir, filename)
-        plt.savefig(filepath, dpi=300, bbox_inches='tight')
-        plt.close()
-
-        print(f"📈 统计图表已生成: {filepath}")
         return filepath
 
-    def _generate_feature_showcase(self, data):
+    def _generate_feature_showcase(self, spec, filepath):
         """生成功能展示图"""
         img = Image.new('RGB', (800, 600), color='#F8F9FA')
         draw = ImageDraw.Draw(img)
 
         # 标题
-        title = "核心功能一览"
-        bbox = draw.textbbox((0, 0), title, font=self.title_font)
-        title_width = bbox[2] - bbox[0]
+        title = spec.title
+        title_width = int(text_width(self.title_font, title))
         draw.text(((800 - title_width) // 2, 30), title, font=self.title_font, fill='black')
 
         # 功能列表
-        features = [
-            "🤖 智能对话", "📝 文档处理", "🎨 创意生成",
-            "📊 数据分析", "🔍 信息搜索", "⚡ 快速响应"
-        ]
+        features = spec.features
 
         # 3x2网格布局
         cols = 3
@@ -387,22 +313,44 @@ class MediaGenerator:
                                  radius=15, fill='white', outline='#E0E0E0', width=1)
 
             # 添加功能文字
-            text_lines = feature.split(' ')
+            text_lines = wrap_text(feature, self.content_font, cell_width - 40)[:3]
             for j, line in enumerate(text_lines):
                 text_y = y + 40 + j * 30
-                bbox = draw.textbbox((0, 0), line, font=self.content_font)
-                text_width = bbox[2] - bbox[0]
-                text_x = x + (cell_width - 20 - text_width) // 2
+                text_w = int(text_width(self.content_font, line))
+                text_x = x + (cell_width - 20 - text_w) // 2
                 draw.text((text_x, text_y), line, font=self.content_font, fill='black')
 
         # 保存图片
-        filename = f"features_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-        filepath = os.path.join(self.output_dir, filename)
-        img.save(filepath, 'PNG', quality=95)
+        img.save(filepath, 'PNG')
 
-        print(f"✨ 功能展示图已生成: {filepath}")
         return filepath
 
+def _freeze(value):
+    """把JSON中的列表（包括嵌套的评分矩阵）转换为元组，与配图数据类的字段类型一致"""
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+# 进程池工作进程内的生成器，每个进程初始化一次，复用已加载的字体和渐变缓存
+_worker_generator = None
+
+
+def _init_cover_worker(output_dir):
+    global _worker_generator
+    _worker_generator = MediaGenerator(output_dir)
+    # 工作进程不做容量清理（也就不会改写 manifest），避免各自按过期的目录大小删除其他进程的文件
+    _worker_generator.store.auto_gc = False
+    # 预热：预先合成每种风格、每种装饰布局的背景
+    for colors in COVER_STYLES.values():
+        for seed in range(OVERLAY_VARIANTS):
+            cover_background(_worker_generator.cover_size, colors, seed)
+
+
+def _render_cover(job):
+    return _worker_generator.generate_cover_image(*job, name='')
+
+
 def test_media_generator():
     """测试媒体生成功能"""
     generator = MediaGenerator()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+媒体文件存储模块
+按渲染输入的哈希命名输出文件（内容寻址）：相同输入直接复用已有文件，不再重复渲染；
+通过临时文件+重命名原子写入，manifest.json 记录逻辑名称到哈希的映射，
+目录超过容量上限时按最近使用时间清理
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+
+# 渲染代码发生会改变输出的修改时递增，使旧文件不再被命中
+RENDER_VERSION = 2
+
+
+class MediaStore:
+    """内容寻址的媒体输出目录"""
+
+    MANIFEST = 'manifest.json'
+
+    def __init__(self, root=None, max_mb=None, auto_gc=True):
+        self.root = root or os.getenv('MEDIA_DIR', 'media')
+        max_mb = max_mb if max_mb is not None else float(os.getenv('MEDIA_STORE_MAX_MB', '200'))
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        # 超过容量上限时是否在写入后自动清理；多进程共用目录时只由主进程在结束后调用 gc()
+        self.auto_gc = auto_gc
+        os.makedirs(self.root, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._manifest = None
+        self._size = None  # 目录总大小，首次需要时扫描
+        self.stats = {'hits': 0, 'renders': 0, 'removed': 0, 'freed_bytes': 0}
+
+    @staticmethod
+    def digest(kind, inputs):
+        """渲染输入的哈希；inputs 需可JSON序列化"""
+        payload = json.dumps([RENDER_VERSION, kind, inputs], sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def path_for(self, kind, digest, ext='png'):
+        return os.path.join(self.root, f"{kind}_{digest[:16]}.{ext}")
+
+    def get_or_render(self, kind, inputs, render, name=None, ext='png'):
+        """
+        返回 inputs 对应的文件路径；文件不存在时调用 render(临时路径) 生成后原子重命名
+        name 为逻辑名称（如 "cover/2025-07-01"），记录在 manifest 中指向最新的哈希
+        返回 (路径, 是否命中已有文件)
+        """
+        digest = self.digest(kind, inputs)
+        path = self.path_for(kind, digest, ext)
+
+        hit = os.path.exists(path)
+        if hit:
+            # 更新修改时间，清理时按最近使用排序
+            os.utime(path)
+        else:
+            # 临时文件保留扩展名（PIL、matplotlib按扩展名判断格式），以 .tmp_ 开头便于识别
+            tmp_path = os.path.join(self.root, f".tmp_{os.getpid()}_{threading.get_ident()}_{os.path.basename(path)}")
+            try:
+                render(tmp_path)
+                os.replace(tmp_path, path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+        with self._lock:
+            self.stats['hits' if hit else 'renders'] += 1
+            if name:
+                self._record(name, kind, path)
+            if not hit and self.auto_gc:
+                size = self._current_size() + os.path.getsize(path)
+                self._size = size
+                if size > self.max_bytes:
+                    self._collect(keep=path)
+        return path, hit
+
+    def record(self, name, kind, path):
+        """在 manifest 中记录逻辑名称（用于其他进程渲染出的文件，如批量封面）"""
+        self.record_many([(name, kind, path)])
+
+    def record_many(self, entries):
+        """一次记录多个 (逻辑名称, kind, 路径)，manifest 只写入一次"""
+        with self._lock:
+            for name, kind, path in entries:
+                self._record(name, kind, path, save=False)
+            self._save_manifest()
+
+    def _record(self, name, kind, path, save=True):
+        filename = os.path.basename(path)
+        self._load_manifest()[name] = {'kind': kind, 'hash': filename[len(kind) + 1:].split('.')[0],
+                                       'path': filename, 'updated_at': time.time()}
+        if save:
+            self._save_manifest()
+
+    def resolve(self, name):
+        """按逻辑名称查找文件路径，文件已被清理时返回None"""
+        with self._lock:
+            entry = self._load_manifest().get(name)
+        if not entry:
+            return None
+        path = os.path.join(self.root, entry['path'])
+        return path if os.path.exists(path) else None
+
+    def gc(self, max_bytes=None):
+        """
+        把目录清理到 max_bytes（默认容量上限）以内，返回 (删除文件数, 释放字节数)
+        重新扫描目录，其他进程写入的文件也计算在内
+        """
+        with self._lock:
+            return self._collect(max_bytes=max_bytes)
+
+    def _files(self):
+        """目录下由本存储管理的文件：(最近使用时间, 大小, 路径)"""
+        files = []
+        for entry in os.scandir(self.root):
+            if entry.is_file() and entry.name != self.MANIFEST and not entry.name.startswith('.tmp_'):
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        return files
+
+    def _current_size(self):
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self._files())
+        return self._size
+
+    def _collect(self, max_bytes=None, keep=None):
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        files = sorted(self._files())
+        total = sum(size for _, size, _ in files)
+        removed, freed = 0, 0
+
+        for _, size, path in files:
+            if total <= limit:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+            freed += size
+
+        if removed:
+            manifest = self._load_manifest()
+            for name in [name for name, entry in manifest.items()
+                         if not os.path.exists(os.path.join(self.root, entry['path']))]:
+                del manifest[name]
+            self._save_manifest()
+
+        self._size = total
+        self.stats['removed'] += removed
+        self.stats['freed_bytes'] += freed
+        return removed, freed
+
+    def _load_manifest(self):
+        if self._manifest is None:
+            try:
+                with open(os.path.join(self.root, self.MANIFEST), encoding='utf-8') as f:
+                    self._manifest = json.load(f)
+            except (OSError, ValueError):
+                self._manifest = {}
+        return self._manifest
+
+    def _save_manifest(self):
+        path = os.path.join(self.root, self.MANIFEST)
+        tmp_path = os.path.join(self.root, f".tmp_{os.getpid()}_{self.MANIFEST}")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+    def stats_summary(self):
+        stats = self.stats
+        return (f"媒体存储统计: 复用 {stats['hits']} 个，新渲染 {stats['renders']} 个，"
+                f"清理 {stats['removed']} 个 ({stats['freed_bytes'] / 1024 / 1024:.1f}MB)")
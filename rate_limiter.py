@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Gemini调用限速与重试模块
+按每分钟请求数 (RPM) 和每分钟token数 (TPM) 两个令牌桶限速，遇到429/配额耗尽时
+带抖动指数退避重试并自动降低请求速率，连续失败过多时熔断一段时间
+"""
+
+import os
+import time
+import random
+import threading
+from collections import deque
+
+# 可重试的HTTP状态码：限流、服务端错误、超时
+RETRYABLE_CODES = {429, 500, 502, 503, 504}
+RETRYABLE_NAMES = {
+    'ResourceExhausted', 'TooManyRequests', 'ServiceUnavailable',
+    'InternalServerError', 'DeadlineExceeded', 'GatewayTimeout',
+}
+
+# 不限速时使用的速率上限（每分钟）
+UNLIMITED = 1e9
+
+
+def _status_code(error):
+    """从 google.api_core / requests 等异常中取出HTTP状态码"""
+    code = getattr(error, 'code', None)
+    if isinstance(code, int):
+        return code
+    response = getattr(error, 'response', None)
+    return getattr(response, 'status_code', None)
+
+
+def is_rate_limited(error):
+    return _status_code(error) == 429 or type(error).__name__ in ('ResourceExhausted', 'TooManyRequests')
+
+
+def is_retryable(error):
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    return _status_code(error) in RETRYABLE_CODES or type(error).__name__ in RETRYABLE_NAMES
+
+
+class CircuitOpenError(RuntimeError):
+    """熔断期间直接拒绝调用"""
+
+
+class TokenBucket:
+    """线程安全的令牌桶，rate 为每秒补充的令牌数"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, amount=1):
+        """取出 amount 个令牌，不足时阻塞等待，返回等待的秒数"""
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return waited
+                wait = (amount - self.tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+
+class SlidingWindowLimiter:
+    """
+    线程安全的滑动窗口限速：任意 window 秒内最多 limit 次
+    用于企业微信群机器人这类按"每分钟条数"计数的接口，令牌桶允许的突发会超出这类限制
+    """
+
+    def __init__(self, limit, window=60.0):
+        self.limit = limit
+        self.window = window
+        self.calls = deque()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """占用一次调用额度，窗口内已满时阻塞等待，返回等待的秒数"""
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                while self.calls and self.calls[0] <= now - self.window:
+                    self.calls.popleft()
+                if len(self.calls) < self.limit:
+                    self.calls.append(now)
+                    return waited
+                wait = self.calls[0] + self.window - now
+            time.sleep(wait)
+            waited += wait
+
+
+class CircuitBreaker:
+    """连续失败达到阈值后熔断 cooldown 秒，之后放行一次试探调用"""
+
+    def __init__(self, threshold=5, cooldown=60):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.lock = threading.Lock()
+
+    def check(self):
+        with self.lock:
+            if self.opened_at is None:
+                return
+            remaining = self.cooldown - (time.monotonic() - self.opened_at)
+            if remaining > 0:
+                raise CircuitOpenError(f"Gemini调用已熔断，{remaining:.0f}秒后重试")
+            # 冷却结束，进入半开状态：放行本次调用，失败会立即再次熔断
+            self.opened_at = None
+            self.failures = self.threshold - 1
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+
+    def record_failure(self):
+        """记录一次失败，返回本次是否触发熔断"""
+        with self.lock:
+            self.failures += 1
+            if self.failures >= self.threshold and self.opened_at is None:
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+
+class RateLimitedModel:
+    """在 Gemini 模型外包一层限速、重试和熔断，接口与 GenerativeModel.generate_content 一致"""
+
+    def __init__(self, model, rpm=None, tpm=None, max_retries=None, base_delay=2.0, max_delay=60.0,
+                 breaker=None, log=print):
+        self.model = model
+        self.model_name = getattr(model, 'model_name', type(model).__name__)
+        # 0 或负数表示不限速
+        self.max_rpm = rpm if rpm is not None else float(os.getenv('GEMINI_RPM', '15'))
+        self.max_rpm = self.max_rpm if self.max_rpm > 0 else UNLIMITED
+        tpm = tpm if tpm is not None else float(os.getenv('GEMINI_TPM', '1000000'))
+        tpm = tpm if tpm > 0 else UNLIMITED
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv('GEMINI_MAX_RETRIES', '5'))
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breaker = breaker or CircuitBreaker()
+        self.log = log
+
+        # 请求桶容量为1：请求均匀发起，不允许突发
+        self.request_bucket = TokenBucket(self.max_rpm / 60.0, 1)
+        self.token_bucket = TokenBucket(tpm / 60.0, tpm)
+
+        self.stats_lock = threading.Lock()
+        self.stats = {'calls': 0, 'retries': 0, 'rate_limited': 0, 'throttled': 0.0, 'breaker_opens': 0}
+
+    @staticmethod
+    def estimate_tokens(prompt, generation_config=None):
+        """粗略估算一次调用消耗的token数：提示词 + 最大输出长度"""
+        max_output = getattr(generation_config, 'max_output_tokens', None)
+        if max_output is None and isinstance(generation_config, dict):
+            max_output = generation_config.get('max_output_tokens')
+        return len(prompt) // 2 + (max_output or 2048)
+
+    def generate_content(self, prompt, generation_config=None, **kwargs):
+        tokens = self.estimate_tokens(prompt, generation_config)
+        attempt = 0
+
+        while True:
+            self.breaker.check()
+
+            waited = self.request_bucket.acquire() + self.token_bucket.acquire(tokens)
+            with self.stats_lock:
+                self.stats['calls'] += 1
+                self.stats['throttled'] += waited
+
+            try:
+                response = self.model.generate_content(prompt, generation_config=generation_config, **kwargs)
+            except Exception as e:
+                if not is_retryable(e):
+                    raise
+
+                if self.breaker.record_failure():
+                    with self.stats_lock:
+                        self.stats['breaker_opens'] += 1
+                    self.log(f"⛔ Gemini连续失败 {self.breaker.failures} 次，熔断 {self.breaker.cooldown}s")
+
+                if is_rate_limited(e):
+                    self._slow_down()
+
+                attempt += 1
+                if attempt > self.max_retries:
+                    raise
+
+                # 全抖动指数退避：在 [0, base * 2^n] 内随机等待，避免多个请求同时重试
+                delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+                with self.stats_lock:
+                    self.stats['retries'] += 1
+                self.log(f"🔁 Gemini调用失败 ({type(e).__name__})，{delay:.1f}s 后第 {attempt} 次重试")
+                time.sleep(delay)
+                continue
+
+            self.breaker.record_success()
+            self._speed_up()
+            return response
+
+    def _slow_down(self):
+        """收到限流响应时请求速率减半（不低于每分钟1次）"""
+        with self.request_bucket.lock:
+            self.request_bucket.rate = max(1 / 60.0, self.request_bucket.rate / 2)
+        with self.stats_lock:
+            self.stats['rate_limited'] += 1
+
+    def _speed_up(self):
+        """调用成功后逐步恢复请求速率（每次增加上限的1/30），直到配置的上限"""
+        max_rate = self.max_rpm / 60.0
+        with self.request_bucket.lock:
+            self.request_bucket.rate = min(max_rate, self.request_bucket.rate + max_rate / 30)
+
+    def stats_summary(self):
+        stats = self.stats
+        return (f"Gemini调用统计: 请求 {stats['calls']} 次，重试 {stats['retries']} 次，"
+                f"限流 {stats['rate_limited']} 次，限速等待 {stats['throttled']:.1f}s，熔断 {stats['breaker_opens']} 次，"
+                f"当前速率 {self.request_bucket.rate * 60:.1f} rpm")
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+常驻渲染服务
+在本地HTTP端口上运行一个预热好的 MediaGenerator（字体、渐变与装饰背景、matplotlib图表模板都已加载），
+以JSON接收渲染任务；短生命周期的调用方（如每次定时运行的 AIContentWriter）通过 RenderClient
+提交任务，不需要在自己的进程里导入 PIL 和 matplotlib
+
+启动: python render_server.py [--host 127.0.0.1] [--port 8765]
+调用方设置 RENDER_SERVER_URL=http://127.0.0.1:8765 即可使用
+"""
+
+import os
+import json
+import time
+import argparse
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse
+
+import requests
+
+DEFAULT_PORT = 8765
+
+
+class RenderError(Exception):
+    """渲染服务不可用或任务失败"""
+
+
+class RenderClient:
+    """
+    渲染服务客户端，接口与 MediaGenerator 的对应方法一致
+    配图数据以字段字典传输，服务端还原为 chart_specs 中的数据类
+    """
+
+    def __init__(self, url=None, timeout=60):
+        self.url = (url or os.getenv('RENDER_SERVER_URL', f"http://127.0.0.1:{DEFAULT_PORT}")).rstrip('/')
+        self.timeout = timeout
+        self.session = requests.Session()  # 复用连接
+        self.session.trust_env = False  # 本地服务，不走 ai_writer 设置的代理
+
+    def _call(self, job, **params):
+        try:
+            response = self.session.post(f"{self.url}/render", json={'job': job, **params}, timeout=self.timeout)
+            result = response.json()
+        except (requests.RequestException, ValueError) as e:
+            raise RenderError(f"渲染服务不可用: {e}") from e
+        if response.status_code != 200:
+            raise RenderError(result.get('error', f"HTTP {response.status_code}"))
+        return result['path']
+
+    def health(self):
+        try:
+            return self.session.get(f"{self.url}/health", timeout=self.timeout).json()
+        except (requests.RequestException, ValueError) as e:
+            raise RenderError(f"渲染服务不可用: {e}") from e
+
+    def generate_cover_image(self, title, tool_name="", style="tech", name=None):
+        return self._call('cover', title=title, tool_name=tool_name, style=style, name=name)
+
+    def generate_content_image(self, content_type, data=None, name=None):
+        if hasattr(data, 'to_dict'):
+            data = data.to_dict()
+        return self._call('content', content_type=content_type, data=data, name=name)
+
+    def encode_for(self, filepath, profile):
+        return self._call('encode', path=filepath, profile=profile)
+
+
+class RenderHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # 支持长连接
+    disable_nagle_algorithm = True  # 响应头和正文分两次写出，避免等待延迟确认（约40ms）
+    generator = None
+    stats = None
+    lock = threading.Lock()
+
+    def do_GET(self):
+        if urlparse(self.path).path != '/health':
+            return self._reply(404, {'error': 'not found'})
+        with self.lock:
+            stats = dict(self.stats)
+        self._reply(200, {'status': 'ok', 'pid': os.getpid(), 'jobs': stats,
+                          'store': self.generator.store.stats_summary()})
+
+    def do_POST(self):
+        if urlparse(self.path).path != '/render':
+            return self._reply(404, {'error': 'not found'})
+        try:
+            job = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            start = time.perf_counter()
+            path = self._run(job)
+        except Exception as e:
+            with self.lock:
+                self.stats['failed'] = self.stats.get('failed', 0) + 1
+            return self._reply(400 if isinstance(e, (KeyError, ValueError, TypeError)) else 500,
+                               {'error': f"{type(e).__name__}: {e}"})
+
+        elapsed = time.perf_counter() - start
+        with self.lock:
+            self.stats[job['job']] = self.stats.get(job['job'], 0) + 1
+        self._reply(200, {'path': os.path.abspath(path), 'ms': round(elapsed * 1000, 2)})
+
+    def _run(self, job):
+        generator = self.generator
+        kind = job['job']
+        if kind == 'cover':
+            return generator.generate_cover_image(job['title'], job.get('tool_name', ''),
+                                                  job.get('style', 'tech'), name=job.get('name'))
+        if kind == 'content':
+            return generator.generate_content_image(job['content_type'], job.get('data'), name=job.get('name'))
+        if kind == 'encode':
+            return generator.encode_for(job['path'], job['profile'])
+        raise ValueError(f"未知的渲染任务: {kind}（可选 cover、content、encode）")
+
+    def _reply(self, status, result):
+        body = json.dumps(result, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def warm_up(generator):
+    """加载字体、合成所有封面背景，并为每种图表创建一次模板（输出到临时目录，不进入媒体存储）"""
+    from cover_layers import OVERLAY_VARIANTS, cover_background
+    from chart_renderer import TEMPLATES, render_chart
+    from media_generator import COVER_STYLES
+
+    for colors in COVER_STYLES.values():
+        for seed in range(OVERLAY_VARIANTS):
+            cover_background(generator.cover_size, colors, seed)
+    with tempfile.TemporaryDirectory() as workdir:
+        for kind in TEMPLATES:
+            render_chart(kind, {}, os.path.join(workdir, f"{kind}.png"), dpi=generator.chart_dpi)
+
+
+def create_server(host='127.0.0.1', port=DEFAULT_PORT, output_dir=None):
+    """创建并预热渲染服务（未开始监听请求），port=0 时使用随机端口"""
+    from media_generator import MediaGenerator  # 服务端才需要加载 PIL 和 matplotlib
+
+    generator = MediaGenerator(output_dir)
+    warm_up(generator)
+    handler = type('ConfiguredRenderHandler', (RenderHandler,), {
+        'generator': generator,
+        'stats': {},
+        'lock': threading.Lock(),
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="常驻渲染服务")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--output-dir', default=None, help="媒体输出目录（默认 MEDIA_DIR 或 media）")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    server = create_server(args.host, args.port, args.output_dir)
+    print(f"🚀 渲染服务已就绪: http://{args.host}:{server.server_address[1]} "
+          f"（预热 {time.perf_counter() - start:.2f}s）", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 渲染服务已停止")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Gemini响应缓存模块
+以 (模型名, 提示词, 生成参数) 的哈希为键缓存生成结果，支持过期时间和LRU容量淘汰；
+提示词完全相同的重复运行、预演和测试无需再次调用API
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+import dataclasses
+
+
+def _config_key(config):
+    """将生成参数转换为稳定的字符串，用于计算缓存键"""
+    if config is None:
+        return ''
+    if dataclasses.is_dataclass(config):
+        config = dataclasses.asdict(config)
+    elif hasattr(config, 'to_dict'):
+        config = config.to_dict()
+    if isinstance(config, dict):
+        config = {key: value for key, value in config.items() if value is not None}
+        return json.dumps(config, sort_keys=True, ensure_ascii=False, default=str)
+    return repr(config)
+
+
+def make_key(model_name, prompt, generation_config=None):
+    """计算缓存键"""
+    payload = '\x00'.join([model_name, prompt, _config_key(generation_config)])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class CachedResponse:
+    """从缓存读取的响应，和Gemini响应一样通过 .text 取正文"""
+
+    def __init__(self, text):
+        self.text = text
+
+
+class ResponseCache:
+    """基于SQLite的响应缓存"""
+
+    def __init__(self, path=None, ttl_hours=None, max_entries=None, max_bytes=None):
+        self.path = path or os.getenv('LLM_CACHE_PATH', os.path.join('cache', 'llm_responses.db'))
+        self.ttl = (ttl_hours if ttl_hours is not None else float(os.getenv('LLM_CACHE_TTL_HOURS', '72'))) * 3600
+        self.max_entries = max_entries if max_entries is not None else int(os.getenv('LLM_CACHE_MAX_ENTRIES', '500'))
+        self.max_bytes = max_bytes if max_bytes is not None else int(os.getenv('LLM_CACHE_MAX_MB', '50')) * 1024 * 1024
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # 批量生成时多个线程共用同一个连接，由锁保证串行访问
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT,
+                text TEXT,
+                size INTEGER,
+                latency REAL,
+                created_at REAL,
+                last_access REAL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access)")
+        self.conn.commit()
+
+        self.stats = {'hits': 0, 'misses': 0, 'saved_latency': 0.0}
+
+    def get(self, key):
+        """读取未过期的缓存正文，未命中返回None"""
+        now = time.time()
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT text, latency, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None or (self.ttl > 0 and now - row[2] > self.ttl):
+                if row is not None:
+                    self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self.conn.commit()
+                self.stats['misses'] += 1
+                return None
+
+            self.conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self.conn.commit()
+            self.stats['hits'] += 1
+            self.stats['saved_latency'] += row[1]
+            return row[0]
+
+    def put(self, key, model_name, text, latency):
+        """写入缓存，并按LRU淘汰超出容量的记录"""
+        now = time.time()
+        size = len(text.encode('utf-8'))
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, model_name, text, size, latency, now, now)
+            )
+            self._evict()
+            self.conn.commit()
+
+    def _evict(self):
+        count, total = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+
+        for key, size in self.conn.execute(
+                "SELECT key, size FROM responses ORDER BY last_access").fetchall():
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            count -= 1
+            total -= size
+
+    def stats_summary(self):
+        stats = self.stats
+        return (f"响应缓存统计: 命中 {stats['hits']} 次，未命中 {stats['misses']} 次，"
+                f"节省生成耗时 {stats['saved_latency']:.1f}s")
+
+
+class CachedModel:
+    """在 Gemini 模型前加一层响应缓存，接口与 GenerativeModel.generate_content 一致"""
+
+    def __init__(self, model, cache, bypass=None):
+        self.model = model
+        self.cache = cache
+        self.model_name = getattr(model, 'model_name', type(model).__name__)
+        # 跳过读取缓存（强制重新生成），生成结果仍会写入缓存
+        self.bypass = bypass if bypass is not None else os.getenv('LLM_CACHE_BYPASS', 'false').lower() == 'true'
+
+    def generate_content(self, prompt, generation_config=None, stream=False, **kwargs):
+        key = make_key(self.model_name, prompt, generation_config)
+
+        cached = None if self.bypass else self.cache.get(key)
+        if cached is not None:
+            response = CachedResponse(cached)
+            return iter([response]) if stream else response
+
+        start = time.perf_counter()
+        if not stream:
+            response = self.model.generate_content(prompt, generation_config=generation_config, **kwargs)
+            self.cache.put(key, self.model_name, response.text, time.perf_counter() - start)
+            return response
+
+        return self._stream_and_store(key, start, prompt, generation_config, kwargs)
+
+    def _stream_and_store(self, key, start, prompt, generation_config, kwargs):
+        """透传流式分块，完整接收后才写入缓存（中途失败不缓存半截内容）"""
+        parts = []
+        for chunk in self.model.generate_content(prompt, generation_config=generation_config,
+                                                 stream=True, **kwargs):
+            parts.append(chunk.text)
+            yield chunk
+        self.cache.put(key, self.model_name, ''.join(parts), time.perf_counter() - start)
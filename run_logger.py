@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+运行日志模块
+每次运行一个 RunLogger：控制台保持原来的输出格式，同时以 JSON Lines 写入 logs/<名称>_<日期>.jsonl，
+每行带运行ID、当前阶段和（阶段结束时的）耗时，便于按运行、按阶段统计。
+日志文件在整个运行期间保持打开，写入先进入内存缓冲区，缓冲区写满、间隔 LOG_FLUSH_SECONDS、
+出现 ERROR 或程序退出时才落盘；跨天时切换到新日期的文件，单个文件超过 LOG_MAX_MB 时切换到下一个序号
+"""
+
+import os
+import json
+import time
+import uuid
+import atexit
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+LEVELS = {'DEBUG': 10, 'INFO': 20, 'WARNING': 30, 'ERROR': 40}
+
+# 控制台格式：plain 与原来的 print 输出一致，timestamped 为 GitHub Actions 版的 "[时间] 级别: 消息"
+CONSOLE_FORMATS = ('plain', 'timestamped')
+
+_encode = json.JSONEncoder(ensure_ascii=False, default=str).encode
+
+
+class RotatingLogFile:
+    """
+    带缓冲的日志文件，按日期和大小切换
+    文件名: <prefix>_<YYYYMMDD>.jsonl，同一天超过 max_bytes 后依次为 <prefix>_<YYYYMMDD>.1.jsonl、.2.jsonl ...
+    文件在第一次写入时才打开，只导入模块或没有输出日志时不会创建文件
+    """
+
+    def __init__(self, log_dir, prefix, max_bytes, buffer_size, flush_interval):
+        self.log_dir = log_dir
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.lock = threading.Lock()
+        self.stream = None
+        self.path = None
+        self.date = None
+        self.index = 0
+        self.size = 0
+        self.last_flush = time.monotonic()
+
+    def _path(self, date, index):
+        suffix = f".{index}" if index else ""
+        return os.path.join(self.log_dir, f"{self.prefix}_{date}{suffix}.jsonl")
+
+    def _open(self, date, index=0):
+        """打开 date 当天第一个未写满的文件（续写上次运行的文件，只在切换文件时检查文件大小）"""
+        self._close_stream()
+        os.makedirs(self.log_dir, exist_ok=True)
+        path = self._path(date, index)
+        while os.path.exists(path) and os.path.getsize(path) >= self.max_bytes:
+            index += 1
+            path = self._path(date, index)
+        self.stream = open(path, 'ab', buffering=self.buffer_size)
+        self.path, self.date, self.index = path, date, index
+        self.size = self.stream.tell()
+
+    def _close_stream(self):
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+
+    def write(self, line, date, urgent=False):
+        """写入一行（不含换行符）；urgent 为 True 时立即落盘"""
+        data = line.encode('utf-8') + b'\n'
+        with self.lock:
+            if self.stream is None or date != self.date:
+                self._open(date)
+            elif self.size and self.size + len(data) > self.max_bytes:
+                self._open(date, self.index + 1)
+            self.stream.write(data)
+            self.size += len(data)
+
+            now = time.monotonic()
+            if urgent or now - self.last_flush >= self.flush_interval:
+                self.stream.flush()
+                self.last_flush = now
+
+    def flush(self):
+        with self.lock:
+            if self.stream is not None:
+                self.stream.flush()
+                self.last_flush = time.monotonic()
+
+    def close(self):
+        with self.lock:
+            self._close_stream()
+
+
+class RunLogger:
+    """
+    一次运行的日志
+    name: 日志文件名前缀；console: 控制台格式（plain / timestamped），None 表示不输出到控制台
+    """
+
+    def __init__(self, name, log_dir=None, console='plain', run_id=None, level=None,
+                 max_mb=None, buffer_kb=None, flush_seconds=None):
+        if console not in CONSOLE_FORMATS + (None,):
+            raise ValueError(f"未知的控制台格式: {console}（可选 {', '.join(CONSOLE_FORMATS)}）")
+        self.run_id = run_id or f"{datetime.now().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        self.console = console
+        self.level = LEVELS.get(str(level or os.getenv('LOG_LEVEL', 'INFO')).upper(), LEVELS['INFO'])
+        self.current_stage = None
+
+        max_mb = max_mb if max_mb is not None else float(os.getenv('LOG_MAX_MB', '10'))
+        buffer_kb = buffer_kb if buffer_kb is not None else int(os.getenv('LOG_BUFFER_KB', '64'))
+        flush_seconds = flush_seconds if flush_seconds is not None else float(os.getenv('LOG_FLUSH_SECONDS', '5'))
+        self.file = RotatingLogFile(
+            log_dir or os.getenv('LOG_DIR', 'logs'), name,
+            max_bytes=int(max_mb * 1024 * 1024),
+            buffer_size=max(buffer_kb, 1) * 1024,
+            flush_interval=flush_seconds,
+        )
+
+        # 同一秒内的日志复用格式化好的时间前缀：(秒, ISO时间, 日期, 控制台时间)，整体替换，多线程读取时保持一致
+        self._stamp = (None, None, None, None)
+        # 异常退出、忘记调用 close() 时也把缓冲区写入文件
+        atexit.register(self.flush)
+
+    def _timestamp(self, now):
+        stamp = self._stamp
+        second = int(now)
+        if stamp[0] != second:
+            local = time.localtime(second)
+            stamp = (second, time.strftime('%Y-%m-%dT%H:%M:%S', local), time.strftime('%Y%m%d', local),
+                     time.strftime('%Y-%m-%d %H:%M:%S', local))
+            self._stamp = stamp
+        return stamp
+
+    def log(self, message, level="INFO", console=True, **fields):
+        """记录一条日志；fields 为写入JSON的附加字段（如 duration_ms，stage 可覆盖当前阶段）"""
+        level = str(level).upper()
+        levelno = LEVELS.get(level, LEVELS['INFO'])
+        if levelno < self.level:
+            return
+
+        now = time.time()
+        _, iso, date, display = self._timestamp(now)
+        message = str(message)
+        if console and self.console:
+            if self.console == 'timestamped':
+                print(f"[{display}] {level}: {message}")
+            else:
+                print(message)
+
+        entry = {'ts': f"{iso}.{int(now % 1 * 1000):03d}", 'level': level, 'run_id': self.run_id,
+                 'stage': self.current_stage, 'message': message}
+        if fields:
+            entry.update(fields)
+        self.file.write(_encode(entry), date, urgent=levelno >= LEVELS['ERROR'])
+
+    def debug(self, message, **fields):
+        self.log(message, 'DEBUG', **fields)
+
+    def info(self, message, **fields):
+        self.log(message, 'INFO', **fields)
+
+    def warning(self, message, **fields):
+        self.log(message, 'WARNING', **fields)
+
+    def error(self, message, **fields):
+        self.log(message, 'ERROR', **fields)
+
+    @contextmanager
+    def stage(self, name):
+        """
+        标记运行阶段：期间的日志带上 stage 字段，结束时写入一条带 duration_ms 的记录（只写文件）
+        阶段内抛出异常时记录为失败并继续抛出
+        """
+        previous, self.current_stage = self.current_stage, name
+        start = time.perf_counter()
+        status = 'ok'
+        try:
+            yield
+        except BaseException:
+            status = 'failed'
+            raise
+        finally:
+            duration_ms = round((time.perf_counter() - start) * 1000, 1)
+            self.log(f"阶段 {name} 结束", 'INFO' if status == 'ok' else 'ERROR', console=False,
+                     duration_ms=duration_ms, status=status)
+            self.current_stage = previous
+
+    @property
+    def path(self):
+        """当前日志文件路径（还没有写入日志时为 None）"""
+        return self.file.path
+
+    def flush(self):
+        """把缓冲区中的日志写入文件"""
+        self.file.flush()
+
+    def close(self):
+        """写入缓冲区并关闭日志文件（之后再写日志会重新打开文件）"""
+        self.file.close()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+跨运行去重索引模块
+用SQLite持久化已发布内容的URL和标题指纹，启动时加载到内存集合，
+查询为O(1)；超过保留期的记录会自动过期清理
+"""
+
+import os
+import re
+import time
+import sqlite3
+import hashlib
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+
+def normalize_url(url):
+    """规范化URL：忽略协议/域名大小写、锚点、utm跟踪参数和末尾斜杠"""
+    parts = urlsplit(url.strip())
+    query = urlencode([(key, value) for key, value in parse_qsl(parts.query)
+                       if not key.lower().startswith('utm_')])
+    path = parts.path.rstrip('/')
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, query, ''))
+
+
+def normalize_title(title):
+    """规范化标题：忽略大小写、标点、emoji和空白"""
+    return re.sub(r'[\W_]+', '', title.lower())
+
+
+def _digest(kind, value):
+    return hashlib.sha1(f"{kind}:{value}".encode('utf-8')).hexdigest()[:20]
+
+
+class SeenIndex:
+    """已发布内容的指纹索引"""
+
+    def __init__(self, path=None, ttl_days=None):
+        self.path = path or os.getenv('SEEN_INDEX_PATH', os.path.join('cache', 'seen_items.db'))
+        self.ttl_days = ttl_days if ttl_days is not None else float(os.getenv('SEEN_INDEX_TTL_DAYS', '90'))
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS seen_items (
+                fingerprint TEXT PRIMARY KEY,
+                label TEXT,
+                first_seen REAL,
+                last_seen REAL
+            ) WITHOUT ROWID
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_seen_last_seen ON seen_items(last_seen)")
+        self._expire()
+
+        # 全部有效指纹常驻内存，查询不访问磁盘
+        self._fingerprints = {row[0] for row in self.conn.execute("SELECT fingerprint FROM seen_items")}
+
+    def __len__(self):
+        return len(self._fingerprints)
+
+    @staticmethod
+    def fingerprints(url=None, title=None):
+        """计算一条内容的URL指纹和标题指纹"""
+        result = []
+        if url:
+            result.append(_digest('url', normalize_url(url)))
+        if title and normalize_title(title):
+            result.append(_digest('title', normalize_title(title)))
+        return result
+
+    def is_seen(self, url=None, title=None):
+        """URL或标题任一指纹命中即视为已发布"""
+        return any(fp in self._fingerprints for fp in self.fingerprints(url, title))
+
+    def mark_seen(self, url=None, title=None, label=''):
+        """记录一条已发布的内容"""
+        now = time.time()
+        fingerprints = self.fingerprints(url, title)
+        self.conn.executemany("""
+            INSERT INTO seen_items (fingerprint, label, first_seen, last_seen) VALUES (?, ?, ?, ?)
+            ON CONFLICT(fingerprint) DO UPDATE SET last_seen = excluded.last_seen
+        """, [(fp, label or title or url, now, now) for fp in fingerprints])
+        self.conn.commit()
+        self._fingerprints.update(fingerprints)
+
+    def _expire(self):
+        """删除超过保留期的记录，返回删除条数"""
+        if self.ttl_days <= 0:
+            return 0
+        cutoff = time.time() - self.ttl_days * 86400
+        cursor = self.conn.execute("DELETE FROM seen_items WHERE last_seen < ?", (cutoff,))
+        self.conn.commit()
+        return cursor.rowcount
+
+    def close(self):
+        self.conn.close()
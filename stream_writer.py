@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+流式生成模块
+边接收Gemini返回的分块边追加写入文章文件，统计首字延迟和生成速度；
+运行中断或超时时，已生成的部分内容会保留在文件中
+"""
+
+import time
+
+
+class StreamStats:
+    """一次流式生成的耗时统计"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.first_chunk_at = None
+        self.end = None
+        self.chunks = 0
+        self.chars = 0
+        self.tokens = None  # 服务端返回的输出token数，拿不到时为None
+
+    @property
+    def ttft(self):
+        """首字延迟（秒）"""
+        return (self.first_chunk_at - self.start) if self.first_chunk_at else None
+
+    @property
+    def duration(self):
+        return (self.end or time.perf_counter()) - self.start
+
+    def _rate(self, amount):
+        """首字之后的生成速度（每秒）"""
+        if not amount or not self.first_chunk_at:
+            return None
+        generating = (self.end or time.perf_counter()) - self.first_chunk_at
+        return amount / generating if generating > 0 else None
+
+    @property
+    def tokens_per_sec(self):
+        return self._rate(self.tokens)
+
+    @property
+    def chars_per_sec(self):
+        return self._rate(self.chars)
+
+    def summary(self):
+        ttft = f"{self.ttft:.2f}s" if self.ttft is not None else "-"
+        parts = [f"首字延迟 {ttft}", f"总耗时 {self.duration:.2f}s"]
+        if self.tokens and self.tokens_per_sec:
+            parts.append(f"{self.tokens} tokens ({self.tokens_per_sec:.1f} tokens/s)")
+        if self.chars_per_sec:
+            parts.append(f"{self.chars} 字符 ({self.chars_per_sec:.1f} 字符/s)")
+        else:
+            parts.append(f"{self.chars} 字符")
+        return "流式生成统计: " + "，".join(parts)
+
+
+def stream_generate(model, prompt, filepath, header="", on_chunk=None, **kwargs):
+    """流式调用 model.generate_content，返回 (完整文本, StreamStats)
+
+    每个分块到达后立即追加写入 filepath 并刷新；中途出错时在文件末尾
+    写入中断标记后重新抛出异常，已写入的内容不会丢失
+    """
+    stats = StreamStats()
+    parts = []
+
+    with open(filepath, 'w', encoding='utf-8') as f:
+        if header:
+            f.write(header)
+            f.flush()
+
+        try:
+            response = model.generate_content(prompt, stream=True, **kwargs)
+            for chunk in response:
+                text = chunk.text
+                if stats.first_chunk_at is None:
+                    stats.first_chunk_at = time.perf_counter()
+                stats.chunks += 1
+                stats.chars += len(text)
+                parts.append(text)
+
+                f.write(text)
+                f.flush()
+
+                usage = getattr(chunk, 'usage_metadata', None)
+                if usage is not None and getattr(usage, 'candidates_token_count', 0):
+                    stats.tokens = usage.candidates_token_count
+
+                if on_chunk:
+                    on_chunk(text, stats)
+
+        except BaseException as e:
+            stats.end = time.perf_counter()
+            f.write(f"\n\n<!-- 生成中断（已保留 {stats.chars} 字符）: {type(e).__name__}: {e} -->\n")
+            f.flush()
+            raise
+
+    stats.end = time.perf_counter()
+    return "".join(parts), stats
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+文字排版模块
+进程内共享的字体对象缓存（按 路径+字号）和字符串宽度缓存；
+换行按中日韩单字、英文单词和emoji组合切分断行单元，遵守标点避头尾规则，
+用前缀宽度二分查找每行的断点，并支持自动缩小字号适配区域
+"""
+
+import os
+import re
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate
+
+from PIL import ImageFont
+
+# 按优先级尝试的系统中文字体
+FONT_PATHS = [
+    '/System/Library/Fonts/PingFang.ttc',  # macOS
+    '/System/Library/Fonts/Helvetica.ttc',  # macOS备用
+    'C:/Windows/Fonts/msyh.ttc',  # Windows
+    '/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc',  # Linux (fonts-noto-cjk)
+    '/usr/share/fonts/truetype/wqy/wqy-microhei.ttc',  # Linux (fonts-wqy-microhei)
+    '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf'  # Linux，不含中文字形
+]
+
+
+@lru_cache(maxsize=None)
+def find_font_path():
+    """返回第一个可加载的系统字体路径，都不可用时返回None（使用Pillow默认字体）"""
+    for font_path in FONT_PATHS:
+        if os.path.exists(font_path):
+            try:
+                ImageFont.truetype(font_path, 12)
+                return font_path
+            except OSError:
+                continue
+    return None
+
+
+@lru_cache(maxsize=64)
+def get_font(path, size):
+    """按 (路径, 字号) 缓存字体对象；path 为None时使用Pillow默认字体"""
+    if path is None:
+        try:
+            return ImageFont.load_default(size=size)
+        except TypeError:
+            # Pillow 10.1 以前的默认字体不支持指定字号
+            return ImageFont.load_default()
+    return ImageFont.truetype(path, size)
+
+
+@lru_cache(maxsize=8192)
+def text_width(font, text):
+    """字符串的排版宽度（像素），字体对象来自 get_font 缓存，可以直接作为缓存键"""
+    return font.getlength(text)
+
+
+# 不能出现在行首的标点（并入前一个单元）和不能出现在行尾的标点（并入后一个单元）
+NO_LINE_START = set('，。！？、；：）」』】》〉〕”’…—～·%,.!?;:)]}')
+NO_LINE_END = set('（「『【《〈〔“‘([{')
+
+_EMOJI_BASE = r'[\u2600-\u27BF\u2B00-\u2BFF\U0001F000-\U0001FAFF]'
+_EMOJI_TAIL = r'[\U0001F3FB-\U0001F3FF]?\uFE0F?'
+_UNIT = re.compile(
+    r'\s+'
+    # 国旗（两个区域指示符）、数字键帽、带肤色/变体选择符并用ZWJ连接的emoji序列
+    r'|[\U0001F1E6-\U0001F1FF]{2}'
+    r'|[0-9#*]\uFE0F?\u20E3'
+    rf'|{_EMOJI_BASE}{_EMOJI_TAIL}(?:\u200D{_EMOJI_BASE}{_EMOJI_TAIL})*'
+    # 英文单词、数字、版本号等（如 GPT-4o、v1.5、C++）
+    r"|[A-Za-z0-9\u00C0-\u024F]+(?:['\u2019.\-_/+#&][A-Za-z0-9\u00C0-\u024F]+)*\+*"
+    # 其余字符（中日韩文字、标点）各自成为一个单元
+    r'|.',
+    re.S,
+)
+
+
+@lru_cache(maxsize=1024)
+def segment_text(text):
+    """把文本切分为不可再分的断行单元，行只会在单元之间断开"""
+    units = []
+    pending = ''  # 等待并入下一个单元的开括号/开引号
+
+    for unit in _UNIT.findall(text):
+        if unit.isspace():
+            if pending:
+                units.append(pending)
+                pending = ''
+            units.append(unit)
+        elif all(char in NO_LINE_END for char in unit):
+            pending += unit
+        elif all(char in NO_LINE_START for char in unit) and units and not units[-1].isspace():
+            units[-1] += pending + unit
+            pending = ''
+        else:
+            units.append(pending + unit)
+            pending = ''
+
+    if pending:
+        units.append(pending)
+    return tuple(units)
+
+
+def wrap_text(text, font, max_width):
+    """
+    自动换行：每个单元的宽度来自缓存，累加为前缀宽度后二分查找每行能容纳的最后一个单元
+    行首、行尾的空白会被去掉；单个单元比整行还宽时（超长单词、链接）按字符拆开
+    """
+    units = []
+    for unit in segment_text(text):
+        if len(unit) > 1 and not unit.isspace() and text_width(font, unit) > max_width:
+            units.extend(unit)
+        else:
+            units.append(unit)
+
+    prefix = list(accumulate((text_width(font, unit) for unit in units), initial=0.0))
+    lines = []
+    start = 0
+    while start < len(units):
+        if units[start].isspace():
+            start += 1
+            continue
+        # 满足 prefix[end] - prefix[start] <= max_width 的最大 end，至少放下一个单元
+        end = max(start + 1, bisect_right(prefix, prefix[start] + max_width) - 1)
+        lines.append(''.join(units[start:end]).rstrip())
+        start = end
+
+    return lines
+
+
+def fit_text(text, max_width, max_lines, path=None, max_size=48, min_size=24, step=4):
+    """
+    从 max_size 开始逐级缩小字号，直到换行后不超过 max_lines 行且每行不超宽
+    返回 (字体, 行列表)；缩到 min_size 仍放不下时按 min_size 排版
+    各字号的字体对象和词宽都会被缓存，重复调用不会重新加载字体
+    """
+    size = max_size
+    while True:
+        font = get_font(path, size)
+        lines = wrap_text(text, font, max_width)
+        # 超宽的单元在换行时已按字符拆开，只需比较行数
+        fits = len(lines) <= max_lines
+        if fits or size - step < min_size:
+            return font, lines
+        size -= step
+
+
+def cache_info():
+    return {'fonts': get_font.cache_info(), 'widths': text_width.cache_info(),
+            'segments': segment_text.cache_info()}
@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+企业微信群机器人客户端
+所有 Webhook 请求（文本消息、文件上传、文件消息）共用一个 requests.Session 连接池，
+与 qyapi.weixin.qq.com 的 TCP/TLS 连接保持复用，一次运行的多条请求只握手一次；
+连接失败和 429 由 urllib3 的 Retry 按指数退避重试；网关错误 (502/503/504) 时消息可能已经送达，
+只有上传文件会重试，发送消息不重试，避免群里收到重复消息；
+上传的文件按内容哈希缓存 media_id（有效期3天），同一文件再次发送时跳过上传，上传时从磁盘分块读取；
+每个机器人每分钟最多发送20条消息，同一进程内发往同一机器人的消息共用一个滑动窗口限速
+
+命令行: python wechat_client.py "消息内容"   （发送到 WECHAT_WEBHOOK_URL 和 WECHAT_WEBHOOK_URLS 中的所有群，未配置时直接退出）
+"""
+
+import os
+import sys
+import time
+import uuid
+import sqlite3
+import hashlib
+import threading
+from urllib.parse import urlsplit, parse_qs
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from rate_limiter import SlidingWindowLimiter
+
+
+# 群机器人上传的 media_id 3天内有效，提前留出余量
+MEDIA_TTL_HOURS = 70
+
+# 企业微信返回的 media_id 无效或已过期
+INVALID_MEDIA_ERRCODES = (40007, 40008)
+
+# 上传文件遇到这些状态码时重试（重复上传只会多生成一个 media_id）
+UPLOAD_RETRY_STATUSES = (502, 503, 504)
+
+# 群机器人发送频率上限：每个机器人每分钟20条
+RATE_LIMIT_PER_MINUTE = 20
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def message_limiter(scope, limit, window=60.0):
+    """同一机器人的限速器（按机器人共享，多个客户端、多个线程发往同一个群时合并计数）"""
+    with _limiters_lock:
+        if scope not in _limiters:
+            _limiters[scope] = SlidingWindowLimiter(limit, window)
+        return _limiters[scope]
+
+
+def load_targets():
+    """
+    读取推送目标，返回 {目标名: Webhook URL}（保持配置顺序）
+    WECHAT_WEBHOOK_URL 为 default；WECHAT_WEBHOOK_URLS 为逗号或换行分隔的多个群，
+    每项可写成 "名称=URL"，未命名的按顺序命名为 group1、group2 ...；重复的 URL 只保留一个
+    """
+    targets = {}
+    if os.getenv('WECHAT_WEBHOOK_URL'):
+        targets['default'] = os.getenv('WECHAT_WEBHOOK_URL').strip()
+    entries = os.getenv('WECHAT_WEBHOOK_URLS', '').replace('\n', ',').split(',')
+    for index, entry in enumerate((e.strip() for e in entries if e.strip()), 1):
+        name, url = f"group{index}", entry
+        if not entry.startswith(('http://', 'https://')) and '=' in entry:
+            name, url = (part.strip() for part in entry.split('=', 1))
+        if url not in targets.values():
+            targets[name] = url
+    return targets
+
+
+def file_digest(path, chunk_size=1024 * 1024):
+    """文件内容的 sha256，分块读取"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class WeChatError(Exception):
+    """企业微信接口返回错误（HTTP状态码异常或 errcode 非0）"""
+
+    def __init__(self, message, errcode=None, status=None):
+        super().__init__(message)
+        self.errcode = errcode
+        self.status = status
+
+
+class WeChatConfigError(WeChatError):
+    """Webhook URL 配置错误（如缺少 key 参数），重试不会成功"""
+
+
+class UploadCache:
+    """
+    已上传文件的 media_id 缓存，键为 (机器人, 文件类型, 内容哈希)
+    企业微信的 media_id 只能由上传它的机器人使用，所以不同机器人之间不共享
+    """
+
+    def __init__(self, path=None, ttl_hours=None):
+        self.path = path or os.getenv('WECHAT_UPLOAD_CACHE_PATH', os.path.join('cache', 'wechat_uploads.db'))
+        ttl_hours = ttl_hours if ttl_hours is not None else float(os.getenv('WECHAT_MEDIA_TTL_HOURS', MEDIA_TTL_HOURS))
+        self.ttl = ttl_hours * 3600
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # 推送队列的后台线程和主线程可能共用同一个客户端
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS uploads (
+                scope TEXT,
+                digest TEXT,
+                media_id TEXT,
+                expires_at REAL,
+                PRIMARY KEY (scope, digest)
+            ) WITHOUT ROWID
+        """)
+        with self.lock:
+            self.conn.execute("DELETE FROM uploads WHERE expires_at < ?", (time.time(),))
+            self.conn.commit()
+
+    def get(self, scope, digest):
+        with self.lock:
+            row = self.conn.execute("SELECT media_id FROM uploads WHERE scope = ? AND digest = ? AND expires_at > ?",
+                                    (scope, digest, time.time())).fetchone()
+        return row[0] if row else None
+
+    def put(self, scope, digest, media_id):
+        if self.ttl <= 0:
+            return
+        with self.lock:
+            self.conn.execute("INSERT OR REPLACE INTO uploads VALUES (?, ?, ?, ?)",
+                              (scope, digest, media_id, time.time() + self.ttl))
+            self.conn.commit()
+
+    def invalidate(self, scope, digest):
+        with self.lock:
+            self.conn.execute("DELETE FROM uploads WHERE scope = ? AND digest = ?", (scope, digest))
+            self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+class MultipartFile:
+    """
+    单个文件的 multipart/form-data 请求体，按需从磁盘分块读取
+    提供 read/len/seek，requests 据此设置 Content-Length 并流式发送，连接失败重试时可以回到开头
+    """
+
+    def __init__(self, field, file_path, content_type='application/octet-stream'):
+        self.boundary = uuid.uuid4().hex
+        filename = os.path.basename(file_path).replace('"', '')
+        self.head = (f'--{self.boundary}\r\n'
+                     f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+                     f'Content-Type: {content_type}\r\n\r\n').encode('utf-8')
+        self.tail = f'\r\n--{self.boundary}--\r\n'.encode('utf-8')
+        self.file = open(file_path, 'rb')
+        self.size = len(self.head) + os.path.getsize(file_path) + len(self.tail)
+        self.position = 0
+
+    @property
+    def content_type(self):
+        return f'multipart/form-data; boundary={self.boundary}'
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        # requests 通过是否可迭代判断为流式请求体；实际发送时 http.client 调用 read()
+        while True:
+            chunk = self.read(64 * 1024)
+            if not chunk:
+                return
+            yield chunk
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = self.size
+        chunks = []
+        while size > 0 and self.position < self.size:
+            head_end = len(self.head)
+            file_end = self.size - len(self.tail)
+            if self.position < head_end:
+                chunk = self.head[self.position:self.position + size]
+            elif self.position < file_end:
+                chunk = self.file.read(min(size, file_end - self.position))
+            else:
+                offset = self.position - file_end
+                chunk = self.tail[offset:offset + size]
+            if not chunk:
+                break
+            chunks.append(chunk)
+            self.position += len(chunk)
+            size -= len(chunk)
+        return b''.join(chunks)
+
+    def tell(self):
+        return self.position
+
+    def seek(self, offset, whence=0):
+        if whence != 0 or offset != 0:
+            raise OSError("只支持回到请求体开头")
+        self.file.seek(0)
+        self.position = 0
+        return 0
+
+    def close(self):
+        self.file.close()
+
+
+class WeChatClient:
+    """
+    单个群机器人 Webhook 的客户端
+    pool_size: 连接池大小（并发推送时的最大连接数）
+    retries: 连接失败和 429 的重试次数，上传文件时也用于 502/503/504 的重试
+    rate_limit: 每分钟最多发送的消息数（WECHAT_RATE_LIMIT，0 表示不限速；上传文件不计入）
+    """
+
+    def __init__(self, webhook_url, pool_size=None, retries=None, timeout=10, upload_timeout=30,
+                 upload_cache=None, rate_limit=None):
+        self.webhook_url = webhook_url
+        # 上传缓存在第一次上传时才打开（只发文本通知时不创建缓存文件）
+        self._upload_cache = upload_cache
+        self.stats = {'uploads': 0, 'upload_hits': 0, 'throttled': 0.0}
+        self.timeout = timeout
+        self.upload_timeout = upload_timeout
+
+        # 机器人 key 在第一次发送时才解析，URL 配置错误只影响推送，不影响生成流程
+        self._key = None
+        self.rate_limit = rate_limit if rate_limit is not None else int(os.getenv('WECHAT_RATE_LIMIT', RATE_LIMIT_PER_MINUTE))
+        self.limiter = None
+
+        pool_size = pool_size or int(os.getenv('WECHAT_POOL_SIZE', '4'))
+        retries = retries if retries is not None else int(os.getenv('WECHAT_RETRIES', '2'))
+        self.retries = retries
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=0,  # 请求已发出但响应超时时不重试，避免群里收到重复消息
+            status=retries,
+            backoff_factor=0.5,
+            # 429 表示请求被拒绝、消息没有发出，可以安全重试；网关错误见 upload_media
+            status_forcelist=(429,),
+            allowed_methods=frozenset({'POST'}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry, pool_block=True)
+
+        self.session = requests.Session()
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    @property
+    def key(self):
+        """Webhook URL 中的机器人 key；URL 缺少 key 时抛出 WeChatConfigError"""
+        if self._key is None:
+            key = parse_qs(urlsplit(self.webhook_url or '').query).get('key', [''])[0]
+            if not key:
+                raise WeChatConfigError(f"Webhook URL 缺少 key 参数: {self.webhook_url}")
+            self._key = key
+        return self._key
+
+    @property
+    def base_url(self):
+        # 上传接口与Webhook同域名，便于指向本地模拟服务做压测
+        return self.webhook_url.split('/cgi-bin/')[0]
+
+    @property
+    def scope(self):
+        return hashlib.sha256(self.key.encode('utf-8')).hexdigest()[:16]  # 缓存中不保存机器人密钥
+
+    def _post(self, url, timeout, **kwargs):
+        response = self.session.post(url, timeout=timeout, **kwargs)
+        if response.status_code != 200:
+            raise WeChatError(f"请求失败: HTTP {response.status_code}", status=response.status_code)
+        result = response.json()
+        if result.get('errcode') != 0:
+            raise WeChatError(result.get('errmsg', '未知错误'), result.get('errcode'))
+        return result
+
+    def send(self, message):
+        """发送任意类型的消息（msgtype 为 text、markdown、file 等），超出每分钟条数限制时等待"""
+        scope = self.scope  # 先校验 URL，配置错误时不占用发送额度
+        if self.limiter is None and self.rate_limit > 0:
+            self.limiter = message_limiter(f"{self.base_url}:{scope}", self.rate_limit)
+        if self.limiter:
+            self.stats['throttled'] += self.limiter.acquire()
+        return self._post(self.webhook_url, self.timeout, json=message)
+
+    def send_text(self, content):
+        return self.send({'msgtype': 'text', 'text': {'content': content}})
+
+    def send_file(self, media_id):
+        return self.send({'msgtype': 'file', 'file': {'media_id': media_id}})
+
+    @property
+    def upload_cache(self):
+        if self._upload_cache is None:
+            self._upload_cache = UploadCache()
+        return self._upload_cache
+
+    def upload_media(self, file_path, media_type='file', digest=None):
+        """
+        上传文件，返回 media_id；相同内容的文件在有效期内已上传过时直接返回缓存的 media_id
+        请求体从磁盘流式读取，大文件不会整个读入内存
+        """
+        digest = digest or file_digest(file_path)
+        scope = f"{self.scope}:{media_type}"
+        media_id = self.upload_cache.get(scope, digest)
+        if media_id:
+            self.stats['upload_hits'] += 1
+            return media_id
+
+        upload_url = f"{self.base_url}/cgi-bin/webhook/upload_media?key={self.key}&type={media_type}"
+        for attempt in range(self.retries + 1):
+            body = MultipartFile('media', file_path)
+            try:
+                result = self._post(upload_url, self.upload_timeout, data=body,
+                                    headers={'Content-Type': body.content_type})
+                break
+            except WeChatError as e:
+                if e.status not in UPLOAD_RETRY_STATUSES or attempt == self.retries:
+                    raise
+            finally:
+                body.close()
+            time.sleep(0.5 * 2 ** attempt)
+        self.stats['uploads'] += 1
+        self.upload_cache.put(scope, digest, result['media_id'])
+        return result['media_id']
+
+    def send_file_path(self, file_path, media_type='file'):
+        """上传（或复用缓存的 media_id）并发送文件消息；缓存的 media_id 已失效时重新上传一次"""
+        digest = file_digest(file_path)
+        media_id = self.upload_media(file_path, media_type, digest)
+        try:
+            return self.send({'msgtype': media_type, media_type: {'media_id': media_id}})
+        except WeChatError as e:
+            if e.errcode not in INVALID_MEDIA_ERRCODES:
+                raise
+            self.upload_cache.invalidate(f"{self.scope}:{media_type}", digest)
+            media_id = self.upload_media(file_path, media_type, digest)
+            return self.send({'msgtype': media_type, media_type: {'media_id': media_id}})
+
+    def close(self):
+        self.session.close()
+        if self._upload_cache is not None:
+            self._upload_cache.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main():
+    targets = load_targets()
+    if not targets:
+        print("未配置企业微信Webhook URL，跳过通知")
+        return
+    message = ' '.join(sys.argv[1:]) or '❌ AI内容生成失败，请检查GitHub Actions日志'
+    failed = 0
+    for name, webhook_url in targets.items():
+        try:
+            with WeChatClient(webhook_url) as client:
+                client.send_text(message)
+            print(f"企业微信通知发送成功（{name}）")
+        except (WeChatError, requests.RequestException) as e:
+            failed += 1
+            print(f"企业微信通知发送失败（{name}）: {e}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()